@@ -0,0 +1,87 @@
+"""
+Batch route planner: runs many nav_cli-style queries across a process pool.
+Usage: python batch_planner.py <queries.csv|queries.jsonl|-> [-o results.jsonl] [--workers N] [--chunksize N]
+                               [--ephemeris-table ephemeris.bin] [--store]
+
+Each query has the nav_cli fields start, dest, ship, payload, date1, date2
+(and an optional id). Results are written as JSONL in submission order.
+With --store the workers also read and write the route store (route_store.py).
+"""
+
+import sys
+import csv
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from get_values import get_ephemeris_cache
+from nav_cli import plan_query
+
+QUERY_FIELDS = ["start", "dest", "ship", "payload", "date1", "date2"]
+
+# One cached engine per worker process, built by the pool initializer
+_engine = None
+_use_store = False
+
+def _init_worker(table_path=None, use_store=False):
+    global _engine, _use_store
+    _engine = get_ephemeris_cache(table_path=table_path)
+    _use_store = use_store
+
+def read_queries(path):
+    """Yield query dicts from a CSV (with header) or JSONL file; '-' reads JSONL from stdin"""
+    if path == "-":
+        for line in sys.stdin:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    with open(path, newline="") as fh:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(fh)
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+def run_query(query):
+    """Plan one query dict; errors are reported in the record instead of raised"""
+    record = {"id": query.get("id")} if "id" in query else {}
+    try:
+        missing = [f for f in QUERY_FIELDS if f not in query]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+        args = [str(query[f]) for f in QUERY_FIELDS]
+        record.update(plan_query(*args, engine=_engine, use_store=_use_store))
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+def plan_batch(queries, workers=None, chunksize=8, table_path=None, use_store=False):
+    """Yield results for an iterable of queries, in submission order"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(table_path, use_store)) as pool:
+        yield from pool.map(run_query, queries, chunksize=chunksize)
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan many routes in parallel")
+    parser.add_argument("queries", help="CSV or JSONL file of queries, or - for JSONL on stdin")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=8, help="queries handed to a worker at a time")
+    parser.add_argument("--ephemeris-table", help="precomputed table from ephemeris_table.py, shared by all workers")
+    parser.add_argument("--store", action="store_true", help="look up and save results in the route store")
+    args = parser.parse_args()
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for record in plan_batch(read_queries(args.queries), args.workers, args.chunksize,
+                                 args.ephemeris_table, args.store):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
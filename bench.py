@@ -0,0 +1,151 @@
+"""
+Benchmarks for the ephemeris, Lambert and mission-search hot paths.
+Usage: python bench.py [-o results.json] [--baseline bench_baseline.json] [--save-baseline]
+                       [--no-baseline] [--tolerance 0.25] [--repeat 5] [--filter TEXT]
+
+Each case is timed `repeat` times on a fresh SolarSystemEngine (no cache
+carry-over) and the fastest run is kept. Results are compared against
+--baseline, or bench_baseline.json next to this file when it exists; any case
+more than `tolerance` slower than its stored time is reported and the exit
+code is 1. --no-baseline skips the comparison.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+
+import numpy as np
+
+from get_values import SolarSystemEngine, date_to_jd, jd_to_date
+from formula_implementation import (simple_lambert_solver, batch_lambert_solver,
+                                    find_best_flight, find_best_mission)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# Representative routes: inner planets, outer planets and the Pluto long haul
+PAIRS = {
+    "inner": ("Earth", "Mars", "Moonivan", 5000),
+    "outer": ("Jupiter", "Saturn", "Beheamoth", 5000),
+    "pluto": ("Earth", "Pluto", "Yamaha Space Cycle", 10),
+}
+WINDOW_DAYS = [1, 30, 180]
+LAUNCH_DATE = "010226"
+
+def build_cases():
+    """name -> (setup, fn); setup builds fresh state outside the timed region"""
+    cases = {}
+    engine = SolarSystemEngine()
+
+    M = np.random.default_rng(0).uniform(0, 2 * np.pi, 10000)
+    cases["kepler/scalar"] = (None, lambda _: engine._kepler_equation(1.3, 0.2))
+    cases["kepler/array_10k"] = (None, lambda _: engine._kepler_equation(M, 0.2))
+    cases["get_position/Earth"] = (None, lambda _: engine.get_position("Earth", LAUNCH_DATE))
+    cases["get_states/10x1000"] = (
+        None, lambda _: engine.get_states(list(engine.elements), date_to_jd(LAUNCH_DATE) + np.arange(1000)))
+
+    for label, (start, end, ship, payload) in PAIRS.items():
+        jd = date_to_jd(LAUNCH_DATE)
+        r1 = engine.get_position(start, LAUNCH_DATE)[0]
+        r2 = engine.get_states(end, [jd + 250])[0][0, 0]
+        cases[f"lambert/{label}/single"] = (None, lambda _, r1=r1, r2=r2: simple_lambert_solver(r1, r2, 250 * 86400))
+
+        r2_grid = engine.get_states(end, jd + np.arange(50, 501, 15))[0][0]
+        tof = np.arange(50, 501, 15) * 86400
+        cases[f"lambert/{label}/batch_31"] = (
+            None, lambda _, r1=r1, r2=r2_grid, tof=tof: batch_lambert_solver(r1, r2, tof))
+
+        cases[f"find_best_flight/{label}"] = (
+            SolarSystemEngine,
+            lambda eng, a=start, b=end, s=ship, p=payload: find_best_flight(a, b, s, p, LAUNCH_DATE, engine=eng))
+
+        for days in WINDOW_DAYS:
+            end_date = jd_to_date(date_to_jd(LAUNCH_DATE) + days - 1)
+            cases[f"find_best_mission/{label}/{days}d"] = (
+                SolarSystemEngine,
+                lambda eng, a=start, b=end, s=ship, p=payload, e=end_date:
+                    find_best_mission(a, b, s, p, LAUNCH_DATE, 50, 500, 15, end_date_str=e, engine=eng))
+    return cases
+
+def time_case(setup, fn, repeat):
+    """Fastest and median wall time over `repeat` runs, looping fast cases for resolution"""
+    state = setup() if setup else None
+    start = time.perf_counter()
+    fn(state)
+    number = max(1, int(0.05 / max(time.perf_counter() - start, 1e-9)))
+
+    runs = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(state)
+        runs.append((time.perf_counter() - start) / number)
+    return {"min_s": min(runs), "median_s": float(np.median(runs)), "repeat": repeat, "number": number}
+
+def compare(results, baseline, tolerance):
+    """Cases slower than baseline * (1 + tolerance)"""
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = res["min_s"] / base["min_s"]
+        if ratio > 1 + tolerance:
+            regressions.append((name, base["min_s"], res["min_s"], ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the planner hot paths")
+    parser.add_argument("-o", "--output", help="write JSON results here")
+    parser.add_argument("--baseline", default=None,
+                        help="compare against this file (default: bench_baseline.json if present)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--no-baseline", action="store_true", help="skip the baseline comparison")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (setup, fn) in build_cases().items():
+        if args.filter not in name:
+            continue
+        results[name] = time_case(setup, fn, args.repeat)
+        print(f"{name:<40} {results[name]['min_s'] * 1e3:10.3f} ms")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if args.save_baseline:
+        with open(args.baseline or DEFAULT_BASELINE, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    baseline_path = args.baseline
+    if baseline_path is None and os.path.exists(DEFAULT_BASELINE):
+        baseline_path = DEFAULT_BASELINE
+    if baseline_path and not args.save_baseline and not args.no_baseline:
+        with open(baseline_path) as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nREGRESSIONS (> {args.tolerance:.0%} slower than {baseline_path}):")
+            for name, old, new, ratio in regressions:
+                print(f"  {name:<38} {old * 1e3:9.3f} ms -> {new * 1e3:9.3f} ms ({ratio:.2f}x)")
+            sys.exit(1)
+        print(f"\nNo regressions against {baseline_path} ({baseline['meta']['machine']})")
+
+if __name__ == "__main__":
+    main()
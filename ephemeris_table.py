@@ -0,0 +1,113 @@
+"""
+Precomputed daily ephemeris table, opened with np.memmap.
+Build: python ephemeris_table.py <output.bin> <start DDMMYY> <end DDMMYY>
+
+File layout: a header of HEADER_SIZE float64 values
+(magic, version, first Julian day, n_days, n_bodies, elements checksum, 0, 0)
+followed by float64 states shaped (n_days, n_bodies, 6) = x, y, z, vx, vy, vz
+in km and km/s, bodies in SolarSystemEngine.elements order.
+"""
+
+import sys
+import json
+import zlib
+
+import numpy as np
+
+MAGIC = 0x49485754  # "IHWT"
+VERSION = 1
+HEADER_SIZE = 8
+SECONDS_PER_DAY = 24 * 3600
+
+def elements_checksum(elements):
+    """CRC of the orbital elements (including body order) a table was built from"""
+    return zlib.crc32(json.dumps(list(elements.items())).encode())
+
+def build_ephemeris_table(path, start_date, end_date, engine=None):
+    """Tabulate every body's state at daily resolution between two DDMMYY dates"""
+    from get_values import SolarSystemEngine, date_to_jd
+
+    if engine is None:
+        engine = SolarSystemEngine()
+    jd_start = date_to_jd(start_date)
+    jds = np.arange(jd_start, date_to_jd(end_date) + 0.5, 1.0)
+    if len(jds) < 2:
+        raise ValueError("Ephemeris table needs at least two days")
+
+    pos, vel = engine.get_states(list(engine.elements), jds)
+    states = np.concatenate([pos, vel], axis=-1).transpose(1, 0, 2)
+
+    header = np.zeros(HEADER_SIZE)
+    header[:6] = [MAGIC, VERSION, jd_start, len(jds), len(engine.elements), elements_checksum(engine.elements)]
+    with open(path, "wb") as fh:
+        header.tofile(fh)
+        np.ascontiguousarray(states).tofile(fh)
+    return len(jds)
+
+class EphemerisTable:
+    """Read-only, memory-mapped daily state table with Hermite interpolation between days"""
+    def __init__(self, path, elements=None):
+        header = np.fromfile(path, dtype=np.float64, count=HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[0] != MAGIC:
+            raise ValueError(f"Not an ephemeris table: {path}")
+        if header[1] != VERSION:
+            raise ValueError(f"Unsupported ephemeris table version: {header[1]:.0f}")
+        if elements is not None and header[5] != elements_checksum(elements):
+            raise ValueError(f"Ephemeris table {path} was built from different orbital elements")
+
+        self.path = path
+        self.jd_start = header[2]
+        self.n_days = int(header[3])
+        self.n_bodies = int(header[4])
+        self.jd_end = self.jd_start + self.n_days - 1
+        self.data = np.memmap(path, dtype=np.float64, mode="r", offset=HEADER_SIZE * 8,
+                              shape=(self.n_days, self.n_bodies, 6))
+
+    def covers(self, jds):
+        return bool(np.all((jds >= self.jd_start) & (jds <= self.jd_end)))
+
+    def window(self, body_index, jd, n_days):
+        """Zero-copy (n_days, 6) view of one body's states starting at a whole Julian day"""
+        k = int(round(jd - self.jd_start))
+        return self.data[k:k + n_days, body_index]
+
+    def get_states(self, idx, jds):
+        """Positions and velocities for body indices idx at Julian days jds, (n_bodies, n_epochs, 3)"""
+        x = jds - self.jd_start
+        k = np.floor(x).astype(int)
+        t = x - k
+
+        if not t.any():
+            # Consecutive whole days of a single body: straight views into the file
+            if len(idx) == 1 and len(k) and np.array_equal(k, k[0] + np.arange(len(k))):
+                rows = self.window(idx[0], jds[0], len(k))
+                return rows[None, :, :3], rows[None, :, 3:]
+            states = self.data[k][:, idx].transpose(1, 0, 2)
+            return states[..., :3], states[..., 3:]
+
+        # Cubic Hermite on positions with velocities as slopes (h = 1 day)
+        k = np.minimum(k, self.n_days - 2)
+        t = (x - k)[None, :, None]
+        s0 = self.data[k][:, idx].transpose(1, 0, 2)
+        s1 = self.data[k + 1][:, idx].transpose(1, 0, 2)
+        p0, m0 = s0[..., :3], s0[..., 3:] * SECONDS_PER_DAY
+        p1, m1 = s1[..., :3], s1[..., 3:] * SECONDS_PER_DAY
+
+        t2, t3 = t**2, t**3
+        position = ((2 * t3 - 3 * t2 + 1) * p0 + (t3 - 2 * t2 + t) * m0
+                    + (-2 * t3 + 3 * t2) * p1 + (t3 - t2) * m1)
+        velocity = ((6 * t2 - 6 * t) * p0 + (3 * t2 - 4 * t + 1) * m0
+                    + (-6 * t2 + 6 * t) * p1 + (3 * t2 - 2 * t) * m1) / SECONDS_PER_DAY
+        return position, velocity
+
+def main():
+    if len(sys.argv) != 4:
+        print("Usage: python ephemeris_table.py <output.bin> <start DDMMYY> <end DDMMYY>")
+        print("Example: python ephemeris_table.py ephemeris.bin 010120 311259")
+        sys.exit(1)
+
+    n_days = build_ephemeris_table(*sys.argv[1:4])
+    print(f"Wrote {n_days} days to {sys.argv[1]}")
+
+if __name__ == "__main__":
+    main()
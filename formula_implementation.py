@@ -20,9 +20,12 @@
     # T: Orbital period = 43200 seconds (12 hours for refueling)
     # Rfuel: Radius of the circular parking/refueling orbit
 
+import math
+import time
+
 import numpy as np
-from datetime import datetime, timedelta
-from get_values import SolarSystemEngine
+from get_values import SolarSystemEngine, get_ephemeris_cache, date_to_jd, jd_to_date
+from instrumentation import stats
 
 # PLANETARY & SOLAR INITIALIZATION
 StdGravSun = 1.32712440018e11 
@@ -32,6 +35,10 @@ StdGravPlanets = {
     "Uranus": 5793940, "Neptune": 6836529, "Pluto": 871, "Ceres": 63
 }
 
+# Semi-major axes (km) from the ephemeris elements, for period-scaled TOF bounds
+_elements_engine = SolarSystemEngine()
+SemiMajorAxes = {name: el[0] * _elements_engine.AU for name, el in _elements_engine.elements.items()}
+
 # Initial position/velocity arrays
 r1 = np.array([0.0, 0.0, 0.0]) 
 r2 = np.array([0.0, 0.0, 0.0])
@@ -94,59 +101,362 @@ for planet, mu in StdGravPlanets.items():
         "v_park": velocity
     }
 
-# SIMPLE LAMBERT SOLVER
+# LAMBERT SOLVER (universal variables, Curtis ch. 5)
+def _stumpff(z):
+    """Stumpff functions C(z), S(z) for an array of z"""
+    C = np.empty_like(z)
+    S = np.empty_like(z)
+    pos = z > 1e-3
+    neg = z < -1e-3
+    mid = ~(pos | neg)
+
+    sz = np.sqrt(z[pos])
+    C[pos] = (1 - np.cos(sz)) / z[pos]
+    S[pos] = (sz - np.sin(sz)) / sz**3
+
+    sz = np.sqrt(-z[neg])
+    C[neg] = (np.cosh(sz) - 1) / -z[neg]
+    S[neg] = (np.sinh(sz) - sz) / sz**3
+
+    zm = z[mid]
+    C[mid] = 1 / 2 - zm / 24 + zm**2 / 720 - zm**3 / 40320
+    S[mid] = 1 / 6 - zm / 120 + zm**2 / 5040 - zm**3 / 362880
+    return C, S
+
+def _lambert_tof(z, A, r1_mag, r2_mag, mu):
+    """Time of flight for universal variable z, its z-derivative, and y > 0 validity"""
+    C, S = _stumpff(z)
+    y = r1_mag + r2_mag + A * (z * S - 1) / np.sqrt(C)
+    valid = y > 0
+    y = np.where(valid, y, np.nan)
+
+    chi3 = (y / C)**1.5
+    tof = (chi3 * S + A * np.sqrt(y)) / np.sqrt(mu)
+
+    near_zero = np.abs(z) < 1e-3
+    z_safe = np.where(near_zero, 1.0, z)
+    dtof = np.where(
+        near_zero,
+        np.sqrt(2) / 40 * y**1.5 + A / 8 * (np.sqrt(y) + A * np.sqrt(1 / (2 * y))),
+        chi3 * ((C - 1.5 * S / C) / (2 * z_safe) + 0.75 * S**2 / C)
+        + A / 8 * (3 * S / C * np.sqrt(y) + A * np.sqrt(C / y))
+    ) / np.sqrt(mu)
+    return tof, dtof, valid
+
+def _lambert_min_tof_z(lo, hi, A, r1_mag, r2_mag, mu, iterations=60):
+    """Golden-section search for the minimum-time z on a multi-revolution interval"""
+    ratio = (np.sqrt(5) - 1) / 2
+    a, b = lo.copy(), hi.copy()
+    for _ in range(iterations):
+        c = b - ratio * (b - a)
+        d = a + ratio * (b - a)
+        tc = np.nan_to_num(_lambert_tof(c, A, r1_mag, r2_mag, mu)[0], nan=np.inf)
+        td = np.nan_to_num(_lambert_tof(d, A, r1_mag, r2_mag, mu)[0], nan=np.inf)
+        left = tc < td
+        b = np.where(left, d, b)
+        a = np.where(left, a, c)
+    return (a + b) / 2
+
+def batch_lambert_solver(r1, r2, tof_seconds, mu=None, prograde=True, revs=0, branch="left",
+                         rtol=1e-10, max_iter=50):
+    """
+    Vectorized Lambert solver - replaces poliastro.iod.izzo.lambert().
+    r1, r2 (..., 3) and tof_seconds (...) broadcast together; each element runs
+    a bracketed Newton iteration on the universal variable z until it converges.
+    revs > 0 selects the multi-revolution solution on the "left" (smaller z) or
+    "right" branch. Returns (v1, v2, converged, iterations); unconverged or
+    infeasible elements have NaN velocities.
+    """
+    if mu is None:
+        mu = StdGravSun
+
+    r1 = np.asarray(r1, dtype=float)
+    r2 = np.asarray(r2, dtype=float)
+    tof = np.asarray(tof_seconds, dtype=float)
+    shape = np.broadcast_shapes(r1.shape[:-1], r2.shape[:-1], tof.shape)
+    r1 = np.broadcast_to(r1, shape + (3,)).reshape(-1, 3)
+    r2 = np.broadcast_to(r2, shape + (3,)).reshape(-1, 3)
+    tof = np.broadcast_to(tof, shape).ravel()
+    n = tof.size
+
+    with np.errstate(all="ignore"):
+        # Vector magnitudes & transfer angle (long way when the motion sense demands it)
+        r1_mag = np.linalg.norm(r1, axis=-1)
+        r2_mag = np.linalg.norm(r2, axis=-1)
+        cos_dtheta = np.clip(np.sum(r1 * r2, axis=-1) / (r1_mag * r2_mag), -1, 1)
+        dtheta = np.arccos(cos_dtheta)
+        cross_z = r1[:, 0] * r2[:, 1] - r1[:, 1] * r2[:, 0]
+        long_way = cross_z < 0 if prograde else cross_z >= 0
+        dtheta = np.where(long_way, 2 * np.pi - dtheta, dtheta)
+        A = np.sin(dtheta) * np.sqrt(r1_mag * r2_mag / (1 - cos_dtheta))
+
+        # 0 or 180 degree transfers have no unique plane
+        active = np.isfinite(A) & (np.abs(A) > 1e-12 * (r1_mag + r2_mag)) & (tof > 0)
+
+        if revs == 0:
+            # TOF increases with z on (-inf, 4pi^2); push the lower bracket down until it is too fast
+            sign = 1.0
+            lo = np.full(n, -4 * np.pi**2)
+            hi = np.full(n, 4 * np.pi**2)
+            for _ in range(20):
+                t_lo, _, ok = _lambert_tof(lo, A, r1_mag, r2_mag, mu)
+                expand = active & ok & (t_lo > tof)
+                if not expand.any():
+                    break
+                lo = np.where(expand, np.maximum(lo * 4, -4e5), lo)
+            z = np.zeros(n)
+        else:
+            # TOF is U-shaped between (2pi N)^2 and (2pi (N+1))^2; split at its minimum
+            lo = np.full(n, (2 * np.pi * revs)**2 * (1 + 1e-12))
+            hi = np.full(n, (2 * np.pi * (revs + 1))**2 * (1 - 1e-12))
+            z_min = _lambert_min_tof_z(lo, hi, A, r1_mag, r2_mag, mu)
+            t_min = _lambert_tof(z_min, A, r1_mag, r2_mag, mu)[0]
+            active &= t_min <= tof
+            if branch == "left":
+                sign, hi = -1.0, z_min
+            else:
+                sign, lo = 1.0, z_min
+            z = (lo + hi) / 2
+
+        converged = np.zeros(n, dtype=bool)
+        iterations = np.zeros(n, dtype=int)
+        todo = np.flatnonzero(active)
+        for _ in range(max_iter):
+            if todo.size == 0:
+                break
+            zt = z[todo]
+            target = tof[todo]
+            t, dt, ok = _lambert_tof(zt, A[todo], r1_mag[todo], r2_mag[todo], mu)
+            iterations[todo] += 1
+
+            done = np.abs(t - target) <= rtol * target
+            converged[todo[done]] = True
+
+            # Shrink the bracket; y <= 0 only happens below the zero-rev root
+            err = np.where(ok, sign * (t - target), -1.0)
+            lo[todo] = np.where(err < 0, zt, lo[todo])
+            hi[todo] = np.where(err > 0, zt, hi[todo])
+
+            # Newton step, falling back to bisection when it leaves the bracket
+            z_new = zt - (t - target) / dt
+            bisect = ~ok | ~np.isfinite(z_new) | (z_new <= lo[todo]) | (z_new >= hi[todo])
+            z_new = np.where(bisect, (lo[todo] + hi[todo]) / 2, z_new)
+            z[todo] = np.where(done, zt, z_new)
+            todo = todo[~done]
+
+        # Lagrange coefficients -> terminal velocities
+        C, S = _stumpff(z)
+        y = r1_mag + r2_mag + A * (z * S - 1) / np.sqrt(C)
+        f = 1 - y / r1_mag
+        g = A * np.sqrt(y / mu)
+        g_dot = 1 - y / r2_mag
+        v1 = (r2 - f[:, None] * r1) / g[:, None]
+        v2 = (g_dot[:, None] * r2 - r1) / g[:, None]
+
+    converged &= np.isfinite(v1).all(axis=-1) & np.isfinite(v2).all(axis=-1)
+    v1[~converged] = np.nan
+    v2[~converged] = np.nan
+    if stats.enabled:
+        stats.count("lambert_solves", n)
+        stats.count("lambert_iterations", iterations.sum())
+        stats.count("lambert_nonconverged", n - converged.sum())
+    return (v1.reshape(shape + (3,)), v2.reshape(shape + (3,)),
+            converged.reshape(shape), iterations.reshape(shape))
+
+def _stumpff_scalar(z):
+    """_stumpff for one float"""
+    if z > 1e-3:
+        sz = math.sqrt(z)
+        return (1 - math.cos(sz)) / z, (sz - math.sin(sz)) / sz**3
+    if z < -1e-3:
+        sz = math.sqrt(-z)
+        return (math.cosh(sz) - 1) / -z, (math.sinh(sz) - sz) / sz**3
+    return (1 / 2 - z / 24 + z**2 / 720 - z**3 / 40320,
+            1 / 6 - z / 120 + z**2 / 5040 - z**3 / 362880)
+
+def _lambert_tof_scalar(z, A, r1_mag, r2_mag, mu):
+    """_lambert_tof for one float z; tof and dtof are None where y <= 0"""
+    C, S = _stumpff_scalar(z)
+    y = r1_mag + r2_mag + A * (z * S - 1) / math.sqrt(C)
+    if y <= 0:
+        return None, None
+    chi3 = (y / C)**1.5
+    tof = (chi3 * S + A * math.sqrt(y)) / math.sqrt(mu)
+    if abs(z) < 1e-3:
+        dtof = math.sqrt(2) / 40 * y**1.5 + A / 8 * (math.sqrt(y) + A * math.sqrt(1 / (2 * y)))
+    else:
+        dtof = (chi3 * ((C - 1.5 * S / C) / (2 * z) + 0.75 * S**2 / C)
+                + A / 8 * (3 * S / C * math.sqrt(y) + A * math.sqrt(C / y)))
+    return tof, dtof / math.sqrt(mu)
+
+def _lambert_single(r1, r2, tof, mu, rtol=1e-10, max_iter=50):
+    """
+    batch_lambert_solver's prograde zero-revolution solve for one transfer in
+    plain floats (numpy's per-call overhead dominates a size-1 batch)
+    """
+    x1, y1, z1 = (float(c) for c in r1)
+    x2, y2, z2 = (float(c) for c in r2)
+    r1_mag = math.sqrt(x1 * x1 + y1 * y1 + z1 * z1)
+    r2_mag = math.sqrt(x2 * x2 + y2 * y2 + z2 * z2)
+    cos_dtheta = min(max((x1 * x2 + y1 * y2 + z1 * z2) / (r1_mag * r2_mag), -1.0), 1.0)
+    dtheta = math.acos(cos_dtheta)
+    if x1 * y2 - y1 * x2 < 0:
+        dtheta = 2 * math.pi - dtheta
+    nan = np.full(3, np.nan)
+    if cos_dtheta == 1.0 or tof <= 0:
+        return nan, nan, False, 0
+    A = math.sin(dtheta) * math.sqrt(r1_mag * r2_mag / (1 - cos_dtheta))
+    if not math.isfinite(A) or abs(A) <= 1e-12 * (r1_mag + r2_mag):
+        return nan, nan, False, 0
+
+    lo, hi = -4 * math.pi**2, 4 * math.pi**2
+    for _ in range(20):
+        t_lo, _ = _lambert_tof_scalar(lo, A, r1_mag, r2_mag, mu)
+        if t_lo is None or t_lo <= tof:
+            break
+        lo = max(lo * 4, -4e5)
+
+    z, converged, iterations = 0.0, False, 0
+    for iterations in range(1, max_iter + 1):
+        t, dt = _lambert_tof_scalar(z, A, r1_mag, r2_mag, mu)
+        if t is not None and abs(t - tof) <= rtol * tof:
+            converged = True
+            break
+        if t is None or t < tof:
+            lo = z
+        elif t > tof:
+            hi = z
+        z_new = z - (t - tof) / dt if t is not None else math.nan
+        z = z_new if lo < z_new < hi else (lo + hi) / 2
+
+    C, S = _stumpff_scalar(z)
+    y = r1_mag + r2_mag + A * (z * S - 1) / math.sqrt(C)
+    if not converged or y <= 0:
+        return nan, nan, False, iterations
+    f = 1 - y / r1_mag
+    g = A * math.sqrt(y / mu)
+    g_dot = 1 - y / r2_mag
+    r1 = np.array([x1, y1, z1])
+    r2 = np.array([x2, y2, z2])
+    return (r2 - f * r1) / g, (g_dot * r2 - r1) / g, True, iterations
+
 def simple_lambert_solver(r1, r2, tof_seconds, mu=None):
     """
     Simple Lambert solver - calculates transfer orbit velocities.
-    Replaces poliastro.iod.izzo.lambert().
+    One transfer ((3,) vectors, scalar TOF) is solved in plain floats;
+    anything batched goes through batch_lambert_solver.
     """
     if mu is None:
         mu = StdGravSun
-    
-    # Vector magnitudes
-    r1_mag = np.linalg.norm(r1)
-    r2_mag = np.linalg.norm(r2)
-    
-    # Chord distance
-    c = np.linalg.norm(r2 - r1)
-    s = (r1_mag + r2_mag + c) / 2.0  # semi-perimeter
-    
-    # Initial guess for semi-major axis
-    a_min = s / 2.0
-    a = a_min * 1.0
-    
-    # Transfer angle
-    cos_dtheta = np.dot(r1, r2) / (r1_mag * r2_mag)
-    dtheta = np.arccos(np.clip(cos_dtheta, -1, 1))
-    
-    # Iterate to find correct semi-major axis
-    for iteration in range(30):
-        alpha = 2.0 * np.arcsin(np.sqrt(s / (2.0 * a)))
-        beta = 2.0 * np.arcsin(np.sqrt((s - c) / (2.0 * a)))
-        
-        # Time of flight for this orbit
-        tof_calc = np.sqrt(a**3 / mu) * (alpha - beta - (np.sin(alpha) - np.sin(beta)))
-        
-        if abs(tof_calc - tof_seconds) < 1.0:  # within 1 second
-            break
-        
-        # Update semi-major axis
-        dtof_da = 1.5 * np.sqrt(a / mu) * (alpha - beta - (np.sin(alpha) - np.sin(beta)))
-        a = a - (tof_calc - tof_seconds) / dtof_da
-        a = max(a, a_min * 1.01)  # Ensure a stays above minimum
-    
-    f = 1.0 - a / r1_mag * (1.0 - np.cos(dtheta))
-    g = r1_mag * r2_mag * np.sin(dtheta) / np.sqrt(mu * a * (1 - np.cos(dtheta)))
-    
-    v1 = (r2 - f * r1) / g
-    
-    g_dot = 1.0 - a / r2_mag * (1.0 - np.cos(dtheta))
-    v2 = g_dot * r1 / g + (1.0 - f) * v1 / g
-    
+    if np.ndim(r1) == 1 and np.ndim(r2) == 1 and np.ndim(tof_seconds) == 0:
+        v1, v2, converged, iterations = _lambert_single(r1, r2, float(tof_seconds), mu)
+        if stats.enabled:
+            stats.count("lambert_solves")
+            stats.count("lambert_iterations", iterations)
+            stats.count("lambert_nonconverged", not converged)
+        return v1, v2
+    v1, v2, _, _ = batch_lambert_solver(r1, r2, tof_seconds, mu)
     return v1, v2
 
+def propagate_kepler(r0, v0, dt_seconds, mu=None, rtol=1e-12, max_iter=100):
+    """
+    Two-body state after dt_seconds from (r0, v0), solving the universal
+    Kepler equation F(chi) = 0 for every element (Curtis, Algorithms 3.3/3.4).
+    r0, v0 (..., 3) and dt_seconds (...) broadcast together; elliptic,
+    parabolic and hyperbolic arcs are all handled. F is monotonic in chi
+    (dF/dchi = r > 0), so each element keeps a bracket and Newton steps that
+    leave it fall back to bisection. Returns (position, velocity, converged);
+    unconverged elements have NaN states.
+    """
+    if mu is None:
+        mu = StdGravSun
+
+    r0 = np.asarray(r0, dtype=float)
+    v0 = np.asarray(v0, dtype=float)
+    dt = np.asarray(dt_seconds, dtype=float)
+    shape = np.broadcast_shapes(r0.shape[:-1], v0.shape[:-1], dt.shape)
+    r0 = np.broadcast_to(r0, shape + (3,)).reshape(-1, 3)
+    v0 = np.broadcast_to(v0, shape + (3,)).reshape(-1, 3)
+    dt = np.broadcast_to(dt, shape).ravel()
+
+    with np.errstate(all="ignore"):
+        sqrt_mu = np.sqrt(mu)
+        r0_mag = np.linalg.norm(r0, axis=-1)
+        rv0 = np.sum(r0 * v0, axis=-1)
+        alpha = 2 / r0_mag - np.sum(v0 * v0, axis=-1) / mu  # 1/a
+
+        # Bracket: F(0) = -sqrt(mu) dt and dF/dchi >= periapsis radius, so the root
+        # lies between 0 and sqrt(mu) dt / r_p (signs follow dt)
+        h2 = np.sum(np.cross(r0, v0)**2, axis=-1)
+        e = np.sqrt(np.maximum(0.0, 1 - h2 * alpha / mu))
+        r_p = np.minimum(h2 / mu / (1 + e), r0_mag)
+        far = sqrt_mu * dt / np.maximum(r_p, 1e-9 * r0_mag)
+        lo = np.minimum(0.0, far)
+        hi = np.maximum(0.0, far)
+
+        # First guesses (Vallado, Algorithm 8): elliptic, hyperbolic, near-parabolic
+        chi = sqrt_mu * dt / r0_mag
+        elliptic = alpha * r0_mag > 1e-6
+        hyperbolic = alpha * r0_mag < -1e-6
+        chi[elliptic] = sqrt_mu * dt[elliptic] * alpha[elliptic]
+        a = 1 / alpha[hyperbolic]
+        sign = np.sign(dt[hyperbolic])
+        chi[hyperbolic] = sign * np.sqrt(-a) * np.log(
+            -2 * mu * alpha[hyperbolic] * dt[hyperbolic]
+            / (rv0[hyperbolic] + sign * np.sqrt(-mu * a) * (1 - r0_mag[hyperbolic] * alpha[hyperbolic])))
+        outside = ~np.isfinite(chi) | (chi <= lo) | (chi >= hi)
+        chi = np.where(outside, (lo + hi) / 2, chi)
+
+        converged = dt == 0
+        chi[converged] = 0.0
+        tol = rtol * np.maximum(sqrt_mu * np.abs(dt), r0_mag)
+        todo = np.flatnonzero(~converged)
+        for _ in range(max_iter):
+            if todo.size == 0:
+                break
+            x, al, rm = chi[todo], alpha[todo], r0_mag[todo]
+            C, S = _stumpff(al * x**2)
+            F = rv0[todo] / sqrt_mu * x**2 * C + (1 - al * rm) * x**3 * S + rm * x - sqrt_mu * dt[todo]
+            dF = rv0[todo] / sqrt_mu * x * (1 - al * x**2 * S) + (1 - al * rm) * x**2 * C + rm
+
+            # Overflowed F only happens far beyond the root, on the side of chi
+            F = np.where(np.isfinite(F), F, np.sign(x) * np.inf)
+            done = np.abs(F) <= tol[todo]
+            converged[todo[done]] = True
+            lo[todo] = np.where(F < 0, x, lo[todo])
+            hi[todo] = np.where(F > 0, x, hi[todo])
+
+            # Newton step, falling back to bisection when it leaves the bracket
+            x_new = x - F / dF
+            bisect = ~np.isfinite(x_new) | (x_new <= lo[todo]) | (x_new >= hi[todo])
+            x_new = np.where(bisect, (lo[todo] + hi[todo]) / 2, x_new)
+            # A bracket that has collapsed to rounding is as converged as chi can get
+            stuck = (hi[todo] - lo[todo]) <= 4 * np.finfo(float).eps * np.abs(x)
+            converged[todo[stuck]] = True
+            chi[todo] = np.where(done, x, x_new)
+            todo = todo[~(done | stuck)]
+
+        # Lagrange coefficients
+        C, S = _stumpff(alpha * chi**2)
+        f = 1 - chi**2 / r0_mag * C
+        g = dt - chi**3 * S / sqrt_mu
+        r = f[:, None] * r0 + g[:, None] * v0
+        r_mag = np.linalg.norm(r, axis=-1)
+        f_dot = sqrt_mu / (r_mag * r0_mag) * (alpha * chi**3 * S - chi)
+        g_dot = 1 - chi**2 / r_mag * C
+        v = f_dot[:, None] * r0 + g_dot[:, None] * v0
+
+    converged &= np.isfinite(r).all(axis=-1) & np.isfinite(v).all(axis=-1)
+    r[~converged] = np.nan
+    v[~converged] = np.nan
+    return r.reshape(shape + (3,)), v.reshape(shape + (3,)), converged.reshape(shape)
+
 def get_highway_velocities(r1, r2, TOF_days):
-    """YOUR function - just replaced izzo.lambert with simple_lambert_solver"""
+    """
+    YOUR function - just replaced izzo.lambert with simple_lambert_solver.
+    Arrays of positions and TOFs are solved in one batch; compute_porkchop
+    (and so every route_search leg) goes through here.
+    """
     mu_sun = StdGravSun
     seconds = TOF_days * 24 * 3600
     sV1, sV2 = simple_lambert_solver(r1, r2, seconds, mu_sun)
@@ -158,8 +468,8 @@ def get_relative_velocities(sV1, pV1, sV2, pV2):
     iV2 = sV2 - pV2
     return iV1, iV2
 
-def calculate_total_delV(iV1, iV2, start_planet, end_planet):
-    """YOUR function - unchanged"""
+def calculate_delV_components(iV1, iV2, start_planet, end_planet):
+    """Launch and arrival burns from the 12-hour parking orbits (scalars or arrays)"""
     start_data = Rfuel_data[start_planet]
     end_data = Rfuel_data[end_planet]
     
@@ -167,16 +477,21 @@ def calculate_total_delV(iV1, iV2, start_planet, end_planet):
     mu_end = StdGravPlanets[end_planet]
 
     # launch force
-    v_inf_launch = np.linalg.norm(iV1)
-    v_inf_arrival = np.linalg.norm(iV2)
+    v_inf_launch = np.linalg.norm(iV1, axis=-1)
+    v_inf_arrival = np.linalg.norm(iV2, axis=-1)
     
     v_peri_launch = np.sqrt(v_inf_launch**2 + 2 * mu_start / start_data["Rfuel"])
-    dv_launch = abs(v_peri_launch - start_data["v_park"])
+    dv_launch = np.abs(v_peri_launch - start_data["v_park"])
     
     # arrival force
     v_peri_arrival = np.sqrt(v_inf_arrival**2 + 2 * mu_end / end_data["Rfuel"])
-    dv_arrival = abs(v_peri_arrival - end_data["v_park"])
+    dv_arrival = np.abs(v_peri_arrival - end_data["v_park"])
     
+    return dv_launch, dv_arrival
+
+def calculate_total_delV(iV1, iV2, start_planet, end_planet):
+    """YOUR function - split into calculate_delV_components"""
+    dv_launch, dv_arrival = calculate_delV_components(iV1, iV2, start_planet, end_planet)
     return dv_launch + dv_arrival
 
 def get_required_fuel(delV_total, ship_name, current_payload):
@@ -191,101 +506,804 @@ def get_required_fuel(delV_total, ship_name, current_payload):
     possible = fuel_needed <= ship["Fuel_Cap"]
     return fuel_needed, possible
 
-def find_best_flight(start_p, end_p, ship_name, payload, date_str):
-    """YOUR function - expanded to try multiple TOF options"""
-    engine = SolarSystemEngine()
-    
-    best_result = None
-    best_fuel = float('inf')
-    
-    # Calculate ifferent time of flights
-    for TOF_days in range(100, 400, 20):
-        try:
-            # Calculate arrival date
-            launch_date = datetime.strptime(date_str, "%d%m%y")
-            arrival_date = launch_date + timedelta(days=TOF_days)
-            arrival_str = arrival_date.strftime("%d%m%y")
-            
-            # 1. Get Positions & Velocities
-            r1, v_p1 = engine.get_position(start_p, date_str) 
-            r2, v_p2 = engine.get_position(end_p, arrival_str)
-            
-            # 2. Highway Velocity (YOUR function)
-            sV1, sV2 = get_highway_velocities(r1, r2, TOF_days)
-            
-            # 3. Relative Velocities (YOUR function)
-            iV1, iV2 = get_relative_velocities(sV1, v_p1, sV2, v_p2)
-            
-            # 4. Total delta-V
-            total_dv = calculate_total_delV(iV1, iV2, start_p, end_p)
-            
-            # 5.Fuel Capacity
-            fuel, is_possible = get_required_fuel(total_dv, ship_name, payload)
-            
-            if is_possible and fuel < best_fuel:
-                best_fuel = fuel
-                best_result = {
-                    "Flight impossible": False,
-                    "Fuel": fuel,
-                    "deltaV": total_dv,
-                    "TOF_days": TOF_days,
-                    "Launch_date": date_str,
-                    "Arrival_date": arrival_str,
-                    "iV1": iV1,
-                    "iV2": iV2
-                }
-        except:
+def max_ship_delV(ship_name, payload):
+    """Total delta-V the ship can deliver with a full tank"""
+    ship = ships[ship_name]
+    mf = ship["DMass"] + payload
+    return ship["SI"] * np.log((mf + ship["Fuel_Cap"]) / mf)
+
+# ANALYTIC DELTA-V LOWER BOUNDS (prune cells before solving Lambert)
+
+def _parking_burn(v_inf, body):
+    """Burn between the body's parking orbit and a hyperbola with excess speed v_inf"""
+    data = Rfuel_data[body]
+    return np.sqrt(v_inf**2 + 2 * StdGravPlanets[body] / data["Rfuel"]) - data["v_park"]
+
+def _inner_v_inf_bound(r_lo, r_hi, v_transverse, v_radial):
+    """
+    Least v-infinity at the inner end of any heliocentric arc between radii
+    r_lo < r_hi. The arc reaches r_hi only if the ship's transverse/radial
+    speeds satisfy v_r^2 + v_T^2 (1 - (r_lo/r_hi)^2) >= 2 mu (1/r_lo - 1/r_hi),
+    i.e. lie outside an ellipse with semi-axes A (Hohmann perihelion speed)
+    and B (radial speed that just reaches r_hi). A planet velocity on the
+    ellipse scaled by f < 1 is at least (1 - f) B away from it.
+    """
+    with np.errstate(all="ignore"):
+        B = np.sqrt(2 * StdGravSun * (1 / r_lo - 1 / r_hi))
+        A = np.sqrt(2 * StdGravSun * r_hi / (r_lo * (r_lo + r_hi)))
+        f = np.sqrt((v_transverse / A)**2 + (v_radial / B)**2)
+        return np.where(r_lo < r_hi, np.maximum(1 - f, 0) * B, 0.0)
+
+def _short_tof_speed_bound(r1, r2, r_mag, tof_seconds):
+    """
+    Least heliocentric speed at radius r_mag for a prograde zero-revolution
+    arc r1 -> r2 in tof_seconds. A short-way arc (under 180 degrees) stays
+    beyond its chord line, so its speed never exceeds
+    sqrt(v^2 + 2 mu (1/d - 1/r)) with d the Sun-chord distance, while its
+    average speed is at least chord / tof. Long-way cells get no bound.
+    """
+    cross = np.cross(r1, r2)
+    chord = np.linalg.norm(r2 - r1, axis=-1)
+    with np.errstate(all="ignore"):
+        d_line = np.linalg.norm(cross, axis=-1) / chord
+        v_sq = (chord / tof_seconds)**2 - 2 * StdGravSun * (1 / d_line - 1 / r_mag)
+        return np.where(cross[..., 2] >= 0, np.sqrt(np.maximum(np.nan_to_num(v_sq, nan=0.0), 0)), 0.0)
+
+def delV_lower_bound(start_p, end_p, r1, v_p1, r2, v_p2, tof_seconds=None):
+    """
+    Lower bound on the total delta-V of any transfer from start_p at (r1, v_p1)
+    to end_p at (r2, v_p2), from the planet states alone (arrays broadcast
+    over (..., 3)). The end nearer the Sun pays _inner_v_inf_bound; with
+    tof_seconds both ends also pay _short_tof_speed_bound less the planet's
+    speed. Each end pays at least the parking-orbit escape/capture burn.
+    """
+    r1_mag = np.linalg.norm(r1, axis=-1)
+    r2_mag = np.linalg.norm(r2, axis=-1)
+    start_inner = r1_mag < r2_mag
+    r_lo, r_hi = np.minimum(r1_mag, r2_mag), np.maximum(r1_mag, r2_mag)
+    r_vec = np.where(start_inner[..., None], r1, r2)
+    v_planet = np.where(start_inner[..., None], v_p1, v_p2)
+
+    v_radial = np.abs(np.sum(v_planet * r_vec, axis=-1)) / r_lo
+    v_transverse = np.sqrt(np.maximum(np.sum(v_planet**2, axis=-1) - v_radial**2, 0))
+    v_inf = _inner_v_inf_bound(r_lo, r_hi, v_transverse, v_radial)
+    v_inf1 = np.where(start_inner, v_inf, 0.0)
+    v_inf2 = np.where(start_inner, 0.0, v_inf)
+    if tof_seconds is not None:
+        r1, r2 = np.broadcast_arrays(r1, r2)
+        v_inf1 = np.maximum(v_inf1, _short_tof_speed_bound(r1, r2, r1_mag, tof_seconds)
+                            - np.linalg.norm(v_p1, axis=-1))
+        v_inf2 = np.maximum(v_inf2, _short_tof_speed_bound(r1, r2, r2_mag, tof_seconds)
+                            - np.linalg.norm(v_p2, axis=-1))
+    return _parking_burn(v_inf1, start_p) + _parking_burn(v_inf2, end_p)
+
+def route_delV_lower_bound(start_p, end_p):
+    """
+    delV_lower_bound over all dates, from the orbital elements alone: the
+    inner body at aphelion with its largest transverse and radial speeds,
+    the outer one at perihelion. Orbits that overlap only get the
+    parking-orbit burns.
+    """
+    elements = _elements_engine.elements
+    for name in (start_p, end_p):
+        if name not in elements or name not in StdGravPlanets:
+            raise ValueError(f"Unknown body: {name}")
+    inner, outer = sorted([start_p, end_p], key=lambda body: elements[body][0])
+    a_lo, e_lo = elements[inner][0] * _elements_engine.AU, elements[inner][1]
+    a_hi, e_hi = elements[outer][0] * _elements_engine.AU, elements[outer][1]
+
+    v_inf = 0.0
+    if a_lo * (1 + e_lo) < a_hi * (1 - e_hi):
+        h = np.sqrt(StdGravSun * a_lo * (1 - e_lo**2))
+        v_inf = float(_inner_v_inf_bound(a_lo * (1 + e_lo), a_hi * (1 - e_hi),
+                                         h / (a_lo * (1 - e_lo)), StdGravSun * e_lo / h))
+    return float(_parking_burn(v_inf, inner) + _parking_burn(0.0, outer))
+
+def compute_porkchop(start_p, end_p, launch_jds, tof_days, engine=None, max_delta_v=None):
+    """
+    Porkchop grid: every launch day against every time of flight, each cell once.
+    tof_days is a TOF axis shared by all launch days, or an (n_launch, n_tof)
+    array of per-day TOFs. Arrays in the returned dict are shaped
+    (n_launch, n_tof) or (n_launch, n_tof, 3). engine defaults to the shared
+    ephemeris cache. With max_delta_v, cells whose delV_lower_bound exceeds it
+    are not solved (left NaN), marked in the "pruned" mask and counted in
+    "cells_pruned".
+    """
+    if engine is None:
+        engine = get_ephemeris_cache()
+    launch_jds = np.atleast_1d(np.asarray(launch_jds, dtype=float))
+    tof_days = np.atleast_1d(np.asarray(tof_days))
+    arrival_jds = launch_jds[:, None] + tof_days
+    shape = arrival_jds.shape
+
+    # 1. Positions & velocities for the whole window in two batched calls
+    with stats.timer("ephemeris"):
+        r1, v_p1 = engine.get_states(start_p, launch_jds)
+        r2, v_p2 = engine.get_states(end_p, arrival_jds.ravel())
+    r1, v_p1 = r1[0], v_p1[0]
+    r2, v_p2 = r2[0].reshape(shape + (3,)), v_p2[0].reshape(shape + (3,))
+
+    # 2. Highway velocities for the whole grid in one solve; failed cells stay NaN
+    tof = arrival_jds - launch_jds[:, None]
+    if max_delta_v is None:
+        with stats.timer("lambert"):
+            sV1, sV2 = get_highway_velocities(r1[:, None, :], r2, tof)
+    else:
+        # Only cells that could still be flown within max_delta_v
+        with stats.timer("pruning"):
+            bound = delV_lower_bound(start_p, end_p, r1[:, None, :], v_p1[:, None, :], r2, v_p2,
+                                     tof * 24 * 3600)
+            keep = bound <= max_delta_v
+        sV1, sV2 = np.full(shape + (3,), np.nan), np.full(shape + (3,), np.nan)
+        if keep.any():
+            r1_cells = np.broadcast_to(r1[:, None, :], shape + (3,))[keep]
+            with stats.timer("lambert"):
+                sV1[keep], sV2[keep] = get_highway_velocities(r1_cells, r2[keep], tof[keep])
+    converged = np.isfinite(sV1).all(axis=-1)
+
+    with np.errstate(all="ignore"), stats.timer("delta_v"):
+        # 3. Relative velocities & delta-V for every cell
+        iV1, iV2 = get_relative_velocities(sV1, v_p1[:, None, :], sV2, v_p2)
+        dv_departure, dv_arrival = calculate_delV_components(iV1, iV2, start_p, end_p)
+
+    grid = {
+        "launch_jds": launch_jds,
+        "tof_days": tof_days,
+        "arrival_jds": arrival_jds,
+        "converged": converged,
+        "iV1": iV1,
+        "iV2": iV2,
+        "dv_departure": dv_departure,
+        "dv_arrival": dv_arrival,
+        "delta_v": dv_departure + dv_arrival,
+    }
+    if max_delta_v is not None:
+        grid["pruned"] = ~keep
+        grid["cells_pruned"] = int(keep.size - keep.sum())
+    stats.count("cells_evaluated", arrival_jds.size - grid.get("cells_pruned", 0))
+    stats.count("cells_pruned", grid.get("cells_pruned", 0))
+    return grid
+
+CELL_FIELDS = ("arrival_jds", "converged", "iV1", "iV2", "dv_departure", "dv_arrival", "delta_v")
+
+def _merge_porkchops(grid, extra):
+    """Append the TOF columns of a second porkchop over the same launch days"""
+    merged = {"launch_jds": grid["launch_jds"]}
+    for key, value in grid.items():
+        if key == "launch_jds":
             continue
+        if key == "tof_days":
+            shape = grid["arrival_jds"].shape
+            value = np.broadcast_to(value, shape)
+            extra_value = np.broadcast_to(extra[key], extra["arrival_jds"].shape)
+            merged[key] = np.concatenate([value, extra_value], axis=1)
+        else:
+            merged[key] = np.concatenate([value, extra[key]], axis=1)
+    return merged
+
+def hohmann_tof_days(start_p, end_p):
+    """Half the period of the Hohmann ellipse between the two mean orbits"""
+    a_transfer = (SemiMajorAxes[start_p] + SemiMajorAxes[end_p]) / 2
+    return np.pi * np.sqrt(a_transfer**3 / StdGravSun) / (24 * 3600)
+
+def tof_bounds(start_p, end_p):
+    """TOF search range scaled to the bodies' orbits: 0.1x to 2x the Hohmann time"""
+    t_hohmann = hohmann_tof_days(start_p, end_p)
+    return max(1.0, 0.1 * t_hohmann), 2.0 * t_hohmann
+
+def adaptive_porkchop(start_p, end_p, launch_jds, bounds=None, coarse_points=17, basins=2, tol_days=1.0,
+                      max_refine=40, engine=None):
+    """
+    Coarse-to-fine TOF search for every launch day at once.
+    A coarse sweep over the period-scaled bounds brackets each day's lowest
+    local minima (up to `basins` of them, so the search does not settle into
+    the wrong valley). Golden-section steps then narrow every bracket until
+    the minimum is pinned to within tol_days.
+    Returns the coarse grid with each day's best refined cell appended as an
+    extra TOF column (taken from the refinement solves, not re-solved), plus
+    "evaluations", the most Lambert solves any launch day needed, and
+    "cells_evaluated", the Lambert solves over all days.
+    """
+    launch_jds = np.atleast_1d(np.asarray(launch_jds, dtype=float))
+    lo, hi = bounds if bounds is not None else tof_bounds(start_p, end_p)
+    coarse = np.linspace(lo, hi, coarse_points)
+    grid = compute_porkchop(start_p, end_p, launch_jds, coarse, engine)
+    n, days = len(launch_jds), np.arange(len(launch_jds))
+
+    # Each day's best cell so far, starting from the coarse sweep
+    dv = np.where(np.isfinite(grid["delta_v"]), grid["delta_v"], np.inf)
+    cols = np.argmin(dv, axis=1)
+    best = {key: grid[key][days, cols] for key in CELL_FIELDS}
+    best["tof_days"] = coarse[cols]
+
+    # Brackets x1 <= x2 <= x3 around the `basins` lowest coarse local minima (f2 <= f1, f3);
+    # at an end of the range the bracket starts with x1 == x2 or x2 == x3
+    padded = np.pad(dv, ((0, 0), (1, 1)), constant_values=np.inf)
+    minima = np.where((dv <= padded[:, :-2]) & (dv <= padded[:, 2:]), dv, np.inf)
+    j = np.argsort(minima, axis=1, kind="stable")[:, :basins]
+    valid = np.isfinite(np.take_along_axis(minima, j, axis=1))
+    j1, j3 = np.maximum(j - 1, 0), np.minimum(j + 1, coarse_points - 1)
+    x1, x2, x3 = coarse[j1], coarse[j], coarse[j3]
+    f1, f2, f3 = (np.take_along_axis(dv, k, axis=1) for k in (j1, j, j3))
+
+    solves = np.full(n, coarse_points)
+    for _ in range(max_refine):
+        active = valid & (np.maximum(x2 - x1, x3 - x2) > tol_days)
+        if not active.any():
+            break
+        # Golden-section step into the larger side of the bracket, at least tol_days / 2 from x2
+        upper = x3 - x2 > x2 - x1
+        step = np.maximum(0.381966 * np.where(upper, x3 - x2, x2 - x1), tol_days / 2)
+        u = np.where(upper, x2 + step, x2 - step)
+
+        di, bi = np.nonzero(active)
+        cells = compute_porkchop(start_p, end_p, launch_jds[di], u[di, bi, None], engine)
+        np.add.at(solves, di, 1)
+        fu = np.full(x2.shape, np.inf)
+        fu[di, bi] = np.where(np.isfinite(cells["delta_v"][:, 0]), cells["delta_v"][:, 0], np.inf)
+
+        for b in range(basins):
+            # Cells are taken from this solve, so the best refined cell is never solved twice
+            sel = np.flatnonzero(bi == b)
+            best_dv = np.where(np.isfinite(best["delta_v"][di[sel]]), best["delta_v"][di[sel]], np.inf)
+            improved = sel[fu[di[sel], b] < best_dv]
+            for key in CELL_FIELDS:
+                best[key][di[improved]] = cells[key][improved, 0]
+            best["tof_days"][di[improved]] = u[di[improved], b]
+
+        # Keep the minimum bracketed: the lower of u and x2 becomes the new middle point
+        u, fu = np.where(active, u, x2), np.where(active, fu, f2)
+        lower, above = fu < f2, u > x2
+        x1, f1 = (np.where(lower & above, x2, np.where(~lower & ~above & active, u, x1)),
+                  np.where(lower & above, f2, np.where(~lower & ~above & active, fu, f1)))
+        x3, f3 = (np.where(lower & ~above, x2, np.where(~lower & above, u, x3)),
+                  np.where(lower & ~above, f2, np.where(~lower & above, fu, f3)))
+        x2, f2 = np.where(lower, u, x2), np.where(lower, fu, f2)
+
+    refined = {key: value[:, None] for key, value in best.items()}
+    refined["launch_jds"] = launch_jds
+    grid = _merge_porkchops(grid, refined)
+    grid["evaluations"] = int(solves.max()) if n else coarse_points
+    grid["cells_evaluated"] = int(solves.sum())
+    return grid
+
+def anytime_porkchop(start_p, end_p, launch_jds, tof_days, deadline=None, max_evals=None, coarse_cells=64,
+                     max_delta_v=None, engine=None):
+    """
+    Porkchop filled in coarse-to-fine until a time budget (deadline, seconds)
+    or a cell budget (max_evals, cells solved or pruned) runs out. A coarse
+    lattice of about coarse_cells is solved first, then each level halves
+    the lattice stride; every level is one batched Lambert solve, skipping
+    cells whose delV_lower_bound exceeds max_delta_v. When the budget cannot
+    cover a whole level, the cells next to the lowest delta-V so far are
+    solved first, as many as the measured solve cost allows. Unsolved
+    cells stay NaN. With no budget this is compute_porkchop over the grid.
+
+    Adds "evaluated" (cells solved or pruned), "pruned" (with max_delta_v),
+    "complete", "cells_evaluated" (Lambert solves), "cells_pruned" and
+    "optimality_gap": (best - bound) / best, where the bound is the least
+    delta-V any unsolved cell could have (delV_lower_bound, or max_delta_v
+    for pruned cells). The true minimum of the grid is at least
+    best * (1 - optimality_gap); 0 when no unsolved cell can beat the best,
+    None before any cell converged.
+    """
+    started = time.perf_counter()
+    if engine is None:
+        engine = get_ephemeris_cache()
+    launch_jds = np.atleast_1d(np.asarray(launch_jds, dtype=float))
+    tof_days = np.atleast_1d(np.asarray(tof_days, dtype=float))
+    shape = (len(launch_jds), len(tof_days))
+
+    if deadline is None and max_evals is None:
+        grid = compute_porkchop(start_p, end_p, launch_jds, tof_days, engine, max_delta_v)
+        pruned = grid.get("pruned", np.zeros(shape, dtype=bool))
+        grid["evaluated"] = np.ones(shape, dtype=bool)
+        grid["complete"] = True
+        grid["cells_evaluated"] = int(pruned.size - pruned.sum())
+        grid["cells_pruned"] = int(pruned.sum())
+        grid["optimality_gap"] = _optimality_gap(grid["delta_v"], max_delta_v if pruned.any() else np.inf)
+        return grid
+
+    # States and the delta-V lower bound for the whole grid, once: they drive
+    # the pruning and, for the cells never solved, the optimality gap
+    arrival_jds = launch_jds[:, None] + tof_days
+    with stats.timer("ephemeris"):
+        r1, v_p1 = engine.get_states(start_p, launch_jds)
+        r2, v_p2 = engine.get_states(end_p, arrival_jds.ravel())
+    r1, v_p1 = r1[0], v_p1[0]
+    r2, v_p2 = r2[0].reshape(shape + (3,)), v_p2[0].reshape(shape + (3,))
+    tof = arrival_jds - launch_jds[:, None]
+    with stats.timer("pruning"):
+        bound = delV_lower_bound(start_p, end_p, r1[:, None, :], v_p1[:, None, :], r2, v_p2,
+                                 tof * 24 * 3600)
+
+    grid = {
+        "launch_jds": launch_jds,
+        "tof_days": tof_days,
+        "arrival_jds": arrival_jds,
+        "converged": np.zeros(shape, dtype=bool),
+        "iV1": np.full(shape + (3,), np.nan),
+        "iV2": np.full(shape + (3,), np.nan),
+        "dv_departure": np.full(shape, np.nan),
+        "dv_arrival": np.full(shape, np.nan),
+        "delta_v": np.full(shape, np.nan),
+    }
+    evaluated = np.zeros(shape, dtype=bool)
+    pruned = np.zeros(shape, dtype=bool)
+
+    def solve(rows, cols):
+        """Solve the cells (rows[k], cols[k]) in one batch, pruned cells aside"""
+        evaluated[rows, cols] = True
+        if max_delta_v is not None:
+            skip = bound[rows, cols] > max_delta_v
+            pruned[rows[skip], cols[skip]] = True
+            stats.count("cells_pruned", int(skip.sum()))
+            rows, cols = rows[~skip], cols[~skip]
+        stats.count("cells_evaluated", rows.size)
+        if not rows.size:
+            return
+        with stats.timer("lambert"):
+            sV1, sV2 = get_highway_velocities(r1[rows], r2[rows, cols], tof[rows, cols])
+        with np.errstate(all="ignore"), stats.timer("delta_v"):
+            iV1, iV2 = get_relative_velocities(sV1, v_p1[rows], sV2, v_p2[rows, cols])
+            dv_departure, dv_arrival = calculate_delV_components(iV1, iV2, start_p, end_p)
+        grid["converged"][rows, cols] = np.isfinite(sV1).all(axis=-1)
+        grid["iV1"][rows, cols], grid["iV2"][rows, cols] = iV1, iV2
+        grid["dv_departure"][rows, cols], grid["dv_arrival"][rows, cols] = dv_departure, dv_arrival
+        grid["delta_v"][rows, cols] = dv_departure + dv_arrival
+
+    def lattice(start, step, size):
+        return np.arange(start, size, step)
+
+    def cells(rows, cols):
+        return np.repeat(rows, len(cols)), np.tile(cols, len(rows))
+
+    stride = 1
+    while stride < max(shape) and (len(lattice(0, 2 * stride, shape[0]))
+                                   * len(lattice(0, 2 * stride, shape[1]))) >= coarse_cells:
+        stride *= 2
+
+    timings = []  # (cells, seconds) of each level's solve
+    first = True
+    while stride >= 1:
+        # New cells of this level: the stride lattice minus the coarser (2 * stride) one
+        if first:
+            rows, cols = cells(lattice(0, stride, shape[0]), lattice(0, stride, shape[1]))
+        else:
+            rows_a, cols_a = cells(lattice(stride, 2 * stride, shape[0]), lattice(0, stride, shape[1]))
+            rows_b, cols_b = cells(lattice(0, 2 * stride, shape[0]), lattice(stride, 2 * stride, shape[1]))
+            rows, cols = np.concatenate([rows_a, rows_b]), np.concatenate([cols_a, cols_b])
+        n_new = rows.size
+
+        allowed = n_new
+        if max_evals is not None:
+            allowed = min(allowed, max_evals - int(evaluated.sum()))
+        if deadline is not None:
+            remaining = deadline - (time.perf_counter() - started)
+            if not timings:
+                # Nothing measured yet: only the coarse lattice if any time is left
+                allowed = allowed if remaining > 0 else 0
+            else:
+                # A solve costs a fixed overhead plus a time per cell, fitted
+                # from the last two levels (time per cell alone after one);
+                # a fifth of the time left is kept back for timing noise
+                n_last, t_last = timings[-1]
+                per_cell = t_last / n_last
+                if len(timings) > 1 and n_last > timings[-2][0] and t_last > timings[-2][1]:
+                    per_cell = (t_last - timings[-2][1]) / (n_last - timings[-2][0])
+                overhead = max(t_last - per_cell * n_last, 0.0)
+                allowed = min(allowed, int((0.8 * remaining - overhead) / per_cell))
+        if allowed <= 0:
+            break
+
+        if allowed < n_new:
+            # Only part of the level fits: rank its cells by the best delta-V at the
+            # corners of their coarser lattice square and solve the best ones
+            if first:
+                order = np.linspace(0, n_new - 1, allowed).astype(int)
+            else:
+                p = 2 * stride
+                dv = np.where(np.isfinite(grid["delta_v"]), grid["delta_v"], np.inf)
+                r0, c0 = (rows // p) * p, (cols // p) * p
+                r_hi = np.minimum(r0 + p, ((shape[0] - 1) // p) * p)
+                c_hi = np.minimum(c0 + p, ((shape[1] - 1) // p) * p)
+                priority = np.minimum(np.minimum(dv[r0, c0], dv[r0, c_hi]), np.minimum(dv[r_hi, c0], dv[r_hi, c_hi]))
+                order = np.argsort(priority, kind="stable")[:allowed]
+            rows, cols = rows[order], cols[order]
+
+        level_started = time.perf_counter()
+        solve(rows, cols)
+        timings.append((rows.size, time.perf_counter() - level_started))
+        if allowed < n_new:
+            break
+        first = False
+        stride //= 2
+
+    if max_delta_v is not None:
+        grid["pruned"] = pruned
+    grid["evaluated"] = evaluated
+    grid["complete"] = bool(evaluated.all())
+    grid["cells_evaluated"] = int(evaluated.sum() - pruned.sum())
+    grid["cells_pruned"] = int(pruned.sum())
+    unsolved_bound = bound[~evaluated].min(initial=np.inf)
+    if pruned.any():
+        unsolved_bound = min(unsolved_bound, max_delta_v)
+    grid["optimality_gap"] = _optimality_gap(grid["delta_v"], unsolved_bound)
+    return grid
+
+def _optimality_gap(delta_v, bound):
+    """(best - bound) / best, clamped at 0; None if no cell converged"""
+    if not np.isfinite(delta_v).any():
+        return None
+    best = np.nanmin(delta_v)
+    return float(max(best - bound, 0.0) / best)
+
+def get_required_fuel_fleet(delV_total, ship_names, payloads):
+    """
+    get_required_fuel broadcast over ships and payloads at once.
+    fuel / possible are shaped (n_ships, n_payloads) + delV_total.shape.
+    """
+    delV_total = np.asarray(delV_total)
+    extra = (1,) * delV_total.ndim
+    dmass = np.array([ships[s]["DMass"] for s in ship_names]).reshape((-1, 1) + extra)
+    si = np.array([ships[s]["SI"] for s in ship_names]).reshape((-1, 1) + extra)
+    cap = np.array([ships[s]["Fuel_Cap"] for s in ship_names]).reshape((-1, 1) + extra)
+
+    mf = dmass + np.asarray(payloads, dtype=float).reshape((1, -1) + extra)
+    m0 = mf * np.exp(delV_total / si)
+    fuel_needed = m0 - mf
+    possible = fuel_needed <= cap
+    return fuel_needed, possible
+
+def get_max_payload(delV_total, ship_names):
+    """
+    Rocket equation solved for the payload: the most a ship can carry at
+    delV_total is Fuel_Cap / (e^(dV/SI) - 1) - DMass, clamped to Max_PLMass.
+    Shaped (n_ships,) + delV_total.shape; NaN where the ship cannot make the
+    flight even empty or the delta-V is undefined.
+    """
+    delV_total = np.asarray(delV_total)
+    extra = (1,) * delV_total.ndim
+    dmass = np.array([ships[s]["DMass"] for s in ship_names]).reshape((-1,) + extra)
+    si = np.array([ships[s]["SI"] for s in ship_names]).reshape((-1,) + extra)
+    cap = np.array([ships[s]["Fuel_Cap"] for s in ship_names]).reshape((-1,) + extra)
+    max_pl = np.array([ships[s]["Max_PLMass"] for s in ship_names]).reshape((-1,) + extra)
+
+    with np.errstate(all="ignore"):
+        payload = cap / np.expm1(delV_total / si) - dmass
+    payload = np.minimum(payload, max_pl)
+    return np.where(payload >= 0, payload, np.nan)
+
+def porkchop_fuel(grid, ship_name, payload):
+    """Fuel and feasibility for every porkchop cell; failed cells are infeasible"""
+    with np.errstate(all="ignore"), stats.timer("fuel"):
+        fuel, possible = get_required_fuel(grid["delta_v"], ship_name, payload)
+    possible = possible & np.isfinite(fuel)
+    return fuel, possible
+
+def _pick_flights(grid, fuel, possible):
+    """(i, j) of the most fuel-efficient and the soonest-arriving feasible cells"""
+    cells = np.argwhere(possible)
+    cell_fuel = fuel[possible]
+    efficient = cells[np.argmin(cell_fuel)]
+    # Soonest arrival; ties broken by lower fuel
+    order = np.lexsort((cell_fuel, grid["arrival_jds"][possible]))
+    fastest = cells[order[0]]
+    return tuple(efficient), tuple(fastest)
+
+def _tof_value(tof):
+    return int(tof) if float(tof).is_integer() else round(float(tof), 3)
+
+def _flight_entry(grid, fuel, cell):
+    i, j = cell
+    return {
+        "launch_date": jd_to_date(grid["launch_jds"][i]),
+        "v_inf_departure": grid["iV1"][i, j],
+        "dv_departure": float(grid["dv_departure"][i, j]),
+        "fuel_required": float(fuel[i, j]),
+        "arrival_date": jd_to_date(grid["arrival_jds"][i, j]),
+        "v_inf_arrival": grid["iV2"][i, j],
+        "dv_arrival": float(grid["dv_arrival"][i, j]),
+        "tof_days": _tof_value(grid["arrival_jds"][i, j] - grid["launch_jds"][i])
+    }
+
+def find_best_flight(start_p, end_p, ship_name, payload, date_str, engine=None, mode="grid"):
+    """
+    YOUR function - lowest-fuel TOF for a single launch date.
+    mode="adaptive" replaces the fixed 100-400 day grid with adaptive_porkchop.
+    The grid skips cells the ship provably cannot fly (delV_lower_bound).
+    """
+    if mode == "adaptive":
+        grid = adaptive_porkchop(start_p, end_p, [date_to_jd(date_str)], engine=engine)
+    else:
+        tofs = np.arange(100, 400, 20)
+        limit = max_ship_delV(ship_name, payload)
+        if route_delV_lower_bound(start_p, end_p) > limit:
+            return {"Flight impossible": True, "Fuel": 0, "deltaV": 0, "cells_pruned": len(tofs)}
+        grid = compute_porkchop(start_p, end_p, [date_to_jd(date_str)], tofs, engine, max_delta_v=limit)
+    fuel, possible = porkchop_fuel(grid, ship_name, payload)
     
-    if best_result is None:
+    if not possible.any():
         return {
             "Flight impossible": True,
             "Fuel": 0,
-            "deltaV": 0
+            "deltaV": 0,
+            "cells_pruned": grid.get("cells_pruned", 0)
         }
     
-    return best_result
+    cell, _ = _pick_flights(grid, fuel, possible)
+    flight = _flight_entry(grid, fuel, cell)
+    return {
+        "Flight impossible": False,
+        "Fuel": flight["fuel_required"],
+        "deltaV": float(grid["delta_v"][cell]),
+        "TOF_days": flight["tof_days"],
+        "Launch_date": flight["launch_date"],
+        "Arrival_date": flight["arrival_date"],
+        "iV1": flight["v_inf_departure"],
+        "iV2": flight["v_inf_arrival"],
+        "cells_pruned": grid.get("cells_pruned", 0)
+    }
 
-def find_best_mission(start_planet, end_planet, ship_name, payload_mass, launch_date_str, min_tof, max_tof, step):
-    """Bridge function for nav_cli.py to find efficient vs fastest routes"""
-    engine = SolarSystemEngine() #
-    flights = []
-    
-    for tof in range(min_tof, max_tof + 1, step):
-        res = find_best_flight(start_planet, end_planet, ship_name, payload_mass, launch_date_str) # 
-        if not res["Flight impossible"]:
-            # Recalculate specifically for this TOF to separate Fast vs Efficient
-            flights.append(res)
-            
-    if not flights:
-        return {"flight_impossible": True, "reason": "No viable trajectory found within constraints."}
-
-    # Efficiency = Lowest Fuel; Fastest = Shortest TOF
-    efficient = min(flights, key=lambda x: x["Fuel"])
-    fastest = min(flights, key=lambda x: x["TOF_days"])
+def launch_window(launch_date_str, end_date_str=None):
+    """Julian days of every launch date in [launch_date_str, end_date_str]"""
+    jd_start = date_to_jd(launch_date_str)
+    jd_end = date_to_jd(end_date_str) if end_date_str else jd_start
+    if jd_end < jd_start:
+        raise ValueError("End of launch window is before its start")
+    return np.arange(jd_start, jd_end + 0.5, 1.0)
+
+def mission_porkchop(start_planet, end_planet, launch_date_str, min_tof, max_tof, step,
+                     end_date_str=None, engine=None, tof_mode="grid", max_delta_v=None):
+    """
+    Porkchop over the launch window [launch_date_str, end_date_str] for the
+    chosen TOF mode (max_delta_v prunes cells of the fixed grid)
+    """
+    launch_jds = launch_window(launch_date_str, end_date_str)
+    if tof_mode == "adaptive":
+        return adaptive_porkchop(start_planet, end_planet, launch_jds, engine=engine)
+    return compute_porkchop(start_planet, end_planet, launch_jds, np.arange(min_tof, max_tof + 1, step), engine,
+                            max_delta_v=max_delta_v)
+
+def find_best_mission(start_planet, end_planet, ship_name, payload_mass, launch_date_str, min_tof, max_tof, step,
+                      end_date_str=None, engine=None, tof_mode="grid", store=None, deadline=None, max_evals=None):
+    """
+    Bridge function for nav_cli.py to find efficient vs fastest routes.
+    Scans every launch day in [launch_date_str, end_date_str] against the
+    min_tof..max_tof grid in one porkchop pass. tof_mode="adaptive" uses
+    adaptive_porkchop with period-scaled TOF bounds instead of the fixed grid.
+    With a route_store.RouteStore, stored results are returned without
+    computing and new ones are saved (stored results carry the flights and
+    scalar fields only, not the porkchop grids).
+    A deadline (seconds) or max_evals (cells) makes the grid search anytime
+    (anytime_porkchop): the best flights found within the budget are returned
+    with "complete", "cells_evaluated" and "optimality_gap"; cells the ship
+    provably cannot fly are pruned as in the full grid search.
+    """
+    key = None
+    if store is not None:
+        jd_start = date_to_jd(launch_date_str)
+        jd_end = date_to_jd(end_date_str) if end_date_str else jd_start
+        search = {"min_tof": min_tof, "max_tof": max_tof, "step": step, "tof_mode": tof_mode}
+        key = (start_planet, end_planet, ship_name, payload_mass, jd_start, jd_end, search)
+        result = store.get(*key)
+        if result is not None:
+            return result
+
+    if deadline is None and max_evals is None:
+        result = _plan_mission(start_planet, end_planet, ship_name, payload_mass, launch_date_str,
+                               min_tof, max_tof, step, end_date_str, engine, tof_mode)
+    else:
+        if tof_mode != "grid":
+            raise ValueError("deadline/max_evals need tof_mode='grid'")
+        grid = anytime_porkchop(start_planet, end_planet, launch_window(launch_date_str, end_date_str),
+                                np.arange(min_tof, max_tof + 1, step), deadline, max_evals,
+                                max_delta_v=max_ship_delV(ship_name, payload_mass), engine=engine)
+        result = mission_from_grid(grid, ship_name, payload_mass)
+        result.update({k: grid[k] for k in ("complete", "cells_evaluated", "optimality_gap")})
+        if not grid["complete"]:
+            return result
+
+    if key is not None:
+        store.put(*key, result)
+    return result
+
+def _plan_mission(start_planet, end_planet, ship_name, payload_mass, launch_date_str, min_tof, max_tof, step,
+                  end_date_str, engine, tof_mode):
+    with stats.timer("mission_search"):
+        max_delta_v = None
+        if tof_mode == "grid":
+            # Routes the ship cannot fly on any date are rejected before any ephemeris or Lambert work
+            max_delta_v = max_ship_delV(ship_name, payload_mass)
+            if route_delV_lower_bound(start_planet, end_planet) > max_delta_v:
+                n_cells = (len(launch_window(launch_date_str, end_date_str))
+                           * len(np.arange(min_tof, max_tof + 1, step)))
+                stats.count("cells_pruned", n_cells)
+                stats.count("routes_pruned")
+                return {"flight_impossible": True, "reason": "Route needs more delta-V than the ship can deliver.",
+                        "cells_pruned": n_cells}
+        grid = mission_porkchop(start_planet, end_planet, launch_date_str, min_tof, max_tof, step,
+                                end_date_str, engine, tof_mode, max_delta_v)
+        return mission_from_grid(grid, ship_name, payload_mass)
+
+def mission_from_grid(grid, ship_name, payload_mass):
+    """find_best_mission's result for an already computed porkchop grid"""
+    fuel, possible = porkchop_fuel(grid, ship_name, payload_mass)
+
+    if not possible.any():
+        return {"flight_impossible": True, "reason": "No viable trajectory found within constraints.",
+                "cells_pruned": grid.get("cells_pruned", 0)}
+
+    # Efficiency = Lowest Fuel; Fastest = Soonest arrival
+    efficient, fastest = _pick_flights(grid, fuel, possible)
 
     return {
         "flight_impossible": False,
-        "efficient_flight": {
-            "launch_date": efficient["Launch_date"],
-            "v_inf_departure": efficient["iV1"],
-            "dv_departure": efficient["deltaV"] / 2, # Approximation
-            "fuel_required": efficient["Fuel"],
-            "arrival_date": efficient["Arrival_date"],
-            "v_inf_arrival": efficient["iV2"],
-            "dv_arrival": efficient["deltaV"] / 2,
-            "tof_days": efficient["TOF_days"]
-        },
-        "fastest_flight": {
-            "launch_date": fastest["Launch_date"],
-            "v_inf_departure": fastest["iV1"],
-            "dv_departure": fastest["deltaV"] / 2,
-            "fuel_required": fastest["Fuel"],
-            "arrival_date": fastest["Arrival_date"],
-            "v_inf_arrival": fastest["iV2"],
-            "dv_arrival": fastest["deltaV"] / 2,
-            "tof_days": fastest["TOF_days"]
-        }
+        "efficient_flight": _flight_entry(grid, fuel, efficient),
+        "fastest_flight": _flight_entry(grid, fuel, fastest),
+        "launch_dates": [jd_to_date(jd) for jd in grid["launch_jds"]],
+        "tof_days": grid["tof_days"],
+        "delta_v": grid["delta_v"],
+        "fuel": fuel,
+        "feasible": possible,
+        "cells_pruned": grid.get("cells_pruned", 0)
+    }
+
+def iter_mission(start_planet, end_planet, ship_name, payload_mass, launch_date_str, min_tof, max_tof, step,
+                 end_date_str=None, engine=None, tof_mode="grid", chunk_days=7, cells=True):
+    """
+    Generator form of find_best_mission: the window is solved chunk_days
+    launch days at a time and records are yielded as they are produced:
+      {"type": "cell", ...}       every evaluated launch/TOF cell (if cells)
+      {"type": "efficient", ...}  the lowest-fuel flight improved
+      {"type": "fastest", ...}    the soonest-arrival flight improved
+      {"type": "done", ...}       final efficient/fastest flights
+    Closing the generator early stops the search. Grid cells the ship
+    provably cannot fly are not solved: they are left out of the cell
+    records and only counted in the final "cells_pruned".
+    """
+    launch_jds = launch_window(launch_date_str, end_date_str)
+    tofs = np.arange(min_tof, max_tof + 1, step)
+    best_efficient = best_fastest = None
+    evaluated = pruned = 0
+
+    max_delta_v = max_ship_delV(ship_name, payload_mass)
+    if tof_mode == "grid" and route_delV_lower_bound(start_planet, end_planet) > max_delta_v:
+        launch_jds = launch_jds[:0]
+        pruned = len(launch_window(launch_date_str, end_date_str)) * len(tofs)
+
+    for k in range(0, len(launch_jds), chunk_days):
+        days = launch_jds[k:k + chunk_days]
+        if tof_mode == "adaptive":
+            grid = adaptive_porkchop(start_planet, end_planet, days, engine=engine)
+            evaluated += grid["cells_evaluated"]
+        else:
+            grid = compute_porkchop(start_planet, end_planet, days, tofs, engine, max_delta_v=max_delta_v)
+            pruned += grid["cells_pruned"]
+            evaluated += grid["delta_v"].size - grid["cells_pruned"]
+        fuel, possible = porkchop_fuel(grid, ship_name, payload_mass)
+
+        if cells:
+            solved = ~grid.get("pruned", np.zeros(fuel.shape, dtype=bool))
+            for i, j in zip(*np.nonzero(solved)):
+                yield {
+                    "type": "cell",
+                    "launch_date": jd_to_date(grid["launch_jds"][i]),
+                    "tof_days": _tof_value(grid["arrival_jds"][i, j] - grid["launch_jds"][i]),
+                    "delta_v": float(grid["delta_v"][i, j]),
+                    "fuel_required": float(fuel[i, j]),
+                    "feasible": bool(possible[i, j])
+                }
+        if not possible.any():
+            continue
+
+        # Same tie-breaking as _pick_flights over the whole window: earlier cells win ties
+        efficient, fastest = _pick_flights(grid, fuel, possible)
+        if best_efficient is None or fuel[efficient] < best_efficient["fuel_required"]:
+            best_efficient = _flight_entry(grid, fuel, efficient)
+            yield {"type": "efficient", "flight": best_efficient}
+        arrival = (grid["arrival_jds"][fastest], fuel[fastest])
+        if best_fastest is None or arrival < best_fastest[0]:
+            best_fastest = (arrival, _flight_entry(grid, fuel, fastest))
+            yield {"type": "fastest", "flight": best_fastest[1]}
+
+    yield {
+        "type": "done",
+        "flight_impossible": best_efficient is None,
+        "efficient_flight": best_efficient,
+        "fastest_flight": best_fastest[1] if best_fastest else None,
+        "cells_evaluated": evaluated,
+        "cells_pruned": pruned
+    }
+
+def evaluate_fleet(start_planet, end_planet, payloads, launch_date_str, min_tof, max_tof, step,
+                   end_date_str=None, ship_names=None, engine=None, tof_mode="grid"):
+    """
+    Every ship x payload on one route: the trajectories are solved once and
+    only the rocket equation is broadcast across the fleet. Returns rows
+    ranked feasible-first, then by fuel, each with its most efficient flight.
+    A payload above the ship's Max_PLMass counts as infeasible.
+    """
+    if ship_names is None:
+        ship_names = list(ships)
+    payloads = np.atleast_1d(np.asarray(payloads, dtype=float))
+    grid = mission_porkchop(start_planet, end_planet, launch_date_str, min_tof, max_tof, step,
+                            end_date_str, engine, tof_mode)
+
+    with np.errstate(all="ignore"):
+        fuel, possible = get_required_fuel_fleet(grid["delta_v"], ship_names, payloads)
+    max_payload = np.array([ships[s]["Max_PLMass"] for s in ship_names])
+    payload_ok = payloads[None, :] <= max_payload[:, None]
+    possible &= np.isfinite(fuel) & payload_ok[:, :, None, None]
+
+    # Most efficient cell per ship/payload; infeasible pairs fall back to their cheapest cell
+    n_cells = grid["delta_v"].size
+    flat_fuel = np.where(np.isfinite(fuel), fuel, np.inf).reshape(len(ship_names), len(payloads), n_cells)
+    feasible_fuel = np.where(possible.reshape(flat_fuel.shape), flat_fuel, np.inf)
+    best = np.where(np.isfinite(feasible_fuel).any(axis=-1),
+                    np.argmin(feasible_fuel, axis=-1), np.argmin(flat_fuel, axis=-1))
+
+    rows = []
+    for s, ship_name in enumerate(ship_names):
+        for p, payload in enumerate(payloads):
+            cell = np.unravel_index(best[s, p], grid["delta_v"].shape)
+            feasible = bool(possible[s, p][cell])
+            row = {
+                "ship": ship_name,
+                "payload": float(payload),
+                "feasible": feasible,
+                "within_payload_limit": bool(payload_ok[s, p]),
+                "flight": None
+            }
+            if np.isfinite(flat_fuel[s, p, best[s, p]]):
+                row["flight"] = _flight_entry(grid, fuel[s, p], cell)
+            rows.append(row)
+
+    rows.sort(key=lambda r: (not r["feasible"], r["flight"]["fuel_required"] if r["flight"] else np.inf))
+    return {
+        "route": [start_planet, end_planet],
+        "launch_dates": [jd_to_date(jd) for jd in grid["launch_jds"]],
+        "fleet": rows
+    }
+
+def find_max_payload(start_planet, end_planet, launch_date_str, min_tof, max_tof, step,
+                     end_date_str=None, ship_names=None, engine=None, tof_mode="grid"):
+    """
+    Maximum payload per ship over the launch window, in closed form for every
+    porkchop cell ("max_payload", shaped (n_ships, n_launch, n_tof)). Ships
+    are ranked by their best cell, which comes with the flight that carries it.
+    """
+    if ship_names is None:
+        ship_names = list(ships)
+    grid = mission_porkchop(start_planet, end_planet, launch_date_str, min_tof, max_tof, step,
+                            end_date_str, engine, tof_mode)
+    max_payload = get_max_payload(grid["delta_v"], ship_names)
+
+    rows = []
+    for s, ship_name in enumerate(ship_names):
+        capacity = max_payload[s]
+        row = {"ship": ship_name, "flight_impossible": bool(np.isnan(capacity).all()), "max_payload": 0.0,
+               "flight": None, "per_launch_date": [None] * len(grid["launch_jds"])}
+        if not row["flight_impossible"]:
+            # Best cell: largest payload, ties (the Max_PLMass clamp) broken by lower delta-V
+            dv = np.where(capacity == np.nanmax(capacity), grid["delta_v"], np.inf)
+            cell = np.unravel_index(np.argmin(dv), dv.shape)
+            row["max_payload"] = float(capacity[cell])
+            fuel, _ = porkchop_fuel(grid, ship_name, row["max_payload"])
+            row["flight"] = _flight_entry(grid, fuel, cell)
+            with np.errstate(all="ignore"):
+                per_day = np.nanmax(np.where(np.isnan(capacity), -np.inf, capacity), axis=1)
+            row["per_launch_date"] = [float(p) if p >= 0 else None for p in per_day]
+        rows.append(row)
+
+    rows.sort(key=lambda r: -r["max_payload"])
+    return {
+        "route": [start_planet, end_planet],
+        "launch_dates": [jd_to_date(jd) for jd in grid["launch_jds"]],
+        "tof_days": grid["tof_days"],
+        "ship_names": list(ship_names),
+        "max_payload": max_payload,
+        "ships": rows
     }
 
 if __name__ == "__main__":
@@ -6,7 +6,15 @@ from pygame import *
 from math import *
 import numpy as np
 from collections import deque
-from formula_implementation import find_best_flight
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from formula_implementation import iter_mission, launch_window
+from nav_cli import parse_ship_name
+from sprite_cache import SpriteCache
+from mission_animation import build_animation, project_animation, animation_seconds, sample_index, sample_date
+from mission_render import (orbit_data, orbit_radii, planet_image_path, scene_center, draw_solar_system,
+                            draw_transfer_arc, draw_bodies, draw_ship)
 
 init()
 font.init()
@@ -38,19 +46,17 @@ btn_launch = Rect(275, 420, 250, 60)#launch button inside mission screen
 btn_back = Rect(20, 20, 120, 45)#back button
 btn_exit = Rect(WIDTH - 140, 20, 120, 45)
 
+#every image is loaded once and scaled once per size; F11 invalidates the scaled copies
+sprites = SpriteCache()
+
 #background images
-menu_bg = image.load("images/ss.jpg").convert()
-screen1_bg = image.load("images/bg.jpg").convert()
-screen2_bg = image.load("images/bbg.jpg").convert()
-menu_bg = transform.scale(menu_bg, (WIDTH, HEIGHT))
-screen1_bg = transform.scale(screen1_bg, (WIDTH, HEIGHT))
-screen2_bg = transform.scale(screen2_bg, (WIDTH, HEIGHT))
-
-logo_img = None
-try:
-    logo_img = image.load("images/lgo.png").convert_alpha()
-except:
-    logo_img = None
+MENU_BG = "images/ss.jpg"
+SCREEN1_BG = "images/bg.jpg"
+SCREEN2_BG = "images/bbg.jpg"
+LOGO_IMG = "images/lgo.png"
+
+def background(path):
+    return sprites.scaled(path, (WIDTH, HEIGHT), smooth=False, alpha=False)
 
 planet_options = [
     "Mercury", "Venus", "Earth", "Mars", "Ceres",
@@ -58,25 +64,11 @@ planet_options = [
     "Pluto"
 ]
 
-planet_imgs = {}
-for p in planet_options:
-    try:
-        planet_imgs[p] = image.load(f"images/{p.lower()}.png").convert_alpha()
-    except:
-        planet_imgs[p] = None
-
-logo_img = None
-try:
-    logo_img = image.load("images/lgo.png").convert_alpha()
-except:
-    logo_img = None
+planet_imgs = {p: planet_image_path(p) for p in planet_options}
 
-rocket_img = None
-try:
-    rocket_img = image.load("images/rocket.png").convert_alpha()
-    rocket_img = transform.smoothscale(rocket_img, (30, 30))  # Adjust size
-except:
-    rocket_img = None
+def planet_img(name, size):
+    #planet image scaled to size x size (None if it is missing)
+    return sprites.scaled(planet_imgs[name], (size, size))
 
 dep_rect = Rect(270, 100, 360, 40)
 dest_rect = Rect(270, 160, 360, 40)
@@ -96,39 +88,13 @@ active_input = -1
 ship_rect = Rect(270, 280, 360, 40)
 ship_open = False
 ship_options = [
-    "Cheverolet", "The Planet Hopper", "Moonivan",
+    "Chevrolet", "The Planet Hopper", "Moonivan",
     "Blue Origin Delivery Ship", "Yamaha Space Cycle",
     "Ford F-1500", "Beheamoth"
 ]
 ship_selected = ship_options[0]
 
-orbit_data = {
-    "Mercury": (45,  1.0),
-    "Venus":   (70,  1.10),
-    "Earth":   (100, 1.2),
-    "Mars":    (150, 0.90),
-    "Ceres":   (180, 0.65),
-    "Jupiter": (230, 0.45),
-    "Saturn":  (280, 0.40),
-    "Uranus":  (320, 0.42),
-    "Neptune": (350, 0.45),
-    "Pluto":   (400, 0.6),
-}
-
-planet_sizes = {
-    "Mercury": 12,
-    "Venus": 18,
-    "Earth": 20,
-    "Mars": 15,
-    "Jupiter": 40,
-    "Saturn": 35,
-    "Uranus": 25,
-    "Neptune": 24,
-    "Pluto": 10,
-    "Ceres": 12
-}
-
-sun_pos = (WIDTH // 2, HEIGHT // 2 + 40)
+sun_pos = scene_center(WIDTH, HEIGHT)
 sim_time = 0.0
 
 travel_active = False
@@ -141,12 +107,36 @@ travel_window = ""
 exhaust_trail = []
 buffer = deque(maxlen=10)
 
+#background route planning (LAUNCH submits a job, screen3 polls it every frame)
+PLAN_MIN_TOF, PLAN_MAX_TOF, PLAN_STEP = 50, 500, 15
+planner = ThreadPoolExecutor(max_workers=1)
+plan_job = None
+plan_result = None
+plan_error = ""
+
+#planned flights replay their real trajectory (screen coordinates per sample)
+anim_xy = None
+plan_version = 0
+
 def safe_float(s, default=0.0):
     try:
         return float(s.strip())
     except:
         return default
 
+#every frame records what it drew in dirty_rects; the next frame restores the static layer there
+dirty_rects = []
+drawn_screen = None
+layers = {}
+
+def mark(rect):
+    dirty_rects.append(rect)
+    return rect
+
+def text(fnt, string, color):
+    #memoized fnt.render(string, True, color)
+    return sprites.text(fnt, string, color)
+
 def draw_button(rect, text, base_col, hover_col, text_col=BLACK, border_col=BLACK):
     mx, my = mouse.get_pos()
     hovering = rect.collidepoint((mx, my))
@@ -160,20 +150,23 @@ def draw_button(rect, text, base_col, hover_col, text_col=BLACK, border_col=BLAC
     draw.rect(screen, col, rect, border_radius=12)
     draw.rect(screen, border_col, rect, 2, border_radius=12)
 
-    label = main_font.render(text, True, text_col)
+    label = sprites.text(main_font, text, text_col)
     screen.blit(label, label.get_rect(center=rect.center))
+    mark(rect.union(shadow_rect))
     return hovering
 
 def draw_input_box(r, text, is_active):
     draw.rect(screen, WHITE, r)
     draw.rect(screen, BLACK, r, 3 if is_active else 2)
-    t = ui_font.render(text, True, BLACK)
+    t = sprites.text(ui_font, text, BLACK)
     screen.blit(t, (r.x + 10, r.y + 8))
+    mark(r)
 
 def draw_dropdown_box(rect, selected, open_state, options, draw_list=True):
     draw.rect(screen, WHITE, rect)
     draw.rect(screen, BLACK, rect, 2)
-    screen.blit(ui_font.render(selected, True, BLACK), (rect.x + 10, rect.y + 8))
+    screen.blit(text(ui_font, selected, BLACK), (rect.x + 10, rect.y + 8))
+    mark(rect)
 
     draw.polygon(screen, BLACK, [
         (rect.right - 25, rect.y + 15),
@@ -186,7 +179,8 @@ def draw_dropdown_box(rect, selected, open_state, options, draw_list=True):
             opt_rect = Rect(rect.x, rect.y + (i + 1) * rect.h, rect.w, rect.h)
             draw.rect(screen, WHITE, opt_rect)
             draw.rect(screen, BLACK, opt_rect, 1)
-            screen.blit(ui_font.render(opt, True, BLACK), (opt_rect.x + 10, opt_rect.y + 8))
+            screen.blit(text(ui_font, opt, BLACK), (opt_rect.x + 10, opt_rect.y + 8))
+        mark(Rect(rect.x, rect.bottom, rect.w, rect.h * len(options)))
 
 def pick_dropdown_option(pos, rect, open_state, options):
     if not open_state:
@@ -208,11 +202,174 @@ def planet_xy(name, t):
     y = sun_pos[1] + sin(ang) * r * 0.7#we multiply y by 0.7 to squash the circle into an ellipse which gives us a 3dish look
     return (int(x), int(y))
 
-def draw_orbit(r):
-    #MATH LOGIC or
-    rect_orb = Rect(0, 0, r * 2, int(r * 2 * 0.7))#we draw an ellipse whose width is 2r and height is 2r*0.7
-    rect_orb.center = sun_pos#the ellipse is centered at the sun position so it looks like an orbit track
-    draw.ellipse(screen, (80, 80, 80), rect_orb, 1)
+def parse_launch_window(text):
+    #"DDMMYY" or "DDMMYY-DDMMYY"; an empty box means today
+    parts = [p for p in text.replace(" ", "-").split("-") if p]
+    if not parts:
+        return datetime.now().strftime("%d%m%y"), None
+    if len(parts) > 2:
+        raise ValueError("Launch window must be DDMMYY or DDMMYY-DDMMYY")
+    return parts[0], (parts[1] if len(parts) == 2 else None)
+
+def plan_mission(job, start, dest, ship, payload, window_text):
+    #runs on the planner thread; iter_mission is consumed one launch day at a time
+    #so a cancelled job stops after the current day instead of finishing the search
+    launch_date, end_date = parse_launch_window(window_text)
+    ship_name = parse_ship_name(ship)
+    total = len(launch_window(launch_date, end_date)) * len(range(PLAN_MIN_TOF, PLAN_MAX_TOF + 1, PLAN_STEP))
+    records = iter_mission(start, dest, ship_name, payload, launch_date, PLAN_MIN_TOF, PLAN_MAX_TOF,
+                           PLAN_STEP, end_date, chunk_days=1)
+    try:
+        for rec in records:
+            if job["cancel"].is_set():
+                return None
+            if rec["type"] == "cell":
+                job["cells"] += 1
+                job["progress"] = job["cells"] / total
+            elif rec["type"] == "efficient":
+                job["best_fuel"] = rec["flight"]["fuel_required"]
+            elif rec["type"] == "done":
+                #sample the planets and the transfer arc once, off the render thread
+                if not rec["flight_impossible"]:
+                    rec["animation"] = build_animation(start, dest, rec["efficient_flight"], planet_options)
+                return rec
+    finally:
+        records.close()
+
+def start_planning(start, dest, ship, payload, window_text):
+    global plan_job, plan_result, plan_error, anim_xy, plan_version
+    cancel_planning()
+    plan_result, plan_error, anim_xy = None, "", None
+    plan_version += 1
+    job = {"cancel": threading.Event(), "cells": 0, "progress": 0.0, "best_fuel": None}
+    job["future"] = planner.submit(plan_mission, job, start, dest, ship, payload, window_text)
+    plan_job = job
+
+def cancel_planning():
+    #a queued job never starts; a running one notices the flag at its next record
+    global plan_job
+    if plan_job is not None:
+        plan_job["cancel"].set()
+        plan_job["future"].cancel()
+        plan_job = None
+
+def poll_planning():
+    #move a finished job's result (or error) into plan_result/plan_error; True when it just finished
+    global plan_job, plan_result, plan_error, plan_version
+    if plan_job is None or not plan_job["future"].done():
+        return False
+    plan_version += 1
+    try:
+        plan_result = plan_job["future"].result()
+    except Exception as e:
+        plan_error = str(e)
+    plan_job = None
+    return True
+
+def project_plan():
+    #screen coordinates of the planned flight for the current sun position (one vectorized step)
+    global anim_xy, plan_version
+    anim_xy = None
+    plan_version += 1
+    #an arc that misses the destination is not shown (the status line says why)
+    if plan_result is not None and "animation" in plan_result and plan_result["animation"]["valid"]:
+        anim_xy = project_animation(plan_result["animation"], orbit_radii, sun_pos)
+
+def draw_spinner(center, t, radius=14):
+    rect_spin = Rect(0, 0, radius * 2, radius * 2)
+    rect_spin.center = center
+    mark(draw.arc(screen, WHITE, rect_spin, t * 5, t * 5 + 4.5, 3))
+
+def format_plan_flight(label, flight):
+    return (f"{label}: launch {flight['launch_date']}, arrive {flight['arrival_date']}, "
+            f"{flight['tof_days']} d, fuel {flight['fuel_required']:,.0f} kg")
+
+def static_layer(name, key, build):
+    #full-screen surface with everything on a screen that does not move, rebuilt when key changes
+    cached = layers.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1], False
+    layer = Surface((WIDTH, HEIGHT)).convert()
+    build(layer)
+    layers[name] = (key, layer)
+    return layer, True
+
+def build_menu_layer(layer):
+    layer.blit(background(MENU_BG), (0, 0))
+
+    logo_scaled = sprites.scaled(LOGO_IMG, (750, 50))
+    if logo_scaled:
+        logo_rect = logo_scaled.get_rect(center=(WIDTH // 2, 120))
+        layer.blit(logo_scaled, logo_rect)
+    else:
+        title = text(main_font, "INTERSTELLER HIGHWAY", BLACK)
+        layer.blit(title, (160, 120))
+
+def build_screen1_layer(layer):
+    layer.blit(background(SCREEN1_BG), (0, 0))
+    layer.blit(text(main_font, "TAKE OFF THE TRADES", WHITE), (240, 15))
+
+    layer.blit(text(ui_font, "Departure Location:", WHITE), (70, dep_rect.y + 8))
+    layer.blit(text(ui_font, "Destination:", WHITE), (70, dest_rect.y + 8))
+    layer.blit(text(ui_font, "Ship selection:", WHITE), (70, ship_rect.y + 8))
+
+    #input labels
+    for i, r in enumerate(input_rects):
+        layer.blit(text(ui_font, input_labels[i], WHITE), (70, r.y + 8))
+
+def build_screen2_layer(layer):
+    layer.blit(background(SCREEN2_BG), (0, 0))
+
+    #dark glass panel to make text readable
+    panel = Rect(60, 90, 680, 420)
+    layer.blit(sprites.panel(panel.size, (0, 0, 0, 150)), (panel.x, panel.y))
+    draw.rect(layer, (255, 255, 255), panel, 2, border_radius=14)
+
+    # header
+    header = text(main_font, "INSTRUCTIONS", WHITE)
+    layer.blit(header, header.get_rect(center=(WIDTH // 2, 125)))
+
+    y = 165
+    lines = [
+        "The Goal of this platform is to build a smart scallable route ",
+        "planning logistics platform that will serve as the foundatoin of ",
+        "a safer, and more reliable space trade infrastructure.",
+        "",
+        "1) Pick departure + destination",
+        "2) Pick a ship, payload and launch window (DDMMYY-DDMMYY)",
+        "3) Click LAUNCH to plan the route and run the trade sim",
+        "",
+        "Use BACK to return",
+        "",
+        "Press F11 to toggle fullscreen"
+    ]
+    for line in lines:
+        if line == "":
+            y += 14
+        else:
+            layer.blit(text(ui_font, line, WHITE), (110, y))
+            y += 34
+
+def build_screen3_layer(layer):
+    layer.fill((10, 10, 20))
+
+    #sun and orbits on the screen (shared with headless export, see mission_render)
+    draw_solar_system(layer, sun_pos)
+
+    #transfer arc of the planned flight
+    if anim_xy is not None:
+        draw_transfer_arc(layer, anim_xy["ship"])
+
+    #UI overlay
+    layer.blit(text(main_font, "TRADE SIMULATION", WHITE), (240, 15))
+    layer.blit(text(ui_font, f"From: {travel_from}   To: {travel_to}", WHITE), (20, 70))
+    layer.blit(text(ui_font, f"Ship: {travel_ship_name}", WHITE), (20, 100))
+    layer.blit(text(ui_font, f"Launch Window: {travel_window if travel_window else '(today)'}", WHITE), (20, 130))
+    layer.blit(text(ui_font, f"Payload: {travel_payload:.1f} kg", WHITE), (20, 160))
+    if plan_result is not None and not plan_result["flight_impossible"]:
+        layer.blit(text(ui_font, format_plan_flight("Efficient", plan_result["efficient_flight"]), WHITE), (20, 230))
+        layer.blit(text(ui_font, format_plan_flight("Fastest", plan_result["fastest_flight"]), WHITE), (20, 260))
+    layer.blit(text(ui_font, "Use BACK to return", WHITE), (20, 560))
 
 # main loop
 running = True
@@ -233,13 +390,12 @@ while running:
                 else:
                     screen = display.set_mode((800, 600))
                 WIDTH, HEIGHT = screen.get_size()
-                # Rescale backgrounds
-                menu_bg = transform.scale(image.load("images/ss.jpg").convert(), (WIDTH, HEIGHT))
-                screen1_bg = transform.scale(image.load("images/bg.jpg").convert(), (WIDTH, HEIGHT))
-                screen2_bg = transform.scale(image.load("images/bbg.jpg").convert(), (WIDTH, HEIGHT))
+                # Backgrounds are rescaled to the new size on their next draw
+                sprites.invalidate()
                 # Update button positions
                 btn_exit = Rect(WIDTH - 140, 20, 120, 45)
-                sun_pos = (WIDTH // 2, HEIGHT // 2 + 40)
+                sun_pos = scene_center(WIDTH, HEIGHT)
+                project_plan()
 
         if evt.type == MOUSEBUTTONDOWN:
             if btn_exit.collidepoint(evt.pos):#exit button use
@@ -248,6 +404,8 @@ while running:
 
             if btn_back.collidepoint(evt.pos):#back button use
                 if current_screen in ["screen1", "screen2", "screen3"]:
+                    cancel_planning()
+                    travel_active = False
                     current_screen = "menu"
                     dep_open = dest_open = ship_open = False
                     active_input = -1
@@ -269,8 +427,11 @@ while running:
                     travel_payload = safe_float(input_texts[1], 0.0)
                     travel_ship_name = ship_selected
 
-                    travel_active = True
+                    #the ship starts moving once the planner has found a flight
+                    start_planning(travel_from, travel_to, travel_ship_name, travel_payload, travel_window)
+                    travel_active = False
                     travel_t = 0.0
+                    exhaust_trail = []
                     buffer.clear() 
                     current_screen = "screen3"
                     dep_open = dest_open = ship_open = False
@@ -280,18 +441,21 @@ while running:
                 #if drop down is open select first to make it wasier
                 picked = pick_dropdown_option(evt.pos, dep_rect, dep_open, planet_options)
                 if picked:
+                    cancel_planning()
                     dep_selected = picked
                     dep_open = False
                     clicked_any_dropdown = True
 
                 picked = pick_dropdown_option(evt.pos, dest_rect, dest_open, planet_options)
                 if picked:
+                    cancel_planning()
                     dest_selected = picked
                     dest_open = False
                     clicked_any_dropdown = True
 
                 picked = pick_dropdown_option(evt.pos, ship_rect, ship_open, ship_options)
                 if picked:
+                    cancel_planning()
                     ship_selected = picked
                     ship_open = False
                     clicked_any_dropdown = True
@@ -335,58 +499,64 @@ while running:
 
         if evt.type == KEYDOWN and current_screen == "screen1":
             if active_input != -1:
+                cancel_planning()
                 if evt.key == K_BACKSPACE:
                     input_texts[active_input] = input_texts[active_input][:-1]
                 else:
                     if len(input_texts[active_input]) < 18:
                         input_texts[active_input] += evt.unicode
 
+    #static layer of the current screen, rebuilt only when what it shows changes
     if current_screen == "menu":
-        screen.blit(menu_bg, (0, 0))
-
-        if logo_img:
-            logo_scaled = transform.smoothscale(logo_img, (750, 50))
-            logo_rect = logo_scaled.get_rect(center=(WIDTH // 2, 120))
-            screen.blit(logo_scaled, logo_rect)
-        else:
-            title = main_font.render("INTERSTELLER HIGHWAY", True, BLACK)
-            screen.blit(title, (160, 120))
+        layer, rebuilt = static_layer("menu", (WIDTH, HEIGHT), build_menu_layer)
+    elif current_screen == "screen1":
+        layer, rebuilt = static_layer("screen1", (WIDTH, HEIGHT), build_screen1_layer)
+    elif current_screen == "screen2":
+        layer, rebuilt = static_layer("screen2", (WIDTH, HEIGHT), build_screen2_layer)
+    else:
+        if poll_planning() and plan_result is not None and not plan_result["flight_impossible"]:
+            project_plan()
+            travel_active = anim_xy is not None
+        layer, rebuilt = static_layer("screen3", (WIDTH, HEIGHT, travel_from, travel_to, travel_ship_name,
+                                                  travel_window, travel_payload, plan_version), build_screen3_layer)
+
+    #erase last frame's moving parts by restoring the layer under them (all of it after a change)
+    full_redraw = rebuilt or current_screen != drawn_screen
+    if full_redraw:
+        screen.blit(layer, (0, 0))
+    else:
+        for r in dirty_rects:
+            screen.blit(layer, r, r)
+    erased_rects = dirty_rects
+    dirty_rects = []
 
+    if current_screen == "menu":
         draw_button(btn_mission, "MISSION", GRAY, (230, 230, 230))
         draw_button(btn_instructions, "INSTRUCTIONS", GRAY, (230, 230, 230))
         draw_button(btn_exit, "EXIT", RED, (255, 120, 120), text_col=WHITE)
 
     elif current_screen == "screen1":
-        screen.blit(screen1_bg, (0, 0))
-        screen.blit(main_font.render("TAKE OFF THE TRADES", True, WHITE), (240, 15))
-
         # NEW: back + exit buttons
         draw_button(btn_back, "BACK", GRAY, (230, 230, 230))
         draw_button(btn_exit, "EXIT", RED, (255, 120, 120), text_col=WHITE)
 
-        screen.blit(ui_font.render("Departure Location:", True, WHITE), (70, dep_rect.y + 8))
-        screen.blit(ui_font.render("Destination:", True, WHITE), (70, dest_rect.y + 8))
-        screen.blit(ui_font.render("Ship selection:", True, WHITE), (70, ship_rect.y + 8))
-
         #launch button
         draw_button(btn_launch, "LAUNCH", BLUE, (90, 140, 255), text_col=WHITE)
 
-        #input labels + boxes
+        #input boxes
         for i, r in enumerate(input_rects):
-            lbl = ui_font.render(input_labels[i], True, WHITE)
-            screen.blit(lbl, (70, r.y + 8))
             draw_input_box(r, input_texts[i], is_active=(active_input == i))
 
         #bottom planet images
-        if planet_imgs.get(dep_selected):
-            img = transform.smoothscale(planet_imgs[dep_selected], (90, 90))
-            screen.blit(img, (20, HEIGHT - 110))
-            screen.blit(ui_font.render(dep_selected, True, WHITE), (120, HEIGHT - 80))
+        img = planet_img(dep_selected, 90)
+        if img:
+            mark(screen.blit(img, (20, HEIGHT - 110)))
+            mark(screen.blit(text(ui_font, dep_selected, WHITE), (120, HEIGHT - 80)))
 
-        if planet_imgs.get(dest_selected):
-            img = transform.smoothscale(planet_imgs[dest_selected], (90, 90))
-            screen.blit(img, (WIDTH - 110, HEIGHT - 110))
-            screen.blit(ui_font.render(dest_selected, True, WHITE), (WIDTH - 250, HEIGHT - 80))
+        img = planet_img(dest_selected, 90)
+        if img:
+            mark(screen.blit(img, (WIDTH - 110, HEIGHT - 110)))
+            mark(screen.blit(text(ui_font, dest_selected, WHITE), (WIDTH - 250, HEIGHT - 80)))
 
         #dropdowns LAST (so they draw above everything)
         #draw all dropdown BASES first (no lists)
@@ -402,156 +572,70 @@ while running:
         elif ship_open:
             draw_dropdown_box(ship_rect, ship_selected, ship_open, ship_options, draw_list=True)
 
-
-
-
     elif current_screen == "screen2":
-        screen.blit(screen2_bg, (0, 0))
-
         draw_button(btn_back, "BACK", GRAY, (230, 230, 230))#back button
         draw_button(btn_exit, "EXIT", RED, (255, 120, 120), text_col=WHITE)#exit button
 
-        #dark glass panel to make text readable
-        panel = Rect(60, 90, 680, 420)
-        panel_surf = Surface((panel.w, panel.h), SRCALPHA)
-        panel_surf.fill((0, 0, 0, 150))
-        screen.blit(panel_surf, (panel.x, panel.y))
-        draw.rect(screen, (255, 255, 255), panel, 2, border_radius=14)
-
-        # header
-        header = main_font.render("INSTRUCTIONS", True, WHITE)
-        screen.blit(header, header.get_rect(center=(WIDTH // 2, 125)))
-
-        y = 165
-        lines = [
-            "The Goal of this platform is to build a smart scallable route ",
-            "planning logistics platform that will serve as the foundatoin of ",
-            "a safer, and more reliable space trade infrastructure.",
-            "",
-            "1) Pick departure + destination",
-            "2) Pick a ship and enter payload mass",
-            "3) Click LAUNCH to run the trade sim",
-            "",
-            "Use BACK to return",
-            "",
-            "Press F11 to toggle fullscreen"
-        ]
-        for line in lines:
-            if line == "":
-                y += 14
-            else:
-                screen.blit(ui_font.render(line, True, WHITE), (110, y))
-                y += 34
-
     elif current_screen == "screen3":
-        screen.fill((10, 10, 20))
-
         draw_button(btn_back, "BACK", GRAY, (230, 230, 230))
         draw_button(btn_exit, "EXIT", RED, (255, 120, 120), text_col=WHITE)
 
-        #sun
-        draw.circle(screen, YELLOW, sun_pos, 22)
-
-        #orbits on the screen
-        for p in planet_options:
-            r, _ = orbit_data.get(p, (120, 1.0))
-            draw_orbit(r)
-
-        #planets on the orbits
+        #a planned flight is replayed from its sampled ephemerides: each frame is an index lookup
+        anim = plan_result["animation"] if anim_xy is not None else None
+        if anim is not None:
+            if travel_active:
+                travel_t += dt / animation_seconds(anim)
+                if travel_t >= 1.0:
+                    travel_t = 1.0
+                    travel_active = False
+                    exhaust_trail = []  # Clear trail when arrived
+            k = sample_index(anim, travel_t)
+
+        #planets on the orbits (toy circular motion until a flight is planned)
         pos_map = {}
         for p in planet_options:
-            px, py = planet_xy(p, sim_time)
-            pos_map[p] = (px, py)
-
-            if planet_imgs.get(p):
-                size = planet_sizes.get(p, 20)
-                planet_img = transform.smoothscale(planet_imgs[p], (size, size))
-                img_rect = planet_img.get_rect(center=(px, py))
-                screen.blit(planet_img, img_rect)
-                if p == travel_from:
-                    draw.circle(screen, BLUE, (px,py), 13, 3)
-                elif p == travel_to:
-                    draw.circle(screen, RED, (px,py), 13, 3)
-            else:
-                if p == travel_from:
-                    draw.circle(screen, BLUE, (px, py), 10)
-                elif p == travel_to:
-                    draw.circle(screen, RED, (px, py), 10)
-                else:
-                    draw.circle(screen, (180, 180, 180), (px, py), 7)
-
-        #ship travel
-        if travel_active and travel_from in pos_map and travel_to in pos_map:
-            a = pos_map[travel_from]
-            b = pos_map[travel_to]
-
-            speed = 0.1
-            speed *= 1.0 / (1.0 + max(0.0, travel_payload) / 2000.0)
-
-            travel_t += dt * speed
-            if travel_t >= 1.0:
-                travel_t = 1.0
-                travel_active = False
-                exhaust_trail = []  # Clear trail when arrived
-
-            sx = int(a[0] + (b[0] - a[0]) * travel_t)
-            sy = int(a[1] + (b[1] - a[1]) * travel_t)
-
-            # Add current position to exhaust trail
-            exhaust_trail.append((sx, sy))
-            
-            # Keep only last 30 positions for trail
-            if len(exhaust_trail) > 30:
-                exhaust_trail.pop(0)
-            
-            # Draw fading exhaust trail
-            for i, (tx, ty) in enumerate(exhaust_trail):
-                # Calculate fade: older positions are more transparent
-                alpha = int(255 * (i / len(exhaust_trail)))  # 0 to 255
-                size = int(3 + 4 * (i / len(exhaust_trail)))  # Growing size
-                
-                # Create semi-transparent surface for exhaust
-                exhaust_surf = Surface((size * 2, size * 2), SRCALPHA)
-                draw.circle(exhaust_surf, (255, 150, 50, alpha), (size, size), size)  # Orange glow
-                screen.blit(exhaust_surf, (tx - size, ty - size))
-
-            if len(exhaust_trail) >= 2:
-                # Use last two positions to determine direction
-                prev_x, prev_y = exhaust_trail[-2]
-                curr_x, curr_y = exhaust_trail[-1]
-                dx = curr_x - prev_x
-                dy = curr_y - prev_y
-                heading_deg = degrees(atan2(-dy, dx)) - 90
-            else:
-                # Fallback: use destination
-                dx = b[0] - a[0]
-                dy = b[1] - a[1]
-                heading_deg = degrees(atan2(-dy, dx)) - 90
-
-            # Draw rocket image (or fallback circle)
-            if rocket_img:
-                rotated_rocket = transform.rotate(rocket_img, heading_deg)
-                rocket_rect = rotated_rocket.get_rect(center=(sx, sy))
-                screen.blit(rotated_rocket, rocket_rect)
-            else:
-                draw.circle(screen, (120, 255, 200), (sx, sy), 8)
-
-        #UI overlay
-        screen.blit(main_font.render("TRADE SIMULATION", True, WHITE), (240, 15))
-        screen.blit(ui_font.render(f"From: {travel_from}   To: {travel_to}", True, WHITE), (20, 70))
-        screen.blit(ui_font.render(f"Ship: {travel_ship_name}", True, WHITE), (20, 100))
-        screen.blit(ui_font.render(f"Launch Window: {travel_window if travel_window else '(none)'}", True, WHITE), (20, 130))
-        screen.blit(ui_font.render(f"Payload: {travel_payload:.1f} kg", True, WHITE), (20, 160))
-
-        status = "ARRIVED at the DESTINATION" if not travel_active else "En route..."
-        screen.blit(ui_font.render(f"Status: {status}", True, WHITE), (20, 200))
-        screen.blit(ui_font.render("Use BACK to return", True, WHITE), (20, 560))
+            pos_map[p] = tuple(anim_xy[p][k]) if anim is not None else planet_xy(p, sim_time)
+        for r in draw_bodies(screen, sprites, pos_map, travel_from, travel_to):
+            mark(r)
+
+        #ship travel with its fading exhaust trail
+        if travel_active and anim is not None:
+            for r in draw_ship(screen, sprites, anim_xy["ship"], k, exhaust_trail):
+                mark(r)
+
+        #status line (the rest of the overlay is in the static layer)
+        if plan_job is not None:
+            status = f"Planning route... {plan_job['progress']:.0%}"
+            if plan_job["best_fuel"] is not None:
+                status += f"  (best so far {plan_job['best_fuel']:,.0f} kg fuel)"
+            draw_spinner((WIDTH - 40, 212), sim_time)
+        elif plan_error:
+            status = f"Planning failed: {plan_error}"
+        elif plan_result is None:
+            status = "No route planned"
+        elif plan_result["flight_impossible"]:
+            status = "Flight impossible"
+        else:
+            status = "ARRIVED at the DESTINATION" if not travel_active else "En route..."
+            if anim is None and "animation" in plan_result:
+                miss = plan_result["animation"]["arrival_miss_km"]
+                status = f"Animation unavailable (trajectory misses destination by {miss:,.0f} km)"
+            elif anim is not None:
+                status += f"  {sample_date(anim, k)} (day {anim['epochs'][k] - anim['epochs'][0]:.0f} of {anim['tof_days']})"
+        mark(screen.blit(text(ui_font, f"Status: {status}", WHITE), (20, 200)))
 
     #mouse coordinates
-    screen.blit(coord_font.render(f"({mx}, {my})", True, WHITE if current_screen == "screen3" else BLACK), (10, 10))
+    mark(screen.blit(text(coord_font, f"({mx}, {my})", WHITE if current_screen == "screen3" else BLACK), (10, 10)))
 
-    display.flip()
+    #present only what changed since the last frame
+    if full_redraw:
+        display.flip()
+    else:
+        display.update(erased_rects + dirty_rects)
+    drawn_screen = current_screen
 
+cancel_planning()
+planner.shutdown(wait=False)
 quit()
 
 '''Sources used: 
@@ -1,12 +1,37 @@
 # citation
 # https://github.com/poliastro/poliastro/blob/main/src/poliastro/bodies.py
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
-import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from instrumentation import stats
+
+J2000 = datetime(2000, 1, 1, 12, 0)
+J2000_JD = 2451545.0
+
+def date_to_jd(date_str):
+    """Convert a DDMMYY date string (00:00) to a Julian day"""
+    stats.count("dates_parsed")
+    with stats.timer("date_parsing"):
+        target_date = datetime.strptime(date_str, "%d%m%y")
+    return J2000_JD + (target_date - J2000).total_seconds() / (24 * 3600)
+
+def jd_to_date(jd):
+    """Convert a Julian day back to a DDMMYY date string"""
+    return (J2000 + timedelta(days=float(jd) - J2000_JD)).strftime("%d%m%y")
+
+def _epochs_to_days(epochs):
+    """Days since J2000 for an array of Julian days or datetime64 values"""
+    epochs = np.atleast_1d(np.asarray(epochs))
+    if np.issubdtype(epochs.dtype, np.datetime64):
+        return (epochs - np.datetime64("2000-01-01T12:00")) / np.timedelta64(1, "D")
+    return epochs.astype(float) - J2000_JD
 
 class SolarSystemEngine:
-    def __init__(self):
+    def __init__(self, table_path=None):
         # J2000: a(AU), e, i(deg), L(deg), Argument of Periapsis(deg), Longitude of Ascending Node(deg)
         self.elements = {
             "Mercury": [0.38709893, 0.20563069, 7.00487, 252.25084, 77.45645, 48.33167],
@@ -22,98 +47,239 @@ class SolarSystemEngine:
         }
         self.AU = 149597870.7  # km
         self.MU_SUN = 1.32712440018e11  # km^3/s^2
+        self._prepare_elements()
+
+        # Optional precomputed daily table (see ephemeris_table.py); Kepler is the fallback
+        self.table = None
+        if table_path is not None:
+            from ephemeris_table import EphemerisTable
+            self.table = EphemerisTable(table_path, self.elements)
+
+    def _prepare_elements(self):
+        """Precompute per-body orbit constants and rotation matrices for get_states"""
+        self._body_index = {name: k for k, name in enumerate(self.elements)}
+        el = np.array(list(self.elements.values()), dtype=float)
+        a_au, e = el[:, 0], el[:, 1]
+        i, L, lp, ln = np.radians(el[:, 2:]).T
+        w = lp - ln
+
+        self._a = a_au * self.AU
+        self._e = e
+        self._M0 = L - lp
+        self._n = np.sqrt(self.MU_SUN / self._a**3) * 86400  # rad/day
+
+        # Orbital plane -> heliocentric ecliptic; only the x/y columns are needed
+        cos_w, sin_w = np.cos(w), np.sin(w)
+        cos_ln, sin_ln = np.cos(ln), np.sin(ln)
+        cos_i, sin_i = np.cos(i), np.sin(i)
+        self._rotation = np.empty((len(el), 3, 2))
+        self._rotation[:, 0, 0] = cos_ln * cos_w - sin_ln * sin_w * cos_i
+        self._rotation[:, 0, 1] = -cos_ln * sin_w - sin_ln * cos_w * cos_i
+        self._rotation[:, 1, 0] = sin_ln * cos_w + cos_ln * sin_w * cos_i
+        self._rotation[:, 1, 1] = -sin_ln * sin_w + cos_ln * cos_w * cos_i
+        self._rotation[:, 2, 0] = sin_w * sin_i
+        self._rotation[:, 2, 1] = cos_w * sin_i
 
     def _kepler_equation(self, M, e, tol=1e-8, max_iter=20):
-        """Solve Kepler's equation iteratively"""
+        """Solve Kepler's equation iteratively (scalars or arrays)"""
         E = M
-        for _ in range(max_iter):
+        for iteration in range(max_iter):
             dE = (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
             E = E - dE
-            if abs(dE) < tol:
+            if np.all(np.abs(dE) < tol):
                 break
+        if stats.enabled:
+            # Per element, like lambert_iterations (every element takes the batch's steps)
+            stats.count("kepler_solves", np.size(E))
+            stats.count("kepler_iterations", np.size(E) * (iteration + 1))
         return E
 
+    def get_states(self, bodies, epochs):
+        """
+        Vectorized ephemeris for many bodies and epochs.
+        epochs are Julian days or datetime64 values. Returns position (km) and
+        velocity (km/s) arrays, each of shape (n_bodies, n_epochs, 3).
+        """
+        if isinstance(bodies, str):
+            bodies = [bodies]
+        for body_name in bodies:
+            if body_name not in self._body_index:
+                raise ValueError(f"Unknown body: {body_name}")
+        idx = np.array([self._body_index[b] for b in bodies], dtype=int)
+        return self._states_from_days(idx, _epochs_to_days(epochs))
+
+    def _states_from_days(self, idx, days):
+        stats.count("ephemeris_states", len(idx) * len(days))
+        if self.table is not None and self.table.covers(days + J2000_JD):
+            stats.count("ephemeris_table_states", len(idx) * len(days))
+            return self.table.get_states(idx, days + J2000_JD)
+
+        a = self._a[idx, None]
+        e = self._e[idx, None]
+
+        # Mean anomaly -> eccentric anomaly for every (body, epoch) at once
+        M = (self._M0[idx, None] + self._n[idx, None] * days[None, :]) % (2 * np.pi)
+        E = self._kepler_equation(M, e)
+        cos_E, sin_E = np.cos(E), np.sin(E)
+        root = np.sqrt(1 - e**2)
+
+        # Position / velocity in orbital plane
+        x_orb = a * (cos_E - e)
+        y_orb = a * root * sin_E
+        k = np.sqrt(self.MU_SUN * a) / (a * (1 - e * cos_E))
+        vx_orb = -k * sin_E
+        vy_orb = k * root * cos_E
+
+        rot = self._rotation[idx][:, None, :, :]
+        position = rot[..., 0] * x_orb[..., None] + rot[..., 1] * y_orb[..., None]
+        velocity = rot[..., 0] * vx_orb[..., None] + rot[..., 1] * vy_orb[..., None]
+        return position, velocity
+
     def get_position(self, body_name, date_str):
         """Returns position (km) and velocity (km/s) vectors - kept YOUR function name"""
         if body_name not in self.elements:
             raise ValueError(f"Unknown body: {body_name}")
-        
-        # Parse date
-        d0 = datetime(2000, 1, 1, 12, 0)
-        target_date = datetime.strptime(date_str, "%d%m%y")
-        diff_days = (target_date - d0).total_seconds() / (24 * 3600)
-        
-        # Get orbital elements
-        a_au, e, i_deg, L_deg, lp_deg, ln_deg = self.elements[body_name]
-        a = a_au * self.AU  # Convert to km
-        i, L, lp, ln = map(np.radians, [i_deg, L_deg, lp_deg, ln_deg])
-        
-        # Argument of perihelion and Mean Anomaly
-        w = lp - ln
-        M0 = L - lp
-        
-        # Mean motion (rad/day)
-        n = np.sqrt(self.MU_SUN / a**3) * 86400  # Convert to rad/day
-        
-        # Current mean anomaly
-        M = (M0 + n * diff_days) % (2 * np.pi)
-        
-        # Solve for Eccentric Anomaly
-        E = self._kepler_equation(M, e)
-        
-        # Position in orbital plane
-        x_orb = a * (np.cos(E) - e)
-        y_orb = a * np.sqrt(1 - e**2) * np.sin(E)
-        
-        # Velocity in orbital plane
-        r_mag = np.sqrt(x_orb**2 + y_orb**2)
-        vx_orb = -np.sqrt(self.MU_SUN * a) / r_mag * np.sin(E)
-        vy_orb = np.sqrt(self.MU_SUN * a) / r_mag * np.sqrt(1 - e**2) * np.cos(E)
-        
-        # Rotation matrices to heliocentric ecliptic coordinates
-        cos_w, sin_w = np.cos(w), np.sin(w)
-        cos_ln, sin_ln = np.cos(ln), np.sin(ln)
-        cos_i, sin_i = np.cos(i), np.sin(i)
-        
-        # Position transformation
-        x = (cos_ln * cos_w - sin_ln * sin_w * cos_i) * x_orb + \
-            (-cos_ln * sin_w - sin_ln * cos_w * cos_i) * y_orb
-        y = (sin_ln * cos_w + cos_ln * sin_w * cos_i) * x_orb + \
-            (-sin_ln * sin_w + cos_ln * cos_w * cos_i) * y_orb
-        z = (sin_w * sin_i) * x_orb + (cos_w * sin_i) * y_orb
-        
-        # Velocity transformation
-        vx = (cos_ln * cos_w - sin_ln * sin_w * cos_i) * vx_orb + \
-             (-cos_ln * sin_w - sin_ln * cos_w * cos_i) * vy_orb
-        vy = (sin_ln * cos_w + cos_ln * sin_w * cos_i) * vx_orb + \
-             (-sin_ln * sin_w + cos_ln * cos_w * cos_i) * vy_orb
-        vz = (sin_w * sin_i) * vx_orb + (cos_w * sin_i) * vy_orb
-        
-        position = np.array([x, y, z])
-        velocity = np.array([vx, vy, vz])
-        
-        return position, velocity
+
+        diff_days = date_to_jd(date_str) - J2000_JD
+        idx = np.array([self._body_index[body_name]])
+        position, velocity = self._states_from_days(idx, np.array([diff_days]))
+        return position[0, 0], velocity[0, 0]
+
+PAGE_SLOTS = 512  # half-day slots per cache page (256 days)
+
+class EphemerisCache:
+    """
+    Bounded, thread-safe LRU cache of state vectors for whole/half-day epochs.
+    Each body keeps dense pages of states indexed by half-day, with a validity
+    mask, so lookups are array gathers rather than per-epoch dict hits.
+    Has the same get_states/get_position interface as SolarSystemEngine, so it
+    can be passed anywhere an engine is expected.
+    """
+    def __init__(self, engine=None, capacity=50000):
+        self.engine = engine if engine is not None else SolarSystemEngine()
+        self.capacity = capacity  # states per cache, rounded up to whole pages
+        self.hits = 0
+        self.misses = 0
+        self._pages = OrderedDict()  # (body, page) -> (states (PAGE_SLOTS, 6), valid mask)
+        self._lock = threading.Lock()
+
+    def get_states(self, bodies, epochs):
+        """Cached SolarSystemEngine.get_states; each distinct missing epoch is solved once"""
+        if isinstance(bodies, str):
+            bodies = [bodies]
+        days = _epochs_to_days(epochs)
+        out = np.empty((len(bodies), len(days), 6))
+        half_days = days * 2
+        # Only whole/half-day epochs are cached; fractional ones go straight to the engine
+        cacheable = half_days == np.round(half_days)
+
+        if not cacheable.all():
+            rest = ~cacheable
+            pos, vel = self.engine.get_states(bodies, days[rest] + J2000_JD)
+            out[:, rest, :3] = pos
+            out[:, rest, 3:] = vel
+        if cacheable.any():
+            # Porkchop arrival epochs repeat heavily; look up each distinct slot once
+            slots, inverse = np.unique(half_days[cacheable].astype(np.int64), return_inverse=True)
+            for b, body_name in enumerate(bodies):
+                out[b, cacheable] = self._slot_states(body_name, slots)[inverse.ravel()]
+
+        return out[..., :3], out[..., 3:]
+
+    def _slot_states(self, body_name, slots):
+        """States (len(slots), 6) for sorted, distinct half-day slots"""
+        states = np.empty((len(slots), 6))
+        found = np.zeros(len(slots), dtype=bool)
+        # slots are sorted, so each page is one contiguous run
+        pages, starts = np.unique(slots // PAGE_SLOTS, return_index=True)
+        runs = [(int(p), lo, hi) for p, lo, hi in zip(pages, starts, list(starts[1:]) + [len(slots)])]
+
+        with self._lock:
+            for page, lo, hi in runs:
+                entry = self._pages.get((body_name, page))
+                if entry is None:
+                    continue
+                self._pages.move_to_end((body_name, page))
+                offset = slots[lo:hi] - page * PAGE_SLOTS
+                states[lo:hi] = entry[0][offset]
+                found[lo:hi] = entry[1][offset]
+            n_found = int(found.sum())
+            self.hits += n_found
+            self.misses += len(slots) - n_found
+        stats.count("ephemeris_cache_hits", n_found)
+        stats.count("ephemeris_cache_misses", len(slots) - n_found)
+        if n_found == len(slots):
+            return states
+
+        missing = np.flatnonzero(~found)
+        pos, vel = self.engine.get_states(body_name, slots[missing] / 2 + J2000_JD)
+        states[missing, :3] = pos[0]
+        states[missing, 3:] = vel[0]
+        with self._lock:
+            for page, lo, hi in runs:
+                new = missing[(missing >= lo) & (missing < hi)]
+                if not new.size:
+                    continue
+                key = (body_name, page)
+                entry = self._pages.get(key)
+                if entry is None:
+                    entry = self._pages[key] = (np.empty((PAGE_SLOTS, 6)), np.zeros(PAGE_SLOTS, dtype=bool))
+                self._pages.move_to_end(key)
+                offset = slots[new] - page * PAGE_SLOTS
+                entry[0][offset] = states[new]
+                entry[1][offset] = True
+            max_pages = max(1, -(-self.capacity // PAGE_SLOTS))
+            while len(self._pages) > max_pages:
+                self._pages.popitem(last=False)
+        return states
+
+    def get_position(self, body_name, date_str):
+        """Cached SolarSystemEngine.get_position"""
+        position, velocity = self.get_states(body_name, [date_to_jd(date_str)])
+        return position[0, 0], velocity[0, 0]
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": int(sum(valid.sum() for _, valid in self._pages.values())),
+                "pages": len(self._pages),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self.hits = 0
+            self.misses = 0
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_ephemeris_cache(capacity=None, table_path=None):
+    """
+    Process-wide EphemerisCache shared by the planners and the GUI.
+    Passing table_path backs it with a memory-mapped ephemeris table.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = EphemerisCache(SolarSystemEngine(table_path))
+        elif table_path is not None and getattr(_shared_cache.engine.table, "path", None) != table_path:
+            _shared_cache.engine = SolarSystemEngine(table_path)
+            _shared_cache.clear()
+        if capacity is not None:
+            _shared_cache.capacity = capacity
+        return _shared_cache
 
 def main():
+    from reporting import print_state_vectors
     engine = SolarSystemEngine()
     test_date = "230126" 
-    
-    results = []
-    for body in engine.elements.keys():
-        pos, vel = engine.get_position(body, test_date)
-        results.append({
-            "Body": body,
-            "X (km)": f"{pos[0]:,.0f}",
-            "Y (km)": f"{pos[1]:,.0f}",
-            "Z (km)": f"{pos[2]:,.0f}",
-            "Vx (km/s)": f"{vel[0]:.3f}",
-            "Vy (km/s)": f"{vel[1]:.3f}",
-            "Vz (km/s)": f"{vel[2]:.3f}"
-        })
-    
-    df = pd.DataFrame(results)
-    print("=== PLANETARY STATE VECTORS (HELIOCENTRIC) ===")
-    print(df.to_string(index=False))
+    print_state_vectors(engine, test_date)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
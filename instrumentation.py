@@ -0,0 +1,125 @@
+"""
+Timers and counters for the planning hot paths.
+
+    from instrumentation import stats
+    stats.enable()
+    find_best_mission(...)
+    print(stats.to_json())
+
+get_values.py and formula_implementation.py report Kepler and Lambert
+iterations, ephemeris cache hits, cells evaluated/pruned and per-stage
+times here. While disabled (the default, unless NAV_STATS is set) every
+call is a single attribute check. Stage timers are inclusive:
+"mission_search" contains "ephemeris", "pruning", "lambert", "delta_v" and
+"fuel". profile() runs a block under cProfile and can dump a
+pstats file.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+class Stats:
+    """Named counters and stage timers, collected only while enabled"""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.counters = defaultdict(int)
+            self.timers = defaultdict(lambda: [0, 0.0])  # name -> [calls, seconds]
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += int(n)
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            timer = self.timers[name]
+            timer[0] += 1
+            timer[1] += seconds
+
+    def timer(self, name):
+        """Context manager timing one stage (a shared no-op while disabled)"""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": dict(sorted(self.counters.items())),
+                "timers": {
+                    name: {"calls": calls, "total_ms": round(seconds * 1e3, 3),
+                           "mean_ms": round(seconds * 1e3 / calls, 4)}
+                    for name, (calls, seconds) in sorted(self.timers.items())
+                }
+            }
+
+    def to_json(self, path=None, indent=2):
+        """Snapshot as JSON text, also written to path if given"""
+        text = json.dumps(self.snapshot(), indent=indent)
+        if path:
+            with open(path, "w") as fh:
+                fh.write(text + "\n")
+        return text
+
+# Process-wide instance used by the instrumented modules
+stats = Stats(enabled=bool(os.environ.get("NAV_STATS")))
+
+@contextmanager
+def profile(path=None, sort="cumulative", limit=None, stream=None):
+    """
+    Run the block under cProfile. The raw profile is dumped to path (load it
+    with pstats or snakeviz); with limit, the top entries are also printed
+    to stream.
+    """
+    import pstats
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        if limit:
+            pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
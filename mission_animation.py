@@ -0,0 +1,110 @@
+"""
+Sampled heliocentric trajectories for animating a planned flight.
+
+    anim = build_animation("Earth", "Mars", result["efficient_flight"], planet_options)
+    screen_xy = project_animation(anim, orbit_radii_px, sun_pos)
+    ship_xy = screen_xy["ship"][k]           # frame k is an index lookup
+
+build_animation() samples every body's ephemeris (SolarSystemEngine.get_states)
+and the transfer arc (propagate_kepler from the Lambert departure velocity)
+once per flight, and marks it invalid ("valid": False) when the arc does not
+converge or misses the destination by more than ARRIVAL_TOLERANCE_KM; such
+an animation should not be shown. project_animation() maps all of it to screen coordinates in
+one vectorized step: true heliocentric angles, with distance interpolated
+onto the GUI's orbit radii and y squashed for the tilted view.
+"""
+
+import numpy as np
+
+from get_values import date_to_jd, jd_to_date, get_ephemeris_cache
+from formula_implementation import SemiMajorAxes, propagate_kepler
+
+# Samples along the flight; the GUI steps through them by elapsed fraction
+ANIMATION_SAMPLES = 600
+
+# Playback speed: flight days shown per second, with a floor for short hops
+ANIMATION_DAYS_PER_SECOND = 30
+ANIMATION_MIN_SECONDS = 4
+
+# Largest distance (km) between the propagated arc's end and the destination for a valid animation
+ARRIVAL_TOLERANCE_KM = 1e3
+
+def build_animation(start_planet, end_planet, flight, bodies, samples=ANIMATION_SAMPLES, engine=None,
+                    tolerance_km=ARRIVAL_TOLERANCE_KM):
+    """
+    Positions (km) of the bodies and the ship at samples epochs spanning the
+    flight (a find_best_mission flight entry). "arrival_miss_km" is the
+    distance between the propagated arc's end and the destination (inf if
+    the propagation failed); "valid" is False when it exceeds tolerance_km.
+    """
+    if engine is None:
+        engine = get_ephemeris_cache()
+    bodies = list(bodies)
+    for name in (start_planet, end_planet):
+        if name not in bodies:
+            bodies.append(name)
+
+    launch_jd = date_to_jd(flight["launch_date"])
+    elapsed_days = np.linspace(0.0, float(flight["tof_days"]), samples)
+    epochs = launch_jd + elapsed_days
+    positions, velocities = engine.get_states(bodies, epochs)
+
+    # Ship leaves the start planet with its velocity plus the departure v-infinity
+    start = bodies.index(start_planet)
+    v_departure = velocities[start, 0] + np.asarray(flight["v_inf_departure"])
+    ship, _, converged = propagate_kepler(positions[start, 0], v_departure, elapsed_days * 86400)
+    miss = float(np.linalg.norm(ship[-1] - positions[bodies.index(end_planet), -1]))
+    if not (converged.all() and np.isfinite(miss)):
+        miss = float("inf")
+
+    return {
+        "bodies": bodies,
+        "epochs": epochs,
+        "planets": positions,  # (n_bodies, samples, 3)
+        "ship": ship,          # (samples, 3)
+        "start": start_planet,
+        "dest": end_planet,
+        "launch_date": flight["launch_date"],
+        "arrival_date": flight["arrival_date"],
+        "tof_days": flight["tof_days"],
+        "arrival_miss_km": miss,
+        "valid": miss <= tolerance_km
+    }
+
+def project_points(points, orbit_radii_px, center, squash=0.7):
+    """
+    Screen (x, y) for heliocentric points (..., 3) in km. Distance from the
+    Sun is interpolated between the bodies' semi-major axes and their screen
+    radii in orbit_radii_px ({body: pixels}), so a body on its mean orbit
+    lands on the drawn orbit track; the angle is the true ecliptic longitude.
+    """
+    axes = np.array([SemiMajorAxes[name] for name in orbit_radii_px])
+    order = np.argsort(axes)
+    km_axis = np.concatenate([[0.0], axes[order]])
+    px_axis = np.concatenate([[0.0], np.asarray(list(orbit_radii_px.values()), dtype=float)[order]])
+
+    points = np.asarray(points, dtype=float)
+    radius = np.interp(np.hypot(points[..., 0], points[..., 1]), km_axis, px_axis)
+    angle = np.arctan2(points[..., 1], points[..., 0])
+    # North-up view: screen y grows downwards, so prograde motion stays counter-clockwise
+    x = center[0] + np.cos(angle) * radius
+    y = center[1] - np.sin(angle) * radius * squash
+    return np.stack([x, y], axis=-1).round().astype(int)
+
+def project_animation(anim, orbit_radii_px, center, squash=0.7):
+    """Screen coordinates for a build_animation() result: {body: (samples, 2)}, plus "ship" """
+    planets = project_points(anim["planets"], orbit_radii_px, center, squash)
+    projected = {name: planets[b] for b, name in enumerate(anim["bodies"])}
+    projected["ship"] = project_points(anim["ship"], orbit_radii_px, center, squash)
+    return projected
+
+def animation_seconds(anim):
+    """Playback length of the flight in seconds"""
+    return max(ANIMATION_MIN_SECONDS, float(anim["tof_days"]) / ANIMATION_DAYS_PER_SECOND)
+
+def sample_index(anim, fraction):
+    """Sample index for the elapsed fraction (0..1) of the flight"""
+    return int(round(min(max(fraction, 0.0), 1.0) * (len(anim["epochs"]) - 1)))
+
+def sample_date(anim, index):
+    return jd_to_date(anim["epochs"][index])
@@ -0,0 +1,318 @@
+"""
+Mission animation renderer shared by the GUI and headless export.
+Usage: python mission_render.py <start> <dest> <ship> <payload> <date> [end date] [--format png|gif] [--out DIR]
+       python mission_render.py --batch routes.jsonl [--workers N] [--format png|gif] [--out DIR]
+
+The scene drawing here (Sun, orbit tracks, transfer arc, planets, ship and
+exhaust trail) is what game.py's simulation screen shows. Headless export
+plans the route (find_best_mission, through the route store), samples it
+with mission_animation and renders it at a fixed timestep under SDL's dummy
+video driver, so no window is opened. Each frame is written as a PNG, or all
+of them as one GIF (needs Pillow). A batch file holds one JSON route per line
+({"start", "dest", "ship", "payload", "date", "end_date"}); routes are
+spread over worker processes, each keeping its sprites, fonts and ephemeris
+cache warm between routes.
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+from pygame import Rect, Surface, display, draw, font, transform
+from math import atan2, degrees
+
+from sprite_cache import SpriteCache
+from mission_animation import (build_animation, project_animation, animation_seconds, sample_index,
+                               sample_date)
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+ROCKET_IMAGE = os.path.join(IMAGES_DIR, "rocket.png")
+DEFAULT_OUT = "renders"
+DEFAULT_SIZE = (800, 600)
+DEFAULT_FPS = 30
+
+WHITE = (255, 255, 255)
+BLUE = (50, 100, 255)
+RED = (240, 70, 70)
+YELLOW = (255, 220, 60)
+SPACE = (10, 10, 20)
+ORBIT_COLOR = (80, 80, 80)
+ARC_COLOR = (70, 110, 160)
+
+# Screen orbit radius (px) and toy angular speed of every body
+orbit_data = {
+    "Mercury": (45,  1.0),
+    "Venus":   (70,  1.10),
+    "Earth":   (100, 1.2),
+    "Mars":    (150, 0.90),
+    "Ceres":   (180, 0.65),
+    "Jupiter": (230, 0.45),
+    "Saturn":  (280, 0.40),
+    "Uranus":  (320, 0.42),
+    "Neptune": (350, 0.45),
+    "Pluto":   (400, 0.6),
+}
+orbit_radii = {p: r for p, (r, _) in orbit_data.items()}
+
+planet_sizes = {
+    "Mercury": 12,
+    "Venus": 18,
+    "Earth": 20,
+    "Mars": 15,
+    "Jupiter": 40,
+    "Saturn": 35,
+    "Uranus": 25,
+    "Neptune": 24,
+    "Pluto": 10,
+    "Ceres": 12
+}
+
+TRAIL_LENGTH = 30
+
+def planet_image_path(name):
+    return os.path.join(IMAGES_DIR, f"{name.lower()}.png")
+
+def scene_center(width, height):
+    """Screen position of the Sun"""
+    return (width // 2, height // 2 + 40)
+
+def draw_solar_system(surf, center):
+    """Sun and every orbit track (ellipses squashed to 0.7 for the tilted view)"""
+    draw.circle(surf, YELLOW, center, 22)
+    for r, _ in orbit_data.values():
+        rect_orb = Rect(0, 0, r * 2, int(r * 2 * 0.7))
+        rect_orb.center = center
+        draw.ellipse(surf, ORBIT_COLOR, rect_orb, 1)
+
+def draw_transfer_arc(surf, ship_xy):
+    """Path of the ship over the whole flight (projected samples)"""
+    draw.lines(surf, ARC_COLOR, False, ship_xy[::6].tolist() + [ship_xy[-1].tolist()], 1)
+
+def draw_bodies(surf, sprites, positions, start, dest):
+    """Planets at positions ({name: (x, y)}), start/dest ringed; returns the rects drawn"""
+    rects = []
+    for p, (px, py) in positions.items():
+        img = sprites.scaled(planet_image_path(p), (planet_sizes.get(p, 20),) * 2)
+        if img:
+            rects.append(surf.blit(img, img.get_rect(center=(px, py))))
+            if p == start:
+                rects.append(draw.circle(surf, BLUE, (px, py), 13, 3))
+            elif p == dest:
+                rects.append(draw.circle(surf, RED, (px, py), 13, 3))
+        elif p == start:
+            rects.append(draw.circle(surf, BLUE, (px, py), 10))
+        elif p == dest:
+            rects.append(draw.circle(surf, RED, (px, py), 10))
+        else:
+            rects.append(draw.circle(surf, (180, 180, 180), (px, py), 7))
+    return rects
+
+def draw_ship(surf, sprites, ship_xy, k, trail):
+    """
+    Ship at sample k of its projected path, with the fading exhaust trail
+    (trail is the caller's list of recent positions, updated here); returns
+    the rects drawn
+    """
+    sx, sy = ship_xy[k]
+    trail.append((sx, sy))
+    if len(trail) > TRAIL_LENGTH:
+        trail.pop(0)
+
+    # Older positions are smaller and more transparent
+    rects = []
+    for i, (tx, ty) in enumerate(trail):
+        alpha = int(255 * (i / len(trail)))
+        size = int(3 + 4 * (i / len(trail)))
+        rects.append(surf.blit(sprites.glow(size, alpha), (tx - size, ty - size)))
+
+    # Heading along the path around the current sample
+    ahead = ship_xy[min(k + 3, len(ship_xy) - 1)]
+    behind = ship_xy[max(k - 3, 0)]
+    heading_deg = degrees(atan2(-(ahead[1] - behind[1]), ahead[0] - behind[0])) - 90
+
+    rocket_img = sprites.scaled(ROCKET_IMAGE, (30, 30))
+    if rocket_img:
+        rotated = transform.rotate(rocket_img, heading_deg)
+        rects.append(surf.blit(rotated, rotated.get_rect(center=(sx, sy))))
+    else:
+        rects.append(draw.circle(surf, (120, 255, 200), (sx, sy), 8))
+    return rects
+
+# Per-process state reused between renders (sprites need a display to convert against)
+_sprites = None
+_fonts = None
+
+def init_headless(size=DEFAULT_SIZE):
+    """Open an off-screen display of the given size (SDL dummy driver unless one is set)"""
+    global _sprites, _fonts
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if not display.get_init():
+        display.init()
+    if display.get_surface() is None or display.get_surface().get_size() != tuple(size):
+        display.set_mode(tuple(size))
+    if not font.get_init():
+        font.init()
+    if _sprites is None:
+        _sprites = SpriteCache()
+        _fonts = (font.SysFont(None, 40), font.SysFont(None, 28))
+    return _sprites
+
+def mission_frames(anim, info_lines=(), size=DEFAULT_SIZE, fps=DEFAULT_FPS):
+    """
+    Frames (one reused Surface, yielded once per frame) of the flight played
+    at the GUI's pace, fps frames per second
+    """
+    sprites = init_headless(size)
+    title_font, ui_font = _fonts
+    center = scene_center(*size)
+    anim_xy = project_animation(anim, orbit_radii, center)
+
+    # Everything that does not move, drawn once
+    layer = Surface(size).convert()
+    layer.fill(SPACE)
+    draw_solar_system(layer, center)
+    draw_transfer_arc(layer, anim_xy["ship"])
+    layer.blit(sprites.text(title_font, "TRADE SIMULATION", WHITE), (240, 15))
+    for i, line in enumerate(info_lines):
+        layer.blit(sprites.text(ui_font, line, WHITE), (20, 70 + 30 * i))
+
+    frame = Surface(size).convert()
+    n_frames = max(2, round(animation_seconds(anim) * fps) + 1)
+    trail = []
+    for f in range(n_frames):
+        k = sample_index(anim, f / (n_frames - 1))
+        frame.blit(layer, (0, 0))
+        draw_bodies(frame, sprites, {p: anim_xy[p][k] for p in orbit_data}, anim["start"], anim["dest"])
+        draw_ship(frame, sprites, anim_xy["ship"], k, trail)
+        day = anim["epochs"][k] - anim["epochs"][0]
+        frame.blit(sprites.text(ui_font, f"{sample_date(anim, k)}  day {day:.0f} of {anim['tof_days']}", WHITE),
+                   (20, size[1] - 40))
+        yield frame
+
+def save_png_frames(frames, out_dir):
+    """Write frames as out_dir/frame_0000.png, ... (replacing any earlier render); returns how many"""
+    os.makedirs(out_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(out_dir, "frame_*.png")):
+        os.remove(old)
+    count = 0
+    for count, frame in enumerate(frames, 1):
+        pygame.image.save(frame, os.path.join(out_dir, f"frame_{count - 1:04d}.png"))
+    return count
+
+def save_gif(frames, path, fps=DEFAULT_FPS):
+    """Write frames as one looping GIF; returns how many (Pillow is only imported here)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("GIF export needs Pillow (pip install Pillow); use --format png instead")
+    images = [Image.frombytes("RGB", frame.get_size(), pygame.image.tostring(frame, "RGB"))
+              .quantize(colors=256) for frame in frames]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=round(1000 / fps), loop=0)
+    return len(images)
+
+def export_mission(start, dest, ship, payload, launch_date, end_date=None, out=DEFAULT_OUT, fmt="png",
+                   fps=DEFAULT_FPS, size=DEFAULT_SIZE, use_store=True, engine=None):
+    """
+    Plan one route (raw CLI-style arguments) and render its most efficient
+    flight to out/<route>/frame_*.png or out/<route>.gif. A flight whose
+    propagated arc misses the destination is not rendered: its record gets
+    an "error" instead of frames.
+    """
+    from formula_implementation import find_best_mission
+    from nav_cli import parse_ship_name
+
+    start, dest, ship_name = start.capitalize(), dest.capitalize(), parse_ship_name(ship)
+    store = None
+    if use_store:
+        from route_store import get_route_store
+        store = get_route_store()
+    result = find_best_mission(start, dest, ship_name, float(payload), launch_date, 50, 500, 15,
+                               end_date, engine=engine, store=store)
+    record = {"route": f"{start} -> {dest}", "ship": ship_name, "payload": float(payload),
+              "flight_impossible": result["flight_impossible"]}
+    if result["flight_impossible"]:
+        record["reason"] = result.get("reason", "Unknown")
+        return record
+
+    flight = result["efficient_flight"]
+    anim = build_animation(start, dest, flight, list(orbit_data), engine=engine)
+    record.update({"launch_date": flight["launch_date"], "arrival_date": flight["arrival_date"],
+                   "arrival_miss_km": anim["arrival_miss_km"]})
+    if not anim["valid"]:
+        record["error"] = f"Trajectory misses {dest} by {anim['arrival_miss_km']:,.0f} km; not rendered"
+        return record
+
+    info_lines = [
+        f"From: {start}   To: {dest}",
+        f"Ship: {ship_name}   Payload: {float(payload):.1f} kg",
+        f"Launch {flight['launch_date']}, arrive {flight['arrival_date']} ({flight['tof_days']} d)",
+        f"Fuel: {flight['fuel_required']:,.0f} kg",
+    ]
+    frames = mission_frames(anim, info_lines, size, fps)
+    name = f"{start}_{dest}_{ship_name.replace(' ', '_')}_{flight['launch_date']}"
+    if fmt == "gif":
+        path = os.path.join(out, name + ".gif")
+        record["frames"] = save_gif(frames, path, fps)
+    else:
+        path = os.path.join(out, name)
+        record["frames"] = save_png_frames(frames, path)
+    record["output"] = path
+    return record
+
+def _init_worker(size):
+    import formula_implementation  # pay the planner imports once per worker
+    init_headless(size)
+
+def _export_route(route, options):
+    """export_mission for one batch line; errors become part of the record"""
+    try:
+        return export_mission(route["start"], route["dest"], route["ship"], route["payload"], route["date"],
+                              route.get("end_date"), **options)
+    except Exception as e:
+        return {"route": f"{route.get('start')} -> {route.get('dest')}", "error": str(e)}
+
+def export_batch(routes, workers=None, size=DEFAULT_SIZE, **options):
+    """Render many routes in worker processes; yields their records in input order"""
+    options["size"] = size
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker,
+                             initargs=(size,)) as pool:
+        yield from pool.map(_export_route, routes, [options] * len(routes))
+
+def main():
+    parser = argparse.ArgumentParser(description="Render mission animations without opening a window")
+    parser.add_argument("route", nargs="*", help="<start> <dest> <ship> <payload> <date DDMMYY> [end date]")
+    parser.add_argument("--batch", help="JSON lines file of routes to render")
+    parser.add_argument("--workers", type=int, help="worker processes for --batch (default: CPU count)")
+    parser.add_argument("--format", choices=["png", "gif"], default="png")
+    parser.add_argument("--out", default=DEFAULT_OUT, help=f"output directory (default: {DEFAULT_OUT})")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--size", default="800x600", help="frame size WIDTHxHEIGHT")
+    parser.add_argument("--no-store", action="store_true", help="do not use the route store")
+    args = parser.parse_args()
+
+    try:
+        size = tuple(int(v) for v in args.size.lower().split("x"))
+        options = {"out": args.out, "fmt": args.format, "fps": args.fps, "use_store": not args.no_store}
+        if args.batch:
+            with open(args.batch) as fh:
+                routes = [json.loads(line) for line in fh if line.strip()]
+            for record in export_batch(routes, args.workers, size, **options):
+                print(json.dumps(record), flush=True)
+        else:
+            if len(args.route) not in (5, 6):
+                raise ValueError("Expected <start> <dest> <ship> <payload> <date> [end date]")
+            record = export_mission(*args.route, size=size, **options)
+            print(json.dumps(record, indent=2))
+            if "error" in record:
+                sys.exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,67 @@
 """
 Command-line interface for interplanetary mission planning.
-Usage: python nav_cli.py <start> <dest> <ship> <payload> <date1> <date2>
+Usage: python nav_cli.py [--adaptive] [--no-store] [--deadline=SEC] [--max-evals=N] [--profile-startup]
+                         [--stats[=FILE]] [--pstats=FILE] <start> <dest> <ship> <payload> <date1> <date2>
+       python nav_cli.py --stream [--adaptive] <start> <dest> <ship> <payload> <date1> <date2>
+       python nav_cli.py --fleet [--adaptive] <start> <dest> <payload[,payload...]> <date1> <date2>
+       python nav_cli.py --max-payload [--adaptive] <start> <dest> <ship|all> <date1> <date2>
+
+--adaptive replaces the fixed 50-500 day TOF grid with the coarse-to-fine
+optimizer (period-scaled bounds, sub-day precision).
+--fleet solves the route once and ranks every ship x payload combination by
+feasibility and fuel.
+--max-payload reports the most each ship can carry (within Fuel_Cap and
+Max_PLMass), overall and per launch date.
+--stream prints JSON lines as the search runs instead of one JSON document
+at the end: a "cell" record per evaluated launch/TOF cell, an "efficient" or
+"fastest" record whenever the best flight so far improves, and a final
+"done" record. Streams are always computed locally.
+--deadline=SEC / --max-evals=N bound the search by time or by grid
+cells (coarse-to-fine anytime search); the output then also reports whether
+the search completed and the optimality gap, a bound on how far the best
+delta-V found can be above the grid's best.
+--no-store skips the route store (route_store.py); by default a stored
+result for the same query is returned and new results are saved.
+--profile-startup reports (on stderr) how long each planning module took to
+import and how long the query itself took.
+--stats prints the instrumentation counters and stage timers (Kepler and
+Lambert iterations, cache hits, cells evaluated/pruned, ...) to stderr;
+--stats=FILE writes them to FILE as JSON instead. --pstats=FILE dumps a
+cProfile of the query. Both compute the query in this process.
+
+If NAV_SERVICE_SOCKET points at a running route_service.py, the query is
+answered by the service instead of being computed in this process.
 """
 
+import os
+import math
 import sys
 import json
-from formula_implementation import find_best_mission, SHIPS
+import time
+import socket
+import importlib
+from contextlib import nullcontext
+
+FLAGS = ["--adaptive", "--fleet", "--max-payload", "--no-store", "--stream", "--deadline", "--max-evals",
+         "--profile-startup", "--stats", "--pstats"]
+
+# Flags that only work as --flag=VALUE: (placeholder, what the value is, conversion)
+VALUE_FLAGS = {"--deadline": ("SEC", "a number of seconds", float),
+               "--max-evals": ("N", "a whole number of cells", int),
+               "--pstats": ("FILE", "a file name", str)}
+
+def flag_values(flags):
+    """{flag: value} for the --flag=value arguments, converted per VALUE_FLAGS"""
+    values = dict(f.split("=", 1) for f in flags if "=" in f)
+    for name, (placeholder, what, convert) in VALUE_FLAGS.items():
+        if name in flags or values.get(name) == "":
+            raise ValueError(f"{name} needs a value: {name}={placeholder}")
+        if name in values:
+            try:
+                values[name] = convert(values[name])
+            except ValueError:
+                raise ValueError(f"{name} expects {what}, got {values[name]!r}")
+    return values
 
 def parse_ship_name(cli_input):
     """Convert CLI ship names to internal format"""
@@ -26,6 +82,7 @@ def parse_ship_name(cli_input):
             return value
     
     # Try exact match
+    from formula_implementation import ships as SHIPS
     for ship_name in SHIPS.keys():
         if cli_input.lower() in ship_name.lower():
             return ship_name
@@ -36,78 +93,278 @@ def format_vector(vec):
     """Format numpy array as x,y,z string"""
     return f"{vec[0]:.3f},{vec[1]:.3f},{vec[2]:.3f}"
 
+def format_flight(flight):
+    """Format one flight from find_best_mission as CLI output fields"""
+    return {
+        "Launch date": flight["launch_date"],
+        "Launch vector": format_vector(flight["v_inf_departure"]),
+        "Launch deltaV": f"{flight['dv_departure']:.3f}",
+        "Fuel": f"{flight['fuel_required']:.0f}",
+        "Arrival date": flight["arrival_date"],
+        "Arrival vector": format_vector(flight["v_inf_arrival"]),
+        "Arrival deltaV": f"{flight['dv_arrival']:.3f}",
+        "Time of flight": f"{flight['tof_days']} days"
+    }
+
+def format_mission(result):
+    """Turn a find_best_mission result into the CLI's JSON output"""
+    if result["flight_impossible"]:
+        output = {
+            "Flight impossible": True,
+            "reason": result.get("reason", "Unknown")
+        }
+    else:
+        output = {
+            "Flight impossible": False,
+            "Efficient flight parameters": format_flight(result["efficient_flight"]),
+            "Soonest arrival flight parameters": format_flight(result["fastest_flight"])
+        }
+    if "cells_pruned" in result:
+        output["Cells pruned"] = result["cells_pruned"]
+    # Budgeted (anytime) searches
+    if "complete" in result:
+        gap = result["optimality_gap"]
+        output["Search complete"] = result["complete"]
+        output["Cells evaluated"] = result["cells_evaluated"]
+        output["Optimality gap"] = f"{gap:.2%}" if gap is not None else "unknown"
+    return output
+
+def format_fleet(result):
+    """Turn an evaluate_fleet result into the CLI's JSON output"""
+    table = []
+    for row in result["fleet"]:
+        entry = {
+            "Ship": row["ship"],
+            "Payload": f"{row['payload']:.0f}",
+            "Feasible": row["feasible"],
+            "Within payload limit": row["within_payload_limit"]
+        }
+        if row["flight"] is not None:
+            flight = row["flight"]
+            entry.update({
+                "Fuel": f"{flight['fuel_required']:.0f}",
+                "Launch date": flight["launch_date"],
+                "Arrival date": flight["arrival_date"],
+                "Time of flight": f"{flight['tof_days']} days"
+            })
+        table.append(entry)
+    return {"Fleet": table}
+
+def plan_fleet_query(start, dest, payloads, launch_date, end_date, engine=None, adaptive=False):
+    """Run one fleet query (payloads as "p1,p2,...") and return its JSON output"""
+    from formula_implementation import evaluate_fleet
+    return format_fleet(evaluate_fleet(
+        start_planet=start.capitalize(),
+        end_planet=dest.capitalize(),
+        payloads=[float(p) for p in str(payloads).split(",")],
+        launch_date_str=launch_date,
+        min_tof=50,
+        max_tof=500,
+        step=15,
+        end_date_str=end_date,
+        engine=engine,
+        tof_mode="adaptive" if adaptive else "grid"
+    ))
+
+def format_max_payload(result):
+    """Turn a find_max_payload result into the CLI's JSON output"""
+    table = []
+    for row in result["ships"]:
+        entry = {"Ship": row["ship"], "Flight impossible": row["flight_impossible"]}
+        if not row["flight_impossible"]:
+            entry["Max payload"] = f"{row['max_payload']:.0f}"
+            entry["Best flight parameters"] = format_flight(row["flight"])
+            entry["Max payload by launch date"] = {
+                date: (f"{p:.0f}" if p is not None else None)
+                for date, p in zip(result["launch_dates"], row["per_launch_date"])
+            }
+        table.append(entry)
+    return {"Max payload": table}
+
+def plan_max_payload_query(start, dest, ship, launch_date, end_date, engine=None, adaptive=False):
+    """Run one max-payload query (ship may be "all") and return its JSON output"""
+    from formula_implementation import find_max_payload
+    return format_max_payload(find_max_payload(
+        start_planet=start.capitalize(),
+        end_planet=dest.capitalize(),
+        launch_date_str=launch_date,
+        min_tof=50,
+        max_tof=500,
+        step=15,
+        end_date_str=end_date,
+        ship_names=None if ship.lower() == "all" else [parse_ship_name(ship)],
+        engine=engine,
+        tof_mode="adaptive" if adaptive else "grid"
+    ))
+
+def plan_query(start, dest, ship, payload, launch_date, end_date, engine=None, adaptive=False, use_store=True,
+               deadline=None, max_evals=None):
+    """Run one CLI-style query (raw user strings) and return its JSON output"""
+    from formula_implementation import find_best_mission
+    store = None
+    if use_store:
+        from route_store import get_route_store
+        store = get_route_store()
+    return format_mission(find_best_mission(
+        start_planet=start.capitalize(),
+        end_planet=dest.capitalize(),
+        ship_name=parse_ship_name(ship),
+        payload_mass=float(payload),
+        launch_date_str=launch_date,
+        min_tof=50,
+        max_tof=500,
+        step=15,
+        end_date_str=end_date,
+        engine=engine,
+        tof_mode="adaptive" if adaptive else "grid",
+        store=store,
+        deadline=deadline,
+        max_evals=max_evals
+    ))
+
+def stream_query(start, dest, ship, payload, launch_date, end_date, engine=None, adaptive=False):
+    """Generator of CLI-formatted stream records for one query (see iter_mission)"""
+    from formula_implementation import iter_mission
+    records = iter_mission(
+        start_planet=start.capitalize(),
+        end_planet=dest.capitalize(),
+        ship_name=parse_ship_name(ship),
+        payload_mass=float(payload),
+        launch_date_str=launch_date,
+        min_tof=50,
+        max_tof=500,
+        step=15,
+        end_date_str=end_date,
+        engine=engine,
+        tof_mode="adaptive" if adaptive else "grid"
+    )
+    for record in records:
+        if record["type"] == "cell":
+            yield {
+                "type": "cell",
+                "Launch date": record["launch_date"],
+                "Time of flight": f"{record['tof_days']} days",
+                # Cells where Lambert did not converge have no delta-V or fuel
+                "deltaV": f"{record['delta_v']:.3f}" if math.isfinite(record["delta_v"]) else None,
+                "Fuel": f"{record['fuel_required']:.0f}" if math.isfinite(record["fuel_required"]) else None,
+                "Feasible": record["feasible"]
+            }
+        elif record["type"] == "done":
+            done = {"type": "done", "Flight impossible": record["flight_impossible"],
+                    "Cells evaluated": record["cells_evaluated"], "Cells pruned": record["cells_pruned"]}
+            if not record["flight_impossible"]:
+                done["Efficient flight parameters"] = format_flight(record["efficient_flight"])
+                done["Soonest arrival flight parameters"] = format_flight(record["fastest_flight"])
+            yield done
+        else:
+            yield {"type": record["type"], **format_flight(record["flight"])}
+
+def query_service(socket_path, args, timeout=600, method="plan_query", **options):
+    """Ask a running route_service.py to plan the query; None if it is not reachable"""
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(timeout)
+        conn.connect(socket_path)
+    except OSError:
+        return None
+
+    with conn:
+        request = {"id": 1, "method": method, "params": {"args": args, **options}}
+        conn.sendall((json.dumps(request) + "\n").encode())
+        response = conn.makefile("r").readline()
+    if not response:
+        return None
+
+    response = json.loads(response)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+def profile_startup():
+    """Import the planning modules one by one and time each (must run before plan_query)"""
+    timings = {}
+    for module in ["numpy", "get_values", "formula_implementation"]:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        timings[f"import {module} (ms)"] = round((time.perf_counter() - start) * 1e3, 2)
+    return timings
+
 def main():
-    if len(sys.argv) != 7:
-        print("Usage: python nav_cli.py <start> <dest> <ship> <payload> <date1> <date2>")
-        print("Example: python nav_cli.py Earth Mars Moonivan 5000 010226 300626")
-        sys.exit(1)
-    
-    start_planet = sys.argv[1].capitalize()
-    dest_planet = sys.argv[2].capitalize()
-    ship_input = sys.argv[3]
-    payload = float(sys.argv[4])
-    launch_date = sys.argv[5]
-    end_date = sys.argv[6]
-    
-    # Parse ship name
+    flags = [a for a in sys.argv[1:] if a.startswith("--")]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
     try:
-        ship_name = parse_ship_name(ship_input)
+        values = flag_values(flags)
     except ValueError as e:
         print(json.dumps({"error": str(e)}, indent=2))
         sys.exit(1)
+    flags = [f.split("=", 1)[0] for f in flags]
+    fleet = "--fleet" in flags
+    capacity = "--max-payload" in flags
+    stream = "--stream" in flags
+    if (len(args) != (5 if fleet or capacity else 6) or fleet + capacity + stream > 1
+            or any(f not in FLAGS for f in flags)):
+        print("Usage: python nav_cli.py [--adaptive] [--no-store] [--deadline=SEC] [--max-evals=N] [--profile-startup]")
+        print("                         [--stats[=FILE]] [--pstats=FILE] <start> <dest> <ship> <payload> <date1> <date2>")
+        print("       python nav_cli.py --stream [--adaptive] <start> <dest> <ship> <payload> <date1> <date2>")
+        print("       python nav_cli.py --fleet [--adaptive] <start> <dest> <payload[,payload...]> <date1> <date2>")
+        print("       python nav_cli.py --max-payload [--adaptive] <start> <dest> <ship|all> <date1> <date2>")
+        print("Example: python nav_cli.py Earth Mars Moonivan 5000 010226 300626")
+        sys.exit(1)
     
-    # Run mission analysis
+    profile = profile_startup() if "--profile-startup" in flags else None
+    collect = "--stats" in flags
+    if collect or "--pstats" in values:
+        from instrumentation import stats, profile as cprofile
+        if collect:
+            stats.enable()
+
+    # Run mission analysis (on the warm service when one is configured)
     try:
-        result = find_best_mission(
-            start_planet=start_planet,
-            end_planet=dest_planet,
-            ship_name=ship_name,
-            payload_mass=payload,
-            launch_date_str=launch_date,
-            min_tof=50,
-            max_tof=500,
-            step=15
-        )
-        
-        # Format output as JSON
-        if result["flight_impossible"]:
-            output = {
-                "Flight impossible": True,
-                "reason": result.get("reason", "Unknown")
-            }
-        else:
-            eff = result["efficient_flight"]
-            fast = result["fastest_flight"]
-            
-            output = {
-                "Flight impossible": False,
-                "Efficient flight parameters": {
-                    "Launch date": eff["launch_date"],
-                    "Launch vector": format_vector(eff["v_inf_departure"]),
-                    "Launch deltaV": f"{eff['dv_departure']:.3f}",
-                    "Fuel": f"{eff['fuel_required']:.0f}",
-                    "Arrival date": eff["arrival_date"],
-                    "Arrival vector": format_vector(eff["v_inf_arrival"]),
-                    "Arrival deltaV": f"{eff['dv_arrival']:.3f}",
-                    "Time of flight": f"{eff['tof_days']} days"
-                },
-                "Soonest arrival flight parameters": {
-                    "Launch date": fast["launch_date"],
-                    "Launch vector": format_vector(fast["v_inf_departure"]),
-                    "Launch deltaV": f"{fast['dv_departure']:.3f}",
-                    "Fuel": f"{fast['fuel_required']:.0f}",
-                    "Arrival date": fast["arrival_date"],
-                    "Arrival vector": format_vector(fast["v_inf_arrival"]),
-                    "Arrival deltaV": f"{fast['dv_arrival']:.3f}",
-                    "Time of flight": f"{fast['tof_days']} days"
-                }
-            }
-        
-        print(json.dumps(output, indent=2))
+        start = time.perf_counter()
+        output = None
+        socket_path = None if collect or "--pstats" in values else os.environ.get("NAV_SERVICE_SOCKET")
+        adaptive = "--adaptive" in flags
+        profiler = cprofile(values["--pstats"]) if "--pstats" in values else nullcontext()
+        with profiler:
+            if stream:
+                # Records go out as soon as they exist; a closed pipe just ends the search
+                try:
+                    for record in stream_query(*args, adaptive=adaptive):
+                        print(json.dumps(record), flush=True)
+                except BrokenPipeError:
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            else:
+                options = {"adaptive": adaptive}
+                if fleet:
+                    method, planner = "plan_fleet_query", plan_fleet_query
+                elif capacity:
+                    method, planner = "plan_max_payload_query", plan_max_payload_query
+                else:
+                    method, planner = "plan_query", plan_query
+                    options["use_store"] = "--no-store" not in flags
+                    if "--deadline" in values:
+                        options["deadline"] = values["--deadline"]
+                    if "--max-evals" in values:
+                        options["max_evals"] = values["--max-evals"]
+                if socket_path:
+                    output = query_service(socket_path, args, method=method, **options)
+                if output is None:
+                    output = planner(*args, **options)
+                print(json.dumps(output, indent=2))
+
+        if profile is not None:
+            profile["query (ms)"] = round((time.perf_counter() - start) * 1e3, 2)
+            profile["pandas imported"] = "pandas" in sys.modules
+            print(json.dumps({"startup profile": profile}, indent=2), file=sys.stderr)
+        if collect:
+            if "--stats" in values:
+                stats.to_json(values["--stats"])
+            else:
+                print(json.dumps({"stats": stats.snapshot()}, indent=2), file=sys.stderr)
         
     except Exception as e:
         print(json.dumps({"error": str(e)}, indent=2))
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
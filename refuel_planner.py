@@ -0,0 +1,190 @@
+"""
+Refuel-aware route planner: inserts stops at the 12-hour parking/refueling orbits.
+Usage: python refuel_planner.py <start> <dest> <ship> <payload> <date1> <date2> [--max-legs N]
+
+Routes are found with A* over (body, day, legs flown) states, minimising the
+total fuel burned. Every leg must fit in the ship's tank (it refuels to full
+at each stop). Leg delta-Vs do not depend on the ship, so they are kept in a
+LegCostCache shared by every query in the process.
+"""
+
+import sys
+import json
+import heapq
+import argparse
+import threading
+
+import numpy as np
+
+from get_values import date_to_jd, jd_to_date
+from formula_implementation import StdGravPlanets, Rfuel_data, ships, compute_porkchop, tof_bounds
+from nav_cli import parse_ship_name
+
+class LegCostCache:
+    """Ship-independent leg delta-Vs keyed by (from, to, departure day) over a whole-day TOF grid"""
+    def __init__(self, tof_points=12):
+        self.tof_points = tof_points
+        self.hits = 0
+        self.misses = 0
+        self._legs = {}
+        self._lock = threading.Lock()
+
+    def tof_grid(self, body_a, body_b):
+        lo, hi = tof_bounds(body_a, body_b)
+        return np.unique(np.round(np.linspace(lo, hi, self.tof_points)))
+
+    def get(self, body_a, body_b, depart_jds, engine=None):
+        """(tofs, delta_v) with delta_v shaped (len(depart_jds), len(tofs)); NaN where Lambert failed"""
+        tofs = self.tof_grid(body_a, body_b)
+        out = np.empty((len(depart_jds), len(tofs)))
+        with self._lock:
+            missing = []
+            for k, jd in enumerate(depart_jds):
+                dv = self._legs.get((body_a, body_b, float(jd)))
+                if dv is None:
+                    missing.append(k)
+                else:
+                    out[k] = dv
+            self.hits += len(depart_jds) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            grid = compute_porkchop(body_a, body_b, np.asarray(depart_jds)[missing], tofs, engine)
+            out[missing] = grid["delta_v"]
+            with self._lock:
+                for k, row in zip(missing, grid["delta_v"]):
+                    self._legs[(body_a, body_b, float(depart_jds[k]))] = row
+        return tofs, out
+
+    def stats(self):
+        with self._lock:
+            return {"legs": len(self._legs), "hits": self.hits, "misses": self.misses}
+
+_leg_cache = LegCostCache()
+
+def get_leg_cache():
+    """Process-wide LegCostCache"""
+    return _leg_cache
+
+def _fuel_for(delV, ship, payload):
+    mf = ship["DMass"] + payload
+    with np.errstate(all="ignore"):
+        return mf * np.exp(delV / ship["SI"]) - mf
+
+def plan_with_refuels(start, dest, ship_name, payload, launch_date_str, end_date_str=None, max_legs=3,
+                      stop_bodies=None, refuel_days=1, max_wait=60, wait_step=10, max_days=None,
+                      max_expansions=5000, leg_cache=None, engine=None):
+    """
+    Lowest-fuel route from start to dest with up to max_legs legs, refueling
+    to a full tank at every intermediate stop (staying at least refuel_days,
+    then waiting up to max_wait days in wait_step increments for a good
+    departure). Returns a find_best_flight-style dict with the list of legs.
+    """
+    ship = ships[ship_name]
+    if leg_cache is None:
+        leg_cache = get_leg_cache()
+    if stop_bodies is None:
+        stop_bodies = list(StdGravPlanets)
+    jd_start = date_to_jd(launch_date_str)
+    jd_end = date_to_jd(end_date_str) if end_date_str else jd_start
+    if jd_end < jd_start:
+        raise ValueError("End of launch window is before its start")
+    if max_days is None:
+        max_days = (jd_end - jd_start) + 2 * tof_bounds(start, dest)[1]
+
+    # Admissible A* heuristic: the last leg still has to capture at dest and escape from some orbit
+    min_escape = (np.sqrt(2) - 1) * min(d["v_park"] for d in Rfuel_data.values())
+    capture = (np.sqrt(2) - 1) * Rfuel_data[dest]["v_park"]
+    h_remaining = float(_fuel_for(min_escape + capture, ship, payload))
+
+    # Heap entries: (fuel so far + heuristic, fuel so far, tiebreak, body, day, legs flown, path)
+    counter = 0
+    heap = [(h_remaining, 0.0, counter, start, jd_start, 0, [])]
+    settled = set()
+    expansions = 0
+
+    while heap and expansions < max_expansions:
+        _, fuel_so_far, _, body, day, legs, path = heapq.heappop(heap)
+        if body == dest:
+            return {
+                "Flight impossible": False,
+                "Fuel": fuel_so_far,
+                "deltaV": sum(leg["deltaV"] for leg in path),
+                "Launch_date": path[0]["Launch_date"],
+                "Arrival_date": path[-1]["Arrival_date"],
+                "Stops": [leg["to"] for leg in path[:-1]],
+                "Legs": path,
+                "expansions": expansions,
+                "leg_cache": leg_cache.stats()
+            }
+        if (body, day, legs) in settled or legs >= max_legs:
+            continue
+        settled.add((body, day, legs))
+        expansions += 1
+
+        # Departure days: the launch window at the start, otherwise after refueling
+        if legs == 0:
+            departs = np.arange(jd_start, jd_end + 0.5, 1.0)
+        else:
+            departs = day + refuel_days + np.arange(0, max_wait + 1, wait_step)
+
+        targets = [dest] if legs == max_legs - 1 else [b for b in stop_bodies if b != body]
+        for nxt in targets:
+            tofs, delta_v = leg_cache.get(body, nxt, departs, engine)
+            fuel = _fuel_for(delta_v, ship, payload)
+            ok = np.isfinite(fuel) & (fuel <= ship["Fuel_Cap"])
+            ok &= (departs[:, None] + tofs[None, :] - jd_start) <= max_days
+            if not ok.any():
+                continue
+
+            # Cheapest and soonest-arriving feasible leg for this hop
+            fuel = np.where(ok, fuel, np.inf)
+            arrivals = np.where(ok, departs[:, None] + tofs[None, :], np.inf)
+            for i, j in {np.unravel_index(np.argmin(fuel), fuel.shape),
+                         np.unravel_index(np.argmin(arrivals), arrivals.shape)}:
+                arrival = departs[i] + tofs[j]
+                leg = {
+                    "from": body,
+                    "to": nxt,
+                    "Launch_date": jd_to_date(departs[i]),
+                    "Arrival_date": jd_to_date(arrival),
+                    "TOF_days": int(tofs[j]),
+                    "deltaV": float(delta_v[i, j]),
+                    "Fuel": float(fuel[i, j])
+                }
+                total = fuel_so_far + leg["Fuel"]
+                counter += 1
+                heapq.heappush(heap, (total + (0.0 if nxt == dest else h_remaining), total, counter,
+                                      nxt, arrival, legs + 1, path + [leg]))
+
+    return {
+        "Flight impossible": True,
+        "Fuel": 0,
+        "deltaV": 0,
+        "expansions": expansions,
+        "leg_cache": leg_cache.stats()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan a route with refueling stops")
+    parser.add_argument("start")
+    parser.add_argument("dest")
+    parser.add_argument("ship")
+    parser.add_argument("payload", type=float)
+    parser.add_argument("date1")
+    parser.add_argument("date2")
+    parser.add_argument("--max-legs", type=int, default=3, help="legs including the final one")
+    parser.add_argument("--max-wait", type=int, default=60, help="longest wait at a refueling stop (days)")
+    args = parser.parse_args()
+
+    try:
+        result = plan_with_refuels(args.start.capitalize(), args.dest.capitalize(), parse_ship_name(args.ship),
+                                   args.payload, args.date1, args.date2, max_legs=args.max_legs,
+                                   max_wait=args.max_wait)
+        print(json.dumps(result, indent=2))
+    except Exception as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Table output for planner results. pandas is only imported when a table is
+actually rendered, so the planning modules never pay for it.
+"""
+
+def state_vector_rows(engine, date_str):
+    """One formatted row per body with its heliocentric state on date_str"""
+    rows = []
+    for body in engine.elements.keys():
+        pos, vel = engine.get_position(body, date_str)
+        rows.append({
+            "Body": body,
+            "X (km)": f"{pos[0]:,.0f}",
+            "Y (km)": f"{pos[1]:,.0f}",
+            "Z (km)": f"{pos[2]:,.0f}",
+            "Vx (km/s)": f"{vel[0]:.3f}",
+            "Vy (km/s)": f"{vel[1]:.3f}",
+            "Vz (km/s)": f"{vel[2]:.3f}"
+        })
+    return rows
+
+def format_table(rows):
+    """Render a list of row dicts as a plain-text table"""
+    import pandas as pd
+    return pd.DataFrame(rows).to_string(index=False)
+
+def print_state_vectors(engine, date_str):
+    print("=== PLANETARY STATE VECTORS (HELIOCENTRIC) ===")
+    print(format_table(state_vector_rows(engine, date_str)))
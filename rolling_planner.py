@@ -0,0 +1,142 @@
+"""
+Incremental planner for recurring schedules whose launch window slides forward.
+Usage: python rolling_planner.py <start> <dest> <ship> <payload> <first DDMMYY> <window days> [--runs N]
+
+A RollingWindowPlanner keeps the last porkchop grid of every lane (start ->
+dest). When the window moves, launch days that left it are dropped, only the
+newly exposed days are solved, and the efficient/fastest flights are picked
+again from the combined grid. Grids do not depend on the ship, so one lane
+serves every ship and payload.
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+
+import numpy as np
+
+from get_values import date_to_jd, jd_to_date
+from formula_implementation import compute_porkchop, adaptive_porkchop, mission_from_grid
+from nav_cli import parse_ship_name
+
+def _take_launch_days(grid, rows):
+    """Porkchop restricted to the given launch-day rows"""
+    shared_tofs = np.ndim(grid["tof_days"]) == 1
+    taken = {}
+    for key, value in grid.items():
+        if np.ndim(value) == 0 or (key == "tof_days" and shared_tofs):
+            taken[key] = value
+        else:
+            taken[key] = value[rows]
+    return taken
+
+def _stack_launch_days(grid, extra):
+    """
+    Porkchop over the launch days of both grids (same TOF axis), in date
+    order. Scalar counters (adaptive "evaluations", "cells_evaluated")
+    describe the newer solve, extra.
+    """
+    order = np.argsort(np.concatenate([grid["launch_jds"], extra["launch_jds"]]), kind="stable")
+    stacked = {}
+    for key, value in grid.items():
+        if np.ndim(value) == 0:
+            stacked[key] = extra[key]
+        elif key == "tof_days" and np.ndim(value) == 1:
+            stacked[key] = value
+        else:
+            stacked[key] = np.concatenate([value, extra[key]])[order]
+    return stacked
+
+class RollingWindowPlanner:
+    """Porkchop grids per lane, updated by the days that entered the launch window"""
+    def __init__(self, min_tof=50, max_tof=500, step=15, tof_mode="grid", engine=None):
+        self.tofs = np.arange(min_tof, max_tof + 1, step)
+        self.tof_mode = tof_mode
+        self.engine = engine
+        self.days_computed = 0
+        self.days_reused = 0
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def _solve(self, start, dest, launch_jds):
+        if self.tof_mode == "adaptive":
+            return adaptive_porkchop(start, dest, launch_jds, engine=self.engine)
+        return compute_porkchop(start, dest, launch_jds, self.tofs, self.engine)
+
+    def window(self, start, dest, launch_date_str, end_date_str=None):
+        """Porkchop for the launch window, solving only days the lane has not seen"""
+        jd_start = date_to_jd(launch_date_str)
+        jd_end = date_to_jd(end_date_str) if end_date_str else jd_start
+        if jd_end < jd_start:
+            raise ValueError("End of launch window is before its start")
+        launch_jds = np.arange(jd_start, jd_end + 0.5, 1.0)
+
+        with self._lock:
+            previous = self._lanes.get((start, dest))
+        if previous is None:
+            grid, missing = None, launch_jds
+        else:
+            keep = np.flatnonzero(np.isin(previous["launch_jds"], launch_jds))
+            grid = _take_launch_days(previous, keep)
+            missing = launch_jds[~np.isin(launch_jds, previous["launch_jds"])]
+
+        if len(missing):
+            fresh = self._solve(start, dest, missing)
+            grid = fresh if grid is None or not len(grid["launch_jds"]) else _stack_launch_days(grid, fresh)
+
+        with self._lock:
+            self._lanes[(start, dest)] = grid
+            self.days_computed += len(missing)
+            self.days_reused += len(launch_jds) - len(missing)
+        return grid
+
+    def plan(self, start, dest, ship_name, payload, launch_date_str, end_date_str=None):
+        """find_best_mission's result for the window, reusing the lane's previous grid"""
+        return mission_from_grid(self.window(start, dest, launch_date_str, end_date_str), ship_name, payload)
+
+    def stats(self):
+        with self._lock:
+            return {"lanes": len(self._lanes), "days_computed": self.days_computed,
+                    "days_reused": self.days_reused}
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-plan a lane daily with a sliding launch window")
+    parser.add_argument("start")
+    parser.add_argument("dest")
+    parser.add_argument("ship")
+    parser.add_argument("payload", type=float)
+    parser.add_argument("date", help="first launch date (DDMMYY)")
+    parser.add_argument("window", type=int, help="launch window length in days")
+    parser.add_argument("--runs", type=int, default=7, help="daily re-plans to simulate")
+    parser.add_argument("--adaptive", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        start, dest, ship = args.start.capitalize(), args.dest.capitalize(), parse_ship_name(args.ship)
+        planner = RollingWindowPlanner(tof_mode="adaptive" if args.adaptive else "grid")
+        first = date_to_jd(args.date)
+        for run in range(args.runs):
+            launch_date = jd_to_date(first + run)
+            end_date = jd_to_date(first + run + args.window - 1)
+            computed = planner.days_computed
+            t0 = time.perf_counter()
+            result = planner.plan(start, dest, ship, args.payload, launch_date, end_date)
+            record = {
+                "window": [launch_date, end_date],
+                "days_computed": planner.days_computed - computed,
+                "ms": round((time.perf_counter() - t0) * 1e3, 2),
+                "flight_impossible": result["flight_impossible"]
+            }
+            if not result["flight_impossible"]:
+                record["efficient_launch"] = result["efficient_flight"]["launch_date"]
+                record["efficient_fuel"] = round(result["efficient_flight"]["fuel_required"])
+                record["fastest_arrival"] = result["fastest_flight"]["arrival_date"]
+            print(json.dumps(record), flush=True)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
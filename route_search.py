@@ -0,0 +1,169 @@
+"""
+Multi-leg gravity-assist route search over the planet graph.
+Usage: python route_search.py <start> <dest> <ship> <payload> <date1> <date2> [--max-flybys N] [--beam-width N]
+
+Each flyby sequence (e.g. Earth -> Venus -> Jupiter) is searched with a beam
+over leg timings: every leg is a batched porkchop (get_highway_velocities
+solutions via compute_porkchop, the same leg path find_best_mission uses)
+from the current beam of partial routes, chained at the flyby body by its
+v-infinity. Partial routes
+are pruned branch-and-bound style once their cumulative delta-V (plus a lower
+bound on the capture burn) exceeds the best complete route or the ship's
+total delta-V budget.
+"""
+
+import sys
+import json
+import argparse
+from itertools import product
+
+import numpy as np
+
+from get_values import date_to_jd, jd_to_date
+from formula_implementation import (StdGravPlanets, Rfuel_data, compute_porkchop, get_required_fuel,
+                                    tof_bounds, max_ship_delV)
+from nav_cli import parse_ship_name
+
+def flyby_delV(v_inf_in, v_inf_out, body):
+    """
+    Powered flyby cost: the change in v-infinity magnitude, plus whatever turn
+    gravity cannot provide without passing below the 12-hour parking radius.
+    """
+    mu = StdGravPlanets[body]
+    rp = Rfuel_data[body]["Rfuel"]
+    v_in = np.linalg.norm(v_inf_in, axis=-1)
+    v_out = np.linalg.norm(v_inf_out, axis=-1)
+
+    cos_turn = np.sum(v_inf_in * v_inf_out, axis=-1) / (v_in * v_out)
+    turn = np.arccos(np.clip(cos_turn, -1, 1))
+    max_turn = 2 * np.arcsin(1 / (1 + rp * v_in**2 / mu))
+    extra_turn = np.maximum(turn - max_turn, 0)
+    return np.abs(v_out - v_in) + 2 * v_out * np.sin(extra_turn / 2)
+
+def flyby_sequences(start, dest, max_flybys, flyby_bodies=None):
+    """Body sequences start -> flybys -> dest without repeating a body back to back"""
+    if flyby_bodies is None:
+        flyby_bodies = [b for b in StdGravPlanets if b != dest]
+    yield (start, dest)
+    for n in range(1, max_flybys + 1):
+        for flybys in product(flyby_bodies, repeat=n):
+            sequence = (start,) + flybys + (dest,)
+            if all(a != b for a, b in zip(sequence, sequence[1:])):
+                yield sequence
+
+def _search_sequence(sequence, launch_jds, limit, capture_bound, max_days, beam_width, tof_points, engine):
+    """Best (total delta-V, epochs at each body) for one sequence, or None if everything was pruned"""
+    # Beam state: epochs at every body so far, incoming v-infinity, cumulative delta-V
+    epochs = launch_jds[:, None]
+    v_inf_in = None
+    cum = np.zeros(len(launch_jds))
+    evaluated = 0
+
+    for leg, (body_a, body_b) in enumerate(zip(sequence, sequence[1:])):
+        last_leg = leg == len(sequence) - 2
+        tofs = np.linspace(*tof_bounds(body_a, body_b), tof_points)
+        grid = compute_porkchop(body_a, body_b, epochs[:, -1], tofs, engine)
+        evaluated += grid["delta_v"].size
+
+        with np.errstate(all="ignore"):
+            if leg == 0:
+                step = grid["dv_departure"]
+            else:
+                step = flyby_delV(v_inf_in[:, None, :], grid["iV1"], body_a)
+            total = cum[:, None] + step
+            if last_leg:
+                total = total + grid["dv_arrival"]
+
+        # Prune against the incumbent / ship budget and the trip length, then keep the beam
+        bound = total if last_leg else total + capture_bound
+        elapsed = grid["arrival_jds"] - epochs[:, :1]
+        keep = np.flatnonzero(np.isfinite(bound) & (bound < limit) & (elapsed <= max_days))
+        if keep.size == 0:
+            return None, evaluated
+        keep = keep[np.argsort(total.ravel()[keep])[:beam_width]]
+        parent, col = np.unravel_index(keep, total.shape)
+
+        epochs = np.concatenate([epochs[parent], grid["arrival_jds"][parent, col][:, None]], axis=1)
+        v_inf_in = grid["iV2"][parent, col]
+        cum = total[parent, col]
+
+    return (cum[0], epochs[0]), evaluated
+
+def find_gravity_assist_routes(start, dest, ship_name, payload, launch_date_str, end_date_str=None,
+                               max_flybys=2, flyby_bodies=None, beam_width=64, tof_points=8,
+                               launch_step=1, max_days=None, engine=None):
+    """
+    Search direct and flyby routes for one ship/payload over a launch window.
+    Trips are limited to max_days in total (default: the longest direct TOF
+    considered, 2x the Hohmann time). Returns the best route found and the
+    best route of every sequence that survived pruning, cheapest first.
+    """
+    jd_start = date_to_jd(launch_date_str)
+    jd_end = date_to_jd(end_date_str) if end_date_str else jd_start
+    if jd_end < jd_start:
+        raise ValueError("End of launch window is before its start")
+    launch_jds = np.arange(jd_start, jd_end + 0.5, launch_step)
+
+    # Capture burn can never be below the escape-speed difference at the parking orbit
+    capture_bound = (np.sqrt(2) - 1) * Rfuel_data[dest]["v_park"]
+    incumbent = max_ship_delV(ship_name, payload)
+    if max_days is None:
+        max_days = tof_bounds(start, dest)[1]
+
+    routes = []
+    searched = evaluated = 0
+    for sequence in flyby_sequences(start, dest, max_flybys, flyby_bodies):
+        searched += 1
+        best, cells = _search_sequence(sequence, launch_jds, incumbent, capture_bound, max_days,
+                                       beam_width, tof_points, engine)
+        evaluated += cells
+        if best is None:
+            continue
+        total_dv, epochs = best
+        incumbent = min(incumbent, total_dv)
+        fuel, possible = get_required_fuel(total_dv, ship_name, payload)
+        routes.append({
+            "sequence": list(sequence),
+            "dates": [jd_to_date(jd) for jd in epochs],
+            "tof_days": [round(float(b - a), 1) for a, b in zip(epochs, epochs[1:])],
+            "deltaV": float(total_dv),
+            "Fuel": float(fuel),
+            "possible": bool(possible)
+        })
+
+    routes.sort(key=lambda r: r["deltaV"])
+    feasible = [r for r in routes if r["possible"]]
+    return {
+        "Flight impossible": not feasible,
+        "best_route": feasible[0] if feasible else None,
+        "routes": routes,
+        "sequences_searched": searched,
+        "cells_evaluated": evaluated
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Search gravity-assist routes")
+    parser.add_argument("start")
+    parser.add_argument("dest")
+    parser.add_argument("ship")
+    parser.add_argument("payload", type=float)
+    parser.add_argument("date1")
+    parser.add_argument("date2")
+    parser.add_argument("--max-flybys", type=int, default=2)
+    parser.add_argument("--beam-width", type=int, default=64)
+    parser.add_argument("--launch-step", type=int, default=1, help="days between candidate launch dates")
+    parser.add_argument("--max-days", type=float, default=None, help="longest total trip (default: 2x Hohmann time)")
+    args = parser.parse_args()
+
+    try:
+        result = find_gravity_assist_routes(
+            args.start.capitalize(), args.dest.capitalize(), parse_ship_name(args.ship), args.payload,
+            args.date1, args.date2, max_flybys=args.max_flybys, beam_width=args.beam_width,
+            launch_step=args.launch_step, max_days=args.max_days)
+        print(json.dumps(result, indent=2))
+    except Exception as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
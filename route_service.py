@@ -0,0 +1,140 @@
+"""
+Long-running route planning service (newline-delimited JSON-RPC over a Unix socket).
+Usage: python route_service.py [--socket PATH] [--workers N] [--ephemeris-table PATH]
+
+Request:  {"id": 1, "method": "find_best_mission", "params": {...}}
+Response: {"id": 1, "result": ...} or {"id": 1, "error": "..."}
+
+Methods: plan_query, plan_fleet_query and plan_max_payload_query (nav_cli
+arguments as "args"), find_best_mission, find_best_flight, evaluate_fleet,
+find_max_payload, cache_stats, ping. Planning runs in a process pool whose
+workers keep the ephemeris engine and caches warm between requests.
+Point nav_cli.py at the service with the NAV_SERVICE_SOCKET environment variable.
+"""
+
+import os
+import json
+import signal
+import asyncio
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "nav_service.sock")
+
+# One cached engine per worker process, built by the pool initializer
+_engine = None
+
+def _init_worker(table_path=None):
+    global _engine
+    from get_values import get_ephemeris_cache
+    import formula_implementation  # pay the planner imports once per worker
+    _engine = get_ephemeris_cache(table_path=table_path)
+
+def _jsonable(obj):
+    """json.dumps default= hook for numpy values in planner results"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dispatch(method, params):
+    """Run one RPC method inside a worker process"""
+    from formula_implementation import (find_best_mission, find_best_flight, evaluate_fleet,
+                                        find_max_payload)
+    from nav_cli import plan_query, plan_fleet_query, plan_max_payload_query
+
+    if method == "ping":
+        return "pong"
+    if method == "cache_stats":
+        return _engine.stats()
+    if method == "plan_query":
+        options = {k: v for k, v in params.items() if k != "args"}
+        return plan_query(*params["args"], engine=_engine, **options)
+    if method in ("plan_fleet_query", "plan_max_payload_query"):
+        options = {k: v for k, v in params.items() if k != "args"}
+        planner = plan_fleet_query if method == "plan_fleet_query" else plan_max_payload_query
+        return planner(*params["args"], engine=_engine, **options)
+    if method == "find_best_mission":
+        return find_best_mission(**params, engine=_engine)
+    if method == "find_best_flight":
+        return find_best_flight(**params, engine=_engine)
+    if method == "evaluate_fleet":
+        return evaluate_fleet(**params, engine=_engine)
+    if method == "find_max_payload":
+        return find_max_payload(**params, engine=_engine)
+    raise ValueError(f"Unknown method: {method}")
+
+class RouteService:
+    def __init__(self, socket_path=DEFAULT_SOCKET, workers=None, table_path=None):
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(table_path,))
+
+    async def _handle_request(self, line):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.pool, _dispatch, request["method"],
+                                                request.get("params", {}))
+            response = {"id": request_id, "result": result}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e)}
+        return json.dumps(response, default=_jsonable) + "\n"
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write((await self._handle_request(line)).encode())
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+
+        # Start every worker now so the first real request finds them warm
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, _dispatch, "ping", {})
+                               for _ in range(self.workers)])
+        print(f"Route service listening on {self.socket_path} ({self.workers} workers)", flush=True)
+
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        async with server:
+            await stop.wait()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve route planning over a Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"socket path (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--ephemeris-table", help="precomputed table from ephemeris_table.py")
+    args = parser.parse_args()
+
+    service = RouteService(args.socket, args.workers, args.ephemeris_table)
+    try:
+        asyncio.run(service.serve())
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Persistent store of planned routes (SQLite), checked before a mission is computed.
+Usage: python route_store.py [--db PATH] stats | routes <start> <dest> [ship] | dates <date1> <date2> | purge
+
+Results are keyed by (start, dest, ship, payload bucket, launch window,
+search settings, model version). The model version is a hash of everything
+a result depends on - orbital elements, ship table and physical constants -
+so editing any of them makes old entries unreachable, and they are deleted
+the next time a store is opened. Only the flight summaries and scalar fields
+of a result are stored; the porkchop grids (GRID_FIELDS) are dropped.
+
+The database lives in the user cache directory ($XDG_CACHE_HOME, default
+~/.cache) unless NAV_ROUTE_STORE names another path.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import argparse
+import threading
+
+import numpy as np
+
+from instrumentation import stats
+
+DEFAULT_PATH = os.environ.get("NAV_ROUTE_STORE", os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "interstellar_highway", "routes.db"))
+
+# Per-cell arrays of a find_best_mission result; too large to be worth storing
+GRID_FIELDS = ("launch_dates", "tof_days", "delta_v", "fuel", "feasible")
+
+# Payloads within the same bucket share a stored result (kg)
+PAYLOAD_BUCKET_KG = 1.0
+
+# Bump when the planner's logic changes in a way that alters its results
+SOLVER_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (
+    start TEXT NOT NULL,
+    dest TEXT NOT NULL,
+    ship TEXT NOT NULL,
+    payload_bucket REAL NOT NULL,
+    jd_start REAL NOT NULL,
+    jd_end REAL NOT NULL,
+    search TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    flight_impossible INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (start, dest, ship, payload_bucket, jd_start, jd_end, search, model_version)
+);
+CREATE INDEX IF NOT EXISTS idx_routes_route ON routes (start, dest, ship);
+CREATE INDEX IF NOT EXISTS idx_routes_dates ON routes (jd_start, jd_end);
+"""
+
+def model_version():
+    """Hash of the orbital elements, ship table and constants behind every result"""
+    import formula_implementation as fi
+
+    engine = fi._elements_engine
+    model = {
+        "solver": SOLVER_VERSION,
+        "elements": engine.elements,
+        "AU": engine.AU,
+        "MU_SUN": engine.MU_SUN,
+        "StdGravSun": fi.StdGravSun,
+        "StdGravPlanets": fi.StdGravPlanets,
+        "ships": fi.ships,
+        "T": fi.T,
+    }
+    return hashlib.sha256(json.dumps(model, sort_keys=True).encode()).hexdigest()[:16]
+
+def _encode(obj):
+    """json.dumps default= hook keeping numpy arrays round-trippable"""
+    if isinstance(obj, np.ndarray):
+        return {"__ndarray__": obj.tolist(), "dtype": str(obj.dtype)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _decode(obj):
+    if "__ndarray__" in obj:
+        return np.array(obj["__ndarray__"], dtype=obj["dtype"])
+    return obj
+
+def payload_bucket(payload):
+    return round(float(payload) / PAYLOAD_BUCKET_KG) * PAYLOAD_BUCKET_KG
+
+class RouteStore:
+    """SQLite-backed find_best_mission results, safe to share between threads and processes"""
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.version = model_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        self.purge_stale()
+
+    def _key(self, start, dest, ship, payload, jd_start, jd_end, search):
+        return (start, dest, ship, payload_bucket(payload), float(jd_start), float(jd_end),
+                json.dumps(search, sort_keys=True), self.version)
+
+    def get(self, start, dest, ship, payload, jd_start, jd_end, search):
+        """Stored result for this query under the current model, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM routes WHERE start=? AND dest=? AND ship=? AND payload_bucket=? "
+                "AND jd_start=? AND jd_end=? AND search=? AND model_version=?",
+                self._key(start, dest, ship, payload, jd_start, jd_end, search)).fetchone()
+            if row is None:
+                self.misses += 1
+                stats.count("route_store_misses")
+                return None
+            self.hits += 1
+            stats.count("route_store_hits")
+        return json.loads(row[0], object_hook=_decode)
+
+    def put(self, start, dest, ship, payload, jd_start, jd_end, search, result):
+        """Store a result without its GRID_FIELDS"""
+        summary = {k: v for k, v in result.items() if k not in GRID_FIELDS}
+        blob = json.dumps(summary, default=_encode)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._key(start, dest, ship, payload, jd_start, jd_end, search)
+                + (int(result["flight_impossible"]), blob, time.time()))
+
+    def find_by_route(self, start, dest, ship=None):
+        """Summaries of stored results for a route (optionally one ship)"""
+        query = "SELECT * FROM routes WHERE start=? AND dest=? AND model_version=?"
+        params = [start, dest, self.version]
+        if ship is not None:
+            query += " AND ship=?"
+            params.append(ship)
+        return self._summaries(query + " ORDER BY jd_start", params)
+
+    def find_by_dates(self, jd_from, jd_to):
+        """Summaries of stored results whose launch window overlaps [jd_from, jd_to]"""
+        return self._summaries("SELECT * FROM routes WHERE jd_start<=? AND jd_end>=? AND model_version=? "
+                               "ORDER BY jd_start", [jd_to, jd_from, self.version])
+
+    def _summaries(self, query, params):
+        from get_values import jd_to_date
+
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            columns = [c[0] for c in cursor.description]
+            rows = [dict(zip(columns, r)) for r in cursor.fetchall()]
+        for row in rows:
+            result = json.loads(row.pop("result"), object_hook=_decode)
+            row["launch_date"] = jd_to_date(row["jd_start"])
+            row["end_date"] = jd_to_date(row["jd_end"])
+            row["flight_impossible"] = bool(row["flight_impossible"])
+            row["search"] = json.loads(row["search"])
+            if not row["flight_impossible"]:
+                row["efficient_launch"] = result["efficient_flight"]["launch_date"]
+                row["efficient_fuel"] = result["efficient_flight"]["fuel_required"]
+        return rows
+
+    def purge_stale(self):
+        """Delete results stored under any other model version; returns how many"""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM routes WHERE model_version != ?", (self.version,)).rowcount
+
+    def clear(self):
+        """Delete every stored result; returns how many"""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM routes").rowcount
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM routes").fetchone()[0]
+        return {"path": self.path, "model_version": self.version, "entries": size,
+                "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_route_store(path=None):
+    """Process-wide RouteStore (opened on first use)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RouteStore(path or DEFAULT_PATH)
+        return _store
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the stored route results")
+    parser.add_argument("--db", default=DEFAULT_PATH, help=f"store path (default: {DEFAULT_PATH})")
+    parser.add_argument("command", choices=["stats", "routes", "dates", "purge"])
+    parser.add_argument("args", nargs="*")
+    args = parser.parse_args()
+
+    from get_values import date_to_jd
+
+    try:
+        store = RouteStore(args.db)
+        if args.command == "stats":
+            output = store.stats()
+        elif args.command == "routes":
+            if len(args.args) not in (2, 3):
+                raise ValueError("routes needs <start> <dest> [ship]")
+            ship = None
+            if len(args.args) == 3:
+                from nav_cli import parse_ship_name
+                ship = parse_ship_name(args.args[2])
+            output = store.find_by_route(args.args[0].capitalize(), args.args[1].capitalize(), ship)
+        elif args.command == "dates":
+            if len(args.args) != 2:
+                raise ValueError("dates needs <date1> <date2>")
+            output = store.find_by_dates(date_to_jd(args.args[0]), date_to_jd(args.args[1]))
+        else:
+            output = {"deleted": store.clear()}
+        print(json.dumps(output, indent=2))
+    except Exception as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Loaded and pre-scaled sprites for the pygame GUI.
+
+    sprites = SpriteCache()
+    screen.blit(sprites.scaled("images/earth.png", (20, 20)), pos)
+    screen.blit(sprites.glow(5, 128), pos)
+    screen.blit(sprites.text(ui_font, "Status: En route...", WHITE), pos)
+
+Every image is loaded from disk once and scaled once per (image, size), so
+the frame loop only blits. Exhaust glow dots and translucent panels are
+pre-rendered per size/alpha level instead of allocating a Surface per draw,
+and rendered text is memoized by (font, string, color).
+invalidate() drops everything derived from the display (call it after
+display.set_mode); the loaded originals are kept.
+"""
+
+from collections import OrderedDict
+
+from pygame import Surface, SRCALPHA, draw, error, image, transform
+
+# Glow alphas are rounded to this step, bounding the glow cache at 8 sizes x 65 levels
+GLOW_ALPHA_STEP = 4
+GLOW_COLOR = (255, 150, 50)
+
+# Rendered strings kept (least recently used are dropped first)
+TEXT_CACHE_SIZE = 512
+
+class SpriteCache:
+    """Surfaces keyed by (path, size) and (size, alpha), built on first use"""
+    def __init__(self):
+        self._images = {}
+        self._scaled = {}
+        self._glows = {}
+        self._panels = {}
+        self._texts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path, alpha=True):
+        """Image at path converted for the display (None if it cannot be loaded)"""
+        key = (path, alpha)
+        if key not in self._images:
+            try:
+                img = image.load(path)
+                self._images[key] = img.convert_alpha() if alpha else img.convert()
+            except (error, FileNotFoundError):
+                self._images[key] = None
+        return self._images[key]
+
+    def scaled(self, path, size, smooth=True, alpha=True):
+        """Image at path scaled to size (None if it cannot be loaded)"""
+        key = (path, tuple(size), smooth, alpha)
+        surf = self._scaled.get(key)
+        if surf is not None or key in self._scaled:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        img = self.load(path, alpha)
+        if img is not None:
+            img = (transform.smoothscale if smooth else transform.scale)(img, tuple(size))
+        self._scaled[key] = img
+        return img
+
+    def glow(self, radius, alpha, color=GLOW_COLOR):
+        """Translucent dot of the given radius, blitted at its top-left (x - radius, y - radius)"""
+        key = (radius, min(255, round(alpha / GLOW_ALPHA_STEP) * GLOW_ALPHA_STEP), color)
+        surf = self._glows.get(key)
+        if surf is None:
+            surf = Surface((radius * 2, radius * 2), SRCALPHA)
+            draw.circle(surf, (*color, key[1]), (radius, radius), radius)
+            self._glows[key] = surf
+        return surf
+
+    def panel(self, size, rgba):
+        """Solid translucent rectangle, e.g. the dark glass behind text"""
+        key = (tuple(size), tuple(rgba))
+        surf = self._panels.get(key)
+        if surf is None:
+            surf = Surface(key[0], SRCALPHA)
+            surf.fill(key[1])
+            self._panels[key] = surf
+        return surf
+
+    def text(self, font, string, color):
+        """font.render(string, True, color), rendered once per (font, string, color)"""
+        key = (font, string, tuple(color))
+        surf = self._texts.get(key)
+        if surf is None:
+            surf = self._texts[key] = font.render(string, True, color)
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return surf
+
+    def invalidate(self):
+        """Forget every derived surface (after a resolution or display mode change)"""
+        self._scaled.clear()
+        self._glows.clear()
+        self._panels.clear()
+
+    def stats(self):
+        return {"images": len(self._images), "scaled": len(self._scaled), "glows": len(self._glows),
+                "texts": len(self._texts), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Headless pygame for the render tests
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
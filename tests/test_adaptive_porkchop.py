@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from formula_implementation import adaptive_porkchop, compute_porkchop, tof_bounds
+from get_values import date_to_jd
+
+def _finite(dv):
+    return np.where(np.isfinite(dv), dv, np.inf)
+
+@pytest.mark.parametrize("start, dest, every", [("Earth", "Mars", 23), ("Venus", "Earth", 23),
+                                                ("Mercury", "Venus", 23), ("Jupiter", "Saturn", 73),
+                                                ("Earth", "Pluto", 146)])
+def test_adaptive_matches_dense_grid_to_a_day(start, dest, every):
+    days = date_to_jd("010126") + np.arange(0, 730, every)
+    grid = adaptive_porkchop(start, dest, days, tol_days=1.0)
+
+    # A 0.25-day grid over the same bounds
+    lo, hi = tof_bounds(start, dest)
+    tofs = np.arange(lo, hi, 0.25)
+    dense = _finite(compute_porkchop(start, dest, days, tofs)["delta_v"])
+    dense_tof, dense_dv = tofs[np.argmin(dense, axis=1)], np.min(dense, axis=1)
+
+    # The refined column holds each day's best cell
+    dv = _finite(grid["delta_v"])
+    assert np.array_equal(dv[:, -1], np.min(dv, axis=1))
+    # A valley narrower than the coarse spacing can still be missed on the odd day
+    assert np.mean(np.abs(grid["tof_days"][:, -1] - dense_tof) <= 1.0) >= 0.95
+    assert np.all(dv[:, -1] <= dense_dv * 1.02)
+    assert np.median(dv[:, -1] / dense_dv) <= 1 + 1e-4
+    # Far fewer solves than a 1-day grid of the same precision
+    assert grid["evaluations"] < (hi - lo) / 4
+
+def test_refined_cell_is_consistent_with_a_fresh_solve():
+    days = date_to_jd("010126") + np.arange(0, 60, 10)
+    grid = adaptive_porkchop("Earth", "Mars", days)
+    fresh = compute_porkchop("Earth", "Mars", days, grid["tof_days"][:, -1:])
+    for key in ("arrival_jds", "iV1", "iV2", "delta_v"):
+        np.testing.assert_allclose(grid[key][:, -1], fresh[key][:, 0], rtol=1e-12)
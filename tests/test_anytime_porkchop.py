@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+
+from formula_implementation import anytime_porkchop, compute_porkchop, find_best_mission, max_ship_delV
+from get_values import date_to_jd
+
+LAUNCH = date_to_jd("010126") + np.arange(120)
+TOFS = np.arange(50, 501, 15)
+MAX_DV = max_ship_delV("Moonivan", 5000)
+# A heavy load leaves the Planet Hopper ~9.8 km/s, so the bound prunes part of this grid
+MERCURY = ("Earth", "Mercury", date_to_jd("010226") + np.arange(60), TOFS)
+MERCURY_DV = max_ship_delV("The Planet Hopper", 20000)
+
+def test_no_budget_is_the_full_grid():
+    grid = anytime_porkchop("Earth", "Mars", LAUNCH, TOFS, max_delta_v=MAX_DV)
+    full = compute_porkchop("Earth", "Mars", LAUNCH, TOFS, max_delta_v=MAX_DV)
+    assert grid["complete"] and grid["evaluated"].all()
+    assert grid["optimality_gap"] == 0.0
+    np.testing.assert_array_equal(grid["delta_v"], full["delta_v"])
+    assert grid["cells_evaluated"] + grid["cells_pruned"] == full["delta_v"].size
+
+def test_budgeted_cells_match_the_full_grid():
+    grid = anytime_porkchop(*MERCURY, max_evals=400, max_delta_v=MERCURY_DV)
+    full = compute_porkchop(*MERCURY, max_delta_v=MERCURY_DV)
+    evaluated = grid["evaluated"]
+    assert evaluated.sum() <= 400 and not grid["complete"]
+    assert grid["cells_evaluated"] + grid["cells_pruned"] == evaluated.sum()
+    assert grid["cells_pruned"] > 0
+    np.testing.assert_array_equal(grid["pruned"], full["pruned"] & evaluated)
+    np.testing.assert_allclose(grid["delta_v"][evaluated], full["delta_v"][evaluated], equal_nan=True)
+    assert np.isnan(grid["delta_v"][~evaluated]).all()
+
+def test_optimality_gap_bounds_the_true_minimum():
+    for route, limit in ((("Earth", "Mars", LAUNCH, TOFS), MAX_DV), (MERCURY, MERCURY_DV)):
+        true_min = np.nanmin(compute_porkchop(*route)["delta_v"])
+        for max_evals in (100, 400, 1000):
+            grid = anytime_porkchop(*route, max_evals=max_evals, max_delta_v=limit)
+            best = np.nanmin(grid["delta_v"])
+            assert 0.0 <= grid["optimality_gap"] < 1.0
+            assert true_min >= best * (1 - grid["optimality_gap"]) - 1e-9
+
+def test_deadline_bounds_the_search_time():
+    anytime_porkchop("Earth", "Mars", LAUNCH, TOFS, max_evals=100)
+    started = time.perf_counter()
+    grid = anytime_porkchop("Earth", "Mars", LAUNCH, TOFS, deadline=0.05, max_delta_v=MAX_DV)
+    assert time.perf_counter() - started < 0.1
+    assert grid["cells_evaluated"] > 0
+
+def test_find_best_mission_reports_pruned_cells():
+    result = find_best_mission("Earth", "Mercury", "The Planet Hopper", 20000, "010226", 50, 500, 15, "280226",
+                               max_evals=300)
+    assert not result["complete"]
+    assert result["cells_pruned"] > 0
+    assert result["cells_evaluated"] + result["cells_pruned"] <= 300
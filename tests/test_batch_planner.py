@@ -0,0 +1,38 @@
+import json
+
+from batch_planner import plan_batch, read_queries
+from nav_cli import plan_query
+
+QUERIES = [
+    {"id": "a", "start": "earth", "dest": "mars", "ship": "moonivan", "payload": 100, "date1": "010126",
+     "date2": "030126"},
+    {"id": "b", "start": "earth", "dest": "mars", "ship": "submarine", "payload": 100, "date1": "010126",
+     "date2": "030126"},
+    {"id": "c", "start": "venus", "dest": "earth", "ship": "yamaha", "payload": 10, "date1": "010126",
+     "date2": "020126"},
+    {"id": "d", "start": "earth", "dest": "mars"},
+    {"id": "e", "start": "mars", "dest": "earth", "ship": "moonivan", "payload": 100, "date1": "010126",
+     "date2": "311225"},
+]
+
+def test_results_keep_submission_order_and_report_errors_per_record():
+    records = list(plan_batch(QUERIES, workers=2, chunksize=1))
+    assert [r["id"] for r in records] == ["a", "b", "c", "d", "e"]
+    assert records[1]["error"] == "Unknown ship: submarine"
+    assert records[3]["error"] == "Missing fields: ship, payload, date1, date2"
+    assert records[4]["error"] == "End of launch window is before its start"
+    for k in (0, 2):
+        q = QUERIES[k]
+        expected = plan_query(q["start"], q["dest"], q["ship"], str(q["payload"]), q["date1"], q["date2"],
+                              use_store=False)
+        assert "error" not in records[k]
+        assert json.loads(json.dumps({k: v for k, v in records[k].items() if k != "id"})) == expected
+
+def test_read_queries_from_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "q.csv"
+    csv_path.write_text("id,start,dest,ship,payload,date1,date2\n7,earth,mars,moonivan,100,010126,020126\n")
+    jsonl_path = tmp_path / "q.jsonl"
+    jsonl_path.write_text(json.dumps(QUERIES[0]) + "\n\n" + json.dumps(QUERIES[3]) + "\n")
+    assert list(read_queries(str(csv_path))) == [{"id": "7", "start": "earth", "dest": "mars", "ship": "moonivan",
+                                                  "payload": "100", "date1": "010126", "date2": "020126"}]
+    assert list(read_queries(str(jsonl_path))) == [QUERIES[0], QUERIES[3]]
@@ -0,0 +1,42 @@
+import numpy as np
+
+from get_values import SolarSystemEngine, EphemerisCache, PAGE_SLOTS, date_to_jd
+
+LAUNCH = date_to_jd("010226")
+
+def test_cache_matches_raw_engine():
+    engine = SolarSystemEngine()
+    cache = EphemerisCache(engine)
+    # Whole days, a noon epoch, duplicates and an uncacheable fractional day
+    jds = np.concatenate([LAUNCH + np.arange(40), [LAUNCH + 0.5, LAUNCH + 3, LAUNCH + 7.3]])
+    for _ in range(2):
+        pos, vel = cache.get_states(["Earth", "Mars"], jds)
+        ref_pos, ref_vel = engine.get_states(["Earth", "Mars"], jds)
+        np.testing.assert_array_equal(pos, ref_pos)
+        np.testing.assert_array_equal(vel, ref_vel)
+
+def test_cache_hits_and_misses():
+    cache = EphemerisCache()
+    jds = LAUNCH + np.arange(10)
+    cache.get_states("Mars", np.concatenate([jds, jds]))
+    # Repeated epochs within a request are solved once
+    assert cache.stats()["misses"] == 10 and cache.stats()["hits"] == 0
+    cache.get_states("Mars", jds[:4])
+    assert cache.stats()["hits"] == 4 and cache.stats()["size"] == 10
+    cache.get_states("Mars", [LAUNCH + 2.25])  # fractional epochs bypass the cache
+    assert cache.stats()["hits"] == 4 and cache.stats()["misses"] == 10
+
+def test_cache_evicts_least_recently_used_page():
+    cache = EphemerisCache(capacity=2 * PAGE_SLOTS)
+    page_days = PAGE_SLOTS / 2
+    first, second, third = LAUNCH, LAUNCH + page_days, LAUNCH + 2 * page_days
+    cache.get_states("Earth", [first])
+    cache.get_states("Earth", [second])
+    cache.get_states("Earth", [first])  # first is now the most recently used
+    cache.get_states("Earth", [third])
+    assert cache.stats()["pages"] == 2
+    misses = cache.stats()["misses"]
+    cache.get_states("Earth", [first, third])
+    assert cache.stats()["misses"] == misses
+    cache.get_states("Earth", [second])
+    assert cache.stats()["misses"] == misses + 1
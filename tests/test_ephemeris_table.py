@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from ephemeris_table import build_ephemeris_table, EphemerisTable
+from get_values import SolarSystemEngine, date_to_jd
+
+START, END = "010126", "010127"
+
+@pytest.fixture(scope="module")
+def engines(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("ephemeris") / "table.bin")
+    build_ephemeris_table(path, START, END)
+    return SolarSystemEngine(), SolarSystemEngine(path)
+
+def test_table_hermite_matches_kepler_between_days(engines):
+    kepler, tabled = engines
+    bodies = list(kepler.elements)
+    jds = date_to_jd(START) + np.linspace(0.0, 364.0, 500) + 0.37
+    assert tabled.table.covers(jds)
+    pos, vel = tabled.get_states(bodies, jds)
+    ref_pos, ref_vel = kepler.get_states(bodies, jds)
+    # Mercury moves ~4 million km/day; Hermite keeps it within tens of km
+    assert np.abs(pos - ref_pos).max() < 50.0
+    assert np.abs(vel - ref_vel).max() < 1e-3
+
+def test_table_whole_days_are_exact(engines):
+    kepler, tabled = engines
+    jds = date_to_jd(START) + np.arange(0, 366, 5)
+    pos, vel = tabled.get_states(["Earth", "Mars"], jds)
+    ref_pos, ref_vel = kepler.get_states(["Earth", "Mars"], jds)
+    np.testing.assert_allclose(pos, ref_pos, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(vel, ref_vel, rtol=0, atol=1e-12)
+
+def test_outside_table_falls_back_to_kepler(engines):
+    kepler, tabled = engines
+    jds = date_to_jd(END) + np.array([1.0, 30.5, 100.25])
+    assert not tabled.table.covers(jds)
+    pos, vel = tabled.get_states("Jupiter", jds)
+    ref_pos, ref_vel = kepler.get_states("Jupiter", jds)
+    np.testing.assert_array_equal(pos, ref_pos)
+    np.testing.assert_array_equal(vel, ref_vel)
+
+def test_table_rejects_other_elements(engines):
+    kepler, tabled = engines
+    elements = dict(kepler.elements, Ceres=[2.8, 0.08, 10.6, 153.2, 73.1, 80.3])
+    with pytest.raises(ValueError, match="different orbital elements"):
+        EphemerisTable(tabled.table.path, elements)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from formula_implementation import evaluate_fleet, find_best_mission, ships
+
+ROUTE = ("Earth", "Mars")
+WINDOW = dict(launch_date_str="010226", min_tof=50, max_tof=500, step=15, end_date_str="150226")
+PAYLOADS = [10, 1000, 5000, 40000]
+
+@pytest.fixture(scope="module")
+def fleet():
+    return evaluate_fleet(*ROUTE, PAYLOADS, **WINDOW)["fleet"]
+
+def test_fleet_rows_match_per_ship_missions(fleet):
+    assert len(fleet) == len(ships) * len(PAYLOADS)
+    for row in fleet:
+        if not row["within_payload_limit"]:
+            continue
+        mission = find_best_mission(*ROUTE, row["ship"], row["payload"], **WINDOW)
+        assert row["feasible"] == (not mission["flight_impossible"])
+        if row["feasible"]:
+            expected = mission["efficient_flight"]
+            for key in ("launch_date", "arrival_date", "tof_days"):
+                assert row["flight"][key] == expected[key]
+            for key in ("fuel_required", "dv_departure", "dv_arrival"):
+                assert row["flight"][key] == pytest.approx(expected[key], rel=1e-9)
+
+def test_payload_above_the_ship_limit_is_infeasible(fleet):
+    for row in fleet:
+        assert row["within_payload_limit"] == (row["payload"] <= ships[row["ship"]]["Max_PLMass"])
+        if not row["within_payload_limit"]:
+            assert not row["feasible"]
+
+def test_fleet_is_ranked_feasible_first_then_by_fuel(fleet):
+    keys = [(not r["feasible"], r["flight"]["fuel_required"] if r["flight"] else np.inf) for r in fleet]
+    assert keys == sorted(keys)
@@ -0,0 +1,22 @@
+import numpy as np
+
+from get_values import SolarSystemEngine
+from instrumentation import stats
+
+def test_kepler_iterations_are_counted_per_element():
+    engine = SolarSystemEngine()
+    M = np.linspace(0, 2 * np.pi, 40)
+    stats.enable()
+    try:
+        stats.reset()
+        engine._kepler_equation(M, 0.2)
+        batch = stats.snapshot()["counters"]
+        stats.reset()
+        engine._kepler_equation(M[:1], 0.2)
+        single = stats.snapshot()["counters"]
+    finally:
+        stats.disable()
+        stats.reset()
+    assert batch["kepler_solves"] == 40
+    assert batch["kepler_iterations"] % 40 == 0
+    assert batch["kepler_iterations"] >= 40 * single["kepler_iterations"]
@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+
+from formula_implementation import iter_mission, find_best_mission
+from nav_cli import stream_query
+
+QUERY = ("Earth", "Mars", "Moonivan", 5000, "010226", 50, 500, 15, "280226")
+# A heavy load leaves the Planet Hopper ~9.8 km/s, so the bound prunes part of this grid
+PRUNED_QUERY = ("Earth", "Mercury", "The Planet Hopper", 20000, "010226", 50, 500, 15, "280226")
+N_CELLS = 28 * len(np.arange(50, 501, 15))
+
+def test_stream_counts_only_solved_cells():
+    records = list(iter_mission(*PRUNED_QUERY))
+    cells = [r for r in records if r["type"] == "cell"]
+    done = records[-1]
+    assert done["type"] == "done"
+    assert 0 < done["cells_pruned"] < N_CELLS
+    assert len(cells) == done["cells_evaluated"]
+    assert all(np.isfinite(c["delta_v"]) for c in cells)
+    assert done["cells_evaluated"] + done["cells_pruned"] == N_CELLS
+
+def test_stream_ends_with_find_best_mission_flights():
+    done = list(iter_mission(*QUERY, cells=False))[-1]
+    expected = find_best_mission(*QUERY)
+    for flight in ("efficient_flight", "fastest_flight"):
+        for key in ("launch_date", "arrival_date", "tof_days"):
+            assert done[flight][key] == expected[flight][key]
+
+def test_cli_stream_has_no_nan_fields():
+    records = list(stream_query("earth", "mercury", "hopper", "20000", "010226", "280226"))
+    text = "\n".join(json.dumps(r) for r in records)
+    assert "nan" not in text.lower()
+    assert sum(r["type"] == "cell" for r in records) == records[-1]["Cells evaluated"]
+
+def test_adaptive_stream_counts_lambert_solves():
+    done = list(iter_mission(*QUERY[:-1], "050226", tof_mode="adaptive", cells=False))[-1]
+    assert done["cells_pruned"] == 0
+    assert done["cells_evaluated"] >= 5 * 17
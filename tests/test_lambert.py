@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from formula_implementation import batch_lambert_solver, simple_lambert_solver
+from get_values import SolarSystemEngine, date_to_jd
+
+MU_EARTH = 398600
+
+def test_simple_lambert_matches_curtis_example_5_2():
+    r1 = np.array([5000.0, 10000.0, 2100.0])
+    r2 = np.array([-14600.0, 2500.0, 7000.0])
+    v1, v2 = simple_lambert_solver(r1, r2, 3600, MU_EARTH)
+    np.testing.assert_allclose(v1, [-5.9925, 1.9254, 3.2456], atol=1e-3)
+    np.testing.assert_allclose(v2, [-3.3125, -4.1966, -0.38529], atol=1e-3)
+
+@pytest.mark.parametrize("start, dest", [("Earth", "Mars"), ("Jupiter", "Saturn"), ("Earth", "Pluto"),
+                                         ("Venus", "Mercury")])
+def test_single_transfer_fast_path_matches_batch_solver(start, dest):
+    engine = SolarSystemEngine()
+    launch = date_to_jd("010226") + np.arange(0, 700, 70)
+    for k, tof in enumerate(np.linspace(20, 2500, len(launch))):
+        r1 = engine.get_states(start, [launch[k]])[0][0, 0]
+        r2 = engine.get_states(dest, [launch[k] + tof])[0][0, 0]
+        v1, v2 = simple_lambert_solver(r1, r2, tof * 86400)
+        b1, b2, converged, _ = batch_lambert_solver(r1, r2, tof * 86400)
+        assert np.isfinite(v1).all() == bool(converged)
+        np.testing.assert_allclose(v1, b1, rtol=1e-9)
+        np.testing.assert_allclose(v2, b2, rtol=1e-9)
+
+def test_single_transfer_without_a_plane_is_nan():
+    r1 = np.array([1.5e8, 0.0, 0.0])
+    v1, v2 = simple_lambert_solver(r1, 2 * r1, 100 * 86400)
+    assert np.isnan(v1).all() and np.isnan(v2).all()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from formula_implementation import (find_max_payload, get_max_payload, get_required_fuel, max_ship_delV,
+                                    ships)
+
+def test_max_payload_inverts_the_rocket_equation():
+    ship = "Moonivan"
+    for payload in (10.0, 2500.0, 9000.0):
+        dv = max_ship_delV(ship, payload)
+        assert get_max_payload(dv, [ship])[0] == pytest.approx(payload, rel=1e-9)
+        fuel, possible = get_required_fuel(dv * 0.999, ship, payload)
+        assert possible and fuel <= ships[ship]["Fuel_Cap"]
+
+def test_max_payload_is_clamped_to_max_plmass():
+    names = list(ships)
+    capacity = get_max_payload(np.array([0.1, 1.0]), names)
+    limits = np.array([ships[s]["Max_PLMass"] for s in names])
+    # A near-free flight could carry far more than the hold allows
+    assert np.array_equal(capacity[:, 0], limits)
+    assert np.all(capacity <= limits[:, None])
+
+def test_max_payload_is_nan_when_even_an_empty_ship_falls_short():
+    ship = "Chevrolet Super Sonic"
+    assert np.isnan(get_max_payload(max_ship_delV(ship, 0) + 0.1, [ship])[0])
+    assert np.isnan(get_max_payload(np.nan, [ship])[0])
+
+def test_find_max_payload_respects_the_ship_limits():
+    result = find_max_payload("Earth", "Mars", "010226", 50, 500, 15, end_date_str="150226")
+    assert result["max_payload"].shape[0] == len(ships)
+    for row in result["ships"]:
+        limit = ships[row["ship"]]["Max_PLMass"]
+        assert row["max_payload"] <= limit
+        if not row["flight_impossible"]:
+            assert row["flight"]["fuel_required"] <= ships[row["ship"]]["Fuel_Cap"] * (1 + 1e-9)
+            assert all(p is None or p <= limit for p in row["per_launch_date"])
+    # Earth->Mars is easy enough that the hold, not the tank, limits the Moonivan
+    moonivan = next(r for r in result["ships"] if r["ship"] == "Moonivan")
+    assert moonivan["max_payload"] == ships["Moonivan"]["Max_PLMass"]
+    assert [r["max_payload"] for r in result["ships"]] == sorted((r["max_payload"] for r in result["ships"]),
+                                                                  reverse=True)
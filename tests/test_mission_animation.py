@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from formula_implementation import find_best_mission
+from mission_animation import ARRIVAL_TOLERANCE_KM, build_animation
+
+ROUTES = [
+    ("Earth", "Mars", "Moonivan"),
+    ("Venus", "Uranus", "Yamaha Space Cycle"),
+    ("Mercury", "Uranus", "Yamaha Space Cycle"),
+    ("Jupiter", "Saturn", "Yamaha Space Cycle"),
+]
+
+@pytest.mark.parametrize("start, dest, ship", ROUTES)
+def test_planned_flights_arrive_at_destination(start, dest, ship):
+    result = find_best_mission(start, dest, ship, 100, "010126", 50, 500, 15, "010426")
+    assert not result["flight_impossible"]
+    for key in ("efficient_flight", "fastest_flight"):
+        anim = build_animation(start, dest, result[key], [start, dest], samples=50)
+        assert anim["valid"]
+        assert anim["arrival_miss_km"] < 1.0
+        assert np.isfinite(anim["ship"]).all()
+
+def test_animation_missing_destination_is_invalid():
+    result = find_best_mission("Earth", "Mars", "Moonivan", 100, "010126", 50, 500, 15, "010426")
+    flight = dict(result["efficient_flight"])
+    flight["v_inf_departure"] = np.asarray(flight["v_inf_departure"]) * 1.1
+    anim = build_animation("Earth", "Mars", flight, ["Earth", "Mars"], samples=50)
+    assert anim["arrival_miss_km"] > ARRIVAL_TOLERANCE_KM
+    assert not anim["valid"]
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+pytest.importorskip("pygame")
+
+import mission_render
+
+def test_export_mission_renders_valid_flight(tmp_path):
+    record = mission_render.export_mission("earth", "mars", "moonivan", 1000, "010126", "150126",
+                                           out=str(tmp_path), fps=1, size=(320, 240), use_store=False)
+    assert "error" not in record
+    assert record["arrival_miss_km"] < 1.0
+    assert record["frames"] == len(os.listdir(record["output"]))
+
+def test_export_mission_skips_trajectory_that_misses(tmp_path, monkeypatch):
+    build = mission_render.build_animation
+
+    def missing_build(*args, **kwargs):
+        anim = build(*args, **kwargs)
+        anim.update({"arrival_miss_km": 5e6, "valid": False})
+        return anim
+
+    monkeypatch.setattr(mission_render, "build_animation", missing_build)
+    record = mission_render.export_mission("earth", "mars", "moonivan", 1000, "010126", "150126",
+                                           out=str(tmp_path), fps=1, size=(320, 240), use_store=False)
+    assert "misses Mars" in record["error"]
+    assert "frames" not in record and "output" not in record
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,19 @@
+import pytest
+
+from nav_cli import flag_values
+
+@pytest.mark.parametrize("flag, message", [
+    ("--pstats", "--pstats needs a value: --pstats=FILE"),
+    ("--deadline", "--deadline needs a value: --deadline=SEC"),
+    ("--max-evals=", "--max-evals needs a value: --max-evals=N"),
+    ("--deadline=soon", "--deadline expects a number of seconds, got 'soon'"),
+    ("--max-evals=1.5", "--max-evals expects a whole number of cells, got '1.5'"),
+])
+def test_value_flags_need_valid_values(flag, message):
+    with pytest.raises(ValueError) as err:
+        flag_values(["--adaptive", flag])
+    assert str(err.value) == message
+
+def test_flag_values_are_converted():
+    values = flag_values(["--deadline=2.5", "--max-evals=300", "--pstats=q.pstats", "--stats", "--no-store"])
+    assert values == {"--deadline": 2.5, "--max-evals": 300, "--pstats": "q.pstats"}
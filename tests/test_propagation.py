@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from formula_implementation import StdGravSun, propagate_kepler
+
+MU = StdGravSun
+AU = 1.495978707e8
+
+def _kepler_state(a, e, nu0, dt, mu=MU):
+    """Analytic in-plane two-body state after dt from true anomaly nu0 (Kepler's equation by bisection)"""
+    p = a * (1 - e**2)
+    r0_mag = p / (1 + e * np.cos(nu0))
+    r0 = r0_mag * np.array([np.cos(nu0), np.sin(nu0), 0.0])
+    v0 = np.sqrt(mu / p) * np.array([-np.sin(nu0), e + np.cos(nu0), 0.0])
+
+    if e < 1:
+        n = np.sqrt(mu / a**3)
+        E0 = 2 * np.arctan(np.sqrt((1 - e) / (1 + e)) * np.tan(nu0 / 2))
+        M = E0 - e * np.sin(E0) + n * dt
+        f = lambda E: E - e * np.sin(E) - M
+        lo, hi = M - 1.0, M + 1.0
+    else:
+        n = np.sqrt(mu / (-a)**3)
+        H0 = 2 * np.arctanh(np.sqrt((e - 1) / (e + 1)) * np.tan(nu0 / 2))
+        M = e * np.sinh(H0) - H0 + n * dt
+        f = lambda H: e * np.sinh(H) - H - M
+        lo, hi = -50.0, 50.0
+    for _ in range(200):
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if f(mid) < 0 else (lo, mid)
+    x = (lo + hi) / 2
+
+    if e < 1:
+        r = np.array([a * (np.cos(x) - e), a * np.sqrt(1 - e**2) * np.sin(x), 0.0])
+        r_mag = a * (1 - e * np.cos(x))
+        v = np.sqrt(mu * a) / r_mag * np.array([-np.sin(x), np.sqrt(1 - e**2) * np.cos(x), 0.0])
+    else:
+        b = -a * np.sqrt(e**2 - 1)
+        r = np.array([-a * (e - np.cosh(x)), b * np.sinh(x), 0.0])
+        r_mag = -a * (e * np.cosh(x) - 1)
+        v = np.sqrt(-mu * a) / r_mag * np.array([-np.sinh(x), np.sqrt(e**2 - 1) * np.cosh(x), 0.0])
+    return r0, v0, r, v
+
+@pytest.mark.parametrize("a, e, nu0, days", [
+    (1.0 * AU, 0.0167, 0.3, 200),     # Earth-like
+    (2.0 * AU, 0.95, 0.0, 300),       # high-eccentricity, from periapsis
+    (2.0 * AU, 0.95, 2.5, 900),       # high-eccentricity, through periapsis
+    (3.0 * AU, 0.99, -0.5, 1500),
+    (-1.0 * AU, 1.5, 0.0, 400),       # hyperbolic
+    (-0.2 * AU, 3.0, -1.0, 2000),     # strongly hyperbolic, far outbound
+    (-5.0 * AU, 1.05, 0.5, -300),     # hyperbolic, backwards in time
+])
+def test_propagate_kepler_matches_analytic(a, e, nu0, days):
+    r0, v0, r_ref, v_ref = _kepler_state(a, e, nu0, days * 86400)
+    r, v, converged = propagate_kepler(r0, v0, days * 86400)
+    assert converged
+    assert np.linalg.norm(r - r_ref) < 1e-8 * np.linalg.norm(r_ref) + 1e-3
+    assert np.linalg.norm(v - v_ref) < 1e-8 * np.linalg.norm(v_ref) + 1e-9
+
+def test_propagate_kepler_broadcasts_and_flags_each_element():
+    r0, v0, _, _ = _kepler_state(-1.0 * AU, 1.5, 0.0, 0)
+    dt = np.linspace(0, 1000, 7) * 86400
+    r, v, converged = propagate_kepler(r0, v0, dt)
+    assert r.shape == (7, 3) and v.shape == (7, 3) and converged.shape == (7,)
+    assert converged.all()
+    np.testing.assert_allclose(r[0], r0)
+    for k, t in enumerate(dt):
+        assert np.linalg.norm(r[k] - _kepler_state(-1.0 * AU, 1.5, 0.0, t)[2]) < 1e-3 + 1e-8 * np.linalg.norm(r[k])
+
+def test_propagate_kepler_reports_non_convergence():
+    r0, v0, _, _ = _kepler_state(2.0 * AU, 0.95, 2.5, 0)
+    r, v, converged = propagate_kepler(r0, v0, 900 * 86400, max_iter=1)
+    assert not converged
+    assert np.isnan(r).all() and np.isnan(v).all()
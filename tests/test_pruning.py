@@ -0,0 +1,14 @@
+import pytest
+
+from formula_implementation import find_best_flight, find_best_mission, route_delV_lower_bound
+
+@pytest.mark.parametrize("start, dest", [("Xenon", "Mars"), ("Earth", "Xenon")])
+def test_route_bound_rejects_unknown_body(start, dest):
+    with pytest.raises(ValueError, match="^Unknown body: Xenon$"):
+        route_delV_lower_bound(start, dest)
+
+def test_planners_report_unknown_body():
+    with pytest.raises(ValueError, match="^Unknown body: Xenon$"):
+        find_best_mission("Earth", "Xenon", "Moonivan", 100, "010126", 50, 500, 15)
+    with pytest.raises(ValueError, match="^Unknown body: Xenon$"):
+        find_best_flight("Xenon", "Mars", "Moonivan", 100, "010126")
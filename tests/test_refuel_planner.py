@@ -0,0 +1,36 @@
+import pytest
+
+from formula_implementation import ships, find_best_mission
+from get_values import date_to_jd
+from refuel_planner import plan_with_refuels, LegCostCache
+
+SHIP = "The Planet Hopper"
+
+@pytest.fixture(scope="module")
+def route():
+    return plan_with_refuels("Earth", "Mars", SHIP, 1000, "010126", "300126", leg_cache=LegCostCache())
+
+def test_refuel_stop_makes_an_out_of_range_trip_possible(route):
+    direct = find_best_mission("Earth", "Mars", SHIP, 1000, "010126", 50, 500, 15, "300126")
+    assert direct["flight_impossible"]
+    assert not route["Flight impossible"]
+    assert route["Stops"]
+
+def test_every_leg_fits_in_the_tank(route):
+    legs = route["Legs"]
+    assert all(0 < leg["Fuel"] <= ships[SHIP]["Fuel_Cap"] for leg in legs)
+    assert route["Fuel"] == pytest.approx(sum(leg["Fuel"] for leg in legs))
+    assert route["deltaV"] == pytest.approx(sum(leg["deltaV"] for leg in legs))
+
+def test_legs_chain_through_the_stops(route):
+    legs = route["Legs"]
+    assert legs[0]["from"] == "Earth" and legs[-1]["to"] == "Mars"
+    assert [leg["to"] for leg in legs[:-1]] == route["Stops"]
+    for prev, leg in zip(legs, legs[1:]):
+        assert leg["from"] == prev["to"]
+        assert date_to_jd(leg["Launch_date"]) > date_to_jd(prev["Arrival_date"])
+
+def test_tank_too_small_for_any_leg():
+    result = plan_with_refuels("Earth", "Mars", "Chevrolet Super Sonic", 1000, "010126", "300126",
+                               leg_cache=LegCostCache())
+    assert result["Flight impossible"]
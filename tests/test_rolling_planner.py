@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from formula_implementation import adaptive_porkchop, compute_porkchop, find_best_mission
+from get_values import date_to_jd
+from rolling_planner import RollingWindowPlanner
+
+GRID_KEYS = ("launch_jds", "arrival_jds", "delta_v", "iV1", "iV2")
+
+def _assert_same_grid(grid, expected):
+    for key in GRID_KEYS + ("tof_days",):
+        np.testing.assert_array_equal(grid[key], expected[key])
+
+def test_slid_window_equals_a_full_recompute():
+    planner = RollingWindowPlanner()
+    planner.window("Earth", "Mars", "010226", "280226")
+    grid = planner.window("Earth", "Mars", "110226", "100326")
+
+    launch = date_to_jd("110226") + np.arange(28)
+    _assert_same_grid(grid, compute_porkchop("Earth", "Mars", launch, np.arange(50, 501, 15)))
+    # 18 days carried over, 10 new ones solved
+    assert planner.stats() == {"lanes": 1, "days_computed": 28 + 10, "days_reused": 18}
+
+def test_rolling_plan_matches_find_best_mission():
+    planner = RollingWindowPlanner()
+    planner.plan("Earth", "Mars", "Moonivan", 5000, "010226", "280226")
+    result = planner.plan("Earth", "Mars", "Moonivan", 5000, "150226", "150326")
+    expected = find_best_mission("Earth", "Mars", "Moonivan", 5000, "150226", 50, 500, 15, "150326")
+    for flight in ("efficient_flight", "fastest_flight"):
+        for key in ("launch_date", "arrival_date", "tof_days"):
+            assert result[flight][key] == expected[flight][key]
+        assert result[flight]["fuel_required"] == pytest.approx(expected[flight]["fuel_required"], rel=1e-9)
+
+def test_window_moving_back_reuses_the_overlap():
+    planner = RollingWindowPlanner()
+    planner.window("Earth", "Venus", "100126", "200126")
+    grid = planner.window("Earth", "Venus", "050126", "150126")
+    launch = date_to_jd("050126") + np.arange(11)
+    _assert_same_grid(grid, compute_porkchop("Earth", "Venus", launch, np.arange(50, 501, 15)))
+    assert planner.stats()["days_reused"] == 6
+
+def test_adaptive_lane_equals_a_full_recompute():
+    planner = RollingWindowPlanner(tof_mode="adaptive")
+    planner.window("Earth", "Mars", "010226", "100226")
+    grid = planner.window("Earth", "Mars", "060226", "150226")
+    expected = adaptive_porkchop("Earth", "Mars", date_to_jd("060226") + np.arange(10))
+    _assert_same_grid(grid, expected)
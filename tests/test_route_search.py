@@ -0,0 +1,25 @@
+import numpy as np
+
+from formula_implementation import compute_porkchop, tof_bounds
+from get_values import date_to_jd
+from route_search import find_gravity_assist_routes, flyby_delV
+
+def test_jupiter_flyby_beats_direct_saturn_transfer():
+    result = find_gravity_assist_routes("Earth", "Saturn", "Yamaha Space Cycle", 10, "301227", "280128",
+                                        max_flybys=1, flyby_bodies=["Jupiter"])
+    best = result["best_route"]
+    assert best["sequence"] == ["Earth", "Jupiter", "Saturn"]
+    assert len(best["dates"]) == 3 and len(best["tof_days"]) == 2
+
+    # Cheaper than the direct transfer on a 1-day TOF grid over the same launch days
+    lo, hi = tof_bounds("Earth", "Saturn")
+    launch = date_to_jd("301227") + np.arange(30)
+    direct = compute_porkchop("Earth", "Saturn", launch, np.arange(lo, hi, 1.0))["delta_v"]
+    assert best["deltaV"] < np.nanmin(direct)
+
+def test_unpowered_flyby_within_the_turn_limit_is_free():
+    v_in = np.array([5.0, 0.0, 0.0])
+    v_out = 5.0 * np.array([np.cos(0.3), np.sin(0.3), 0.0])
+    assert flyby_delV(v_in, v_out, "Jupiter") < 1e-12
+    # Speeding up costs at least the change in v-infinity
+    assert flyby_delV(v_in, 1.2 * v_out, "Jupiter") >= 1.0 - 1e-12
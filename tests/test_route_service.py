@@ -0,0 +1,48 @@
+import os
+import sys
+import json
+import socket
+import subprocess
+
+import pytest
+
+from nav_cli import plan_query, query_service
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERY = ["Earth", "Mars", "Moonivan", "5000", "010226", "150226"]
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("service")
+    socket_path = str(tmp / "nav.sock")
+    env = dict(os.environ, NAV_ROUTE_STORE=str(tmp / "routes.db"))
+    proc = subprocess.Popen([sys.executable, os.path.join(REPO, "route_service.py"),
+                             "--socket", socket_path, "--workers", "1"],
+                            cwd=REPO, env=env, stdout=subprocess.PIPE, text=True)
+    # The service prints its banner once every worker is up
+    assert "listening" in proc.stdout.readline()
+    yield socket_path
+    proc.terminate()
+    proc.wait(timeout=30)
+
+def test_service_ping_and_unknown_method(service):
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(60)
+    conn.connect(service)
+    with conn:
+        reader = conn.makefile("r")
+        conn.sendall(b'{"id": 7, "method": "ping"}\n{"id": 8, "method": "launch"}\nnot json\n')
+        assert json.loads(reader.readline()) == {"id": 7, "result": "pong"}
+        assert json.loads(reader.readline()) == {"id": 8, "error": "Unknown method: launch"}
+        assert "error" in json.loads(reader.readline())
+
+def test_service_plan_query_matches_local(service):
+    result = query_service(service, QUERY, timeout=120, use_store=False)
+    assert result == json.loads(json.dumps(plan_query(*QUERY, use_store=False)))
+
+def test_service_errors_are_raised(service):
+    with pytest.raises(RuntimeError, match="Unknown ship"):
+        query_service(service, ["Earth", "Mars", "submarine", "5000", "010226", "150226"], timeout=120)
+
+def test_unreachable_service_returns_none(tmp_path):
+    assert query_service(str(tmp_path / "missing.sock"), QUERY) is None
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import route_store
+from formula_implementation import find_best_mission
+from get_values import date_to_jd
+
+SEARCH = {"min_tof": 50, "max_tof": 500, "step": 15, "tof_mode": "grid"}
+
+@pytest.fixture
+def store(tmp_path):
+    store = route_store.RouteStore(str(tmp_path / "routes.db"))
+    yield store
+    store.close()
+
+def _key(payload=1000.0):
+    return ("Earth", "Mars", "Moonivan", payload, date_to_jd("010126"), date_to_jd("310326"), SEARCH)
+
+def test_round_trip_keeps_flights_and_drops_grids(store):
+    result = find_best_mission("Earth", "Mars", "Moonivan", 1000.0, "010126", 50, 500, 15, "310326")
+    assert store.get(*_key()) is None
+    store.put(*_key(), result)
+
+    stored = store.get(*_key())
+    assert not set(route_store.GRID_FIELDS) & set(stored)
+    assert stored["flight_impossible"] is False
+    assert stored["cells_pruned"] == result["cells_pruned"]
+    for name in ("efficient_flight", "fastest_flight"):
+        for field, value in result[name].items():
+            if isinstance(value, np.ndarray):
+                np.testing.assert_array_equal(stored[name][field], value)
+            else:
+                assert stored[name][field] == value
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+def test_payloads_share_a_kilogram_bucket(store):
+    store.put(*_key(1000.2), {"flight_impossible": True, "reason": "test"})
+    assert store.get(*_key(999.9))["reason"] == "test"
+    assert store.get(*_key(1001.0)) is None
+
+def test_model_change_invalidates_entries(tmp_path, monkeypatch):
+    path = str(tmp_path / "routes.db")
+    store = route_store.RouteStore(path)
+    store.put(*_key(), {"flight_impossible": True, "reason": "test"})
+    store.close()
+
+    monkeypatch.setattr(route_store, "SOLVER_VERSION", route_store.SOLVER_VERSION + 1)
+    reopened = route_store.RouteStore(path)
+    try:
+        assert reopened.version != store.version
+        assert reopened.get(*_key()) is None
+        assert reopened.stats()["entries"] == 0
+    finally:
+        reopened.close()
+
+def test_find_best_mission_uses_the_store(store):
+    first = find_best_mission("Earth", "Mars", "Moonivan", 1000.0, "010126", 50, 500, 15, "310326", store=store)
+    again = find_best_mission("Earth", "Mars", "Moonivan", 1000.0, "010126", 50, 500, 15, "310326", store=store)
+    assert "delta_v" in first and "delta_v" not in again
+    assert again["efficient_flight"]["fuel_required"] == first["efficient_flight"]["fuel_required"]
+    assert store.stats()["hits"] == 1